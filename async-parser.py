@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Company employees parser on asyncio WebDriver client: one search session walks result pages and
+-sessions profile sessions parse profiles concurrently from one thread.
+Signs in only with saved -session (run selenium-linkedin-parser.py -session session.json once).
+Works against local fixture pages too: python benchmark/fixture_server.py -port 8000, then
+python async-parser.py -company-url http://127.0.0.1:8000/company/fixture/ -sessions 4
+"""
+import os
+import sys
+import json
+import asyncio
+import logging
+import argparse
+from time import monotonic
+
+from async_webdriver import ChromeDriverService, AsyncWebDriver, NoSuchElement
+from async_linkedin import find, text, wait_for, restore_session, signed_out, parse_profile, search_cards, next_page
+from command_line import logging_info
+from jsonl_store import JsonlStore
+from logging_setup import setup_logging
+from pacing import Pacer
+from selector_registry import SelectorRegistry
+from session_store import SessionStore
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+arguments_parser = argparse.ArgumentParser(description='Parse LinkedIn company employees with concurrent async sessions')
+arguments_parser.add_argument('-company-url', type=str, required=True, help='Company on profile URL')
+arguments_parser.add_argument('-selectors', type=str, default='selectors.json', help='Config filename')
+arguments_parser.add_argument('-out', type=str, default='result.jsonl', help='Output JSONL filename')
+arguments_parser.add_argument('-log', type=str, default='out.log', help='Log output file')
+arguments_parser.add_argument('-log-level', type=str, choices=['DEBUG', 'INFO', 'WARNING'], default='INFO',
+                              help='Log file level (DEBUG logs every not found element)')
+arguments_parser.add_argument('-sessions', type=int, default=2, help='Concurrent profile browser sessions')
+arguments_parser.add_argument('-session', type=str, default='', help='Saved session file of selenium-linkedin-parser.py')
+arguments_parser.add_argument('-headless', type=int, choices=[0, 1], default=1, help='Show (0) or hide (1) browser windows')
+arguments_parser.add_argument('-lean', type=int, choices=[0, 1], default=0,
+                              help='Block images, fonts, media and trackers (selectors.json lean section) (1)')
+arguments_parser.add_argument('-user-data-dir', type=str, default='chrome-data',
+                              help='Chrome profiles prefix, sessions use <user-data-dir>-async-N')
+
+
+def timeout(selector_name: str) -> float:
+    return selectors['timeouts'].get(selector_name, selectors['timeouts']['default'])
+
+
+def capabilities(number: int) -> dict:
+    chrome_arguments = [f'--user-data-dir={args.user_data_dir}-async-{number}', '--no-sandbox']
+    chrome_options = {}
+    if args.headless == 1:
+        chrome_arguments.append('--headless')
+    if args.lean == 1:
+        chrome_arguments += selectors['lean']['chrome_arguments']
+        chrome_options['prefs'] = selectors['lean']['chrome_prefs']
+    chrome_options['args'] = chrome_arguments
+    return {'browserName': 'chrome', 'goog:chromeOptions': chrome_options}
+
+
+async def start_session(service: ChromeDriverService, number: int) -> AsyncWebDriver:
+    driver = await AsyncWebDriver(service.url).start(capabilities(number))
+    await driver.set_window_size(*(selectors['lean']['window_size'] if args.lean == 1 else [1280, 1024]))
+    await driver.set_timeouts(script_ms=selectors['extract_script_timeout_seconds'] * 1000)
+    if args.lean == 1:
+        # Sessions never open new tabs, blocking once per session is enough
+        await driver.execute_cdp('Network.enable')
+        await driver.execute_cdp('Network.setBlockedURLs', {'urls': selectors['lean']['blocked_url_patterns']})
+    if session_store is not None and await restore_session(driver, session_store):
+        logging_info(f'[session-{number}] Session restored from {args.session}')
+    return driver
+
+
+async def open_url(driver: AsyncWebDriver, url: str):
+    started = monotonic()
+    await driver.get(url)
+    pacer.page_loaded(monotonic() - started)
+
+
+async def harvest(driver: AsyncWebDriver, profiles_queue: asyncio.Queue):
+    """Walk search results pages of the company and queue profiles to parse"""
+    await driver.click(await find(driver, registry, 'link_to_all_employees'))
+    await wait_for(driver, registry, ['profiles_list'], timeout('profiles_list'))
+    queued = set()
+    while True:
+        cards, profiles = await search_cards(driver, registry)
+        if profiles:
+            pacer.ok()
+        else:
+            pacer.throttled('profiles_list missing')
+        for card in cards:
+            if card['limited']:
+                logging_info(f"x profile {card['headline']} has limited visibility. Skip iteration.")
+            elif card['url'] in store or card['url'] in queued:
+                logging_info(f"x Skip {card['url']} ({card['name']}) - already exist in {args.out}.")
+            else:
+                logging_info(f"-> Queued {card['url']}")
+                queued.add(card['url'])
+                await profiles_queue.put(card)
+        await asyncio.sleep(pacer.pause_seconds('before next pagination page'))
+        if not await next_page(driver, registry, profiles, timeout('profiles_list')):
+            logging_info('Pagination next button not found. Assume this is the last page.')
+            return
+
+
+async def parse_profiles(number: int, driver: AsyncWebDriver, profiles_queue: asyncio.Queue):
+    while True:
+        card = await profiles_queue.get()
+        if card is None:
+            return
+        try:
+            await asyncio.sleep(pacer.reserve())
+            logging_info(f"-> [session-{number}] Parsing {card['url']}")
+            await open_url(driver, card['url'])
+            if await signed_out(driver, registry):
+                # Sign in forms instead of the profile: nothing to parse, next run picks the url up again
+                pacer.throttled('auth wall')
+                logging_info(f"x [session-{number}] Auth wall on {card['url']}, not parsed")
+                continue
+            employee = await parse_profile(driver, registry, selectors, extract_profile_script)
+            employee['url'] = card['url']
+            store.append(employee)
+            logging_info(f"Added to {args.out}: {card['name']} [{employee['position']}]\n")
+        except Exception as e:
+            logging.debug("[session-%s] Unknown Exception %s", number, e)
+
+
+async def main():
+    service = ChromeDriverService(os.getenv('CHROME_DRIVER', os.path.join(ROOT_DIR, 'chromedriver')))
+    await service.start()
+    drivers = []
+    try:
+        started = await asyncio.gather(*[start_session(service, number) for number in range(args.sessions + 1)],
+                                       return_exceptions=True)
+        drivers = [driver for driver in started if isinstance(driver, AsyncWebDriver)]
+        for error in started:
+            if isinstance(error, Exception):
+                raise error
+        search_driver = drivers[0]
+        logging_info(f'GET {args.company_url}')
+        await open_url(search_driver, args.company_url)
+        try:
+            await wait_for(search_driver, registry, ['modal_sign_in_button', 'sign_up_form_sign_in_link', 'company_name'],
+                           timeout('modal_sign_in_button'))
+        except NoSuchElement as e:
+            logging.debug("Page not ready %s", e)
+        if await signed_out(search_driver, registry):
+            sys.exit('Not signed in: save session with selenium-linkedin-parser.py -session and pass it with -session')
+
+        company_name = await text(search_driver, registry, 'company_name')
+        logging_info(f'Extracted company name {company_name}')
+        if not store.exists():
+            store.create(company_name)
+
+        profiles_queue = asyncio.Queue(maxsize=args.sessions * 2)
+        workers = [asyncio.ensure_future(parse_profiles(number, driver, profiles_queue))
+                   for number, driver in enumerate(drivers[1:], 1)]
+        try:
+            await harvest(search_driver, profiles_queue)
+        finally:
+            for _ in workers:
+                await profiles_queue.put(None)
+            await asyncio.gather(*workers)
+    finally:
+        await asyncio.gather(*[driver.quit() for driver in drivers], return_exceptions=True)
+        await service.stop()
+
+
+if __name__ == '__main__':
+    args = arguments_parser.parse_args()
+    setup_logging(args.log, args.log_level)
+    with open(args.selectors) as selectors_json:
+        selectors = json.load(selectors_json)
+    registry = SelectorRegistry(selectors)
+    with open(os.path.join(ROOT_DIR, 'extract_profile.js')) as extract_profile_file:
+        extract_profile_script = extract_profile_file.read()
+    pacer = Pacer(selectors['pacing'])
+    session_store = SessionStore(args.session) if args.session else None
+    store = JsonlStore(args.out)
+    logging_info(f'{len(store)} employees already stored in {args.out}')
+    try:
+        asyncio.run(main())
+    finally:
+        store.close()
+        logging_info(f'Pacing summary: {json.dumps(pacer.summary())}')
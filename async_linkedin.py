@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Awaitable equivalents of the parser browser operations on AsyncWebDriver:
+selector variants lookup, waits, session restore, profile parsing and search results pagination.
+Profile is parsed by extract_profile.js in one round trip, experience rows fall back to lxml on page_source
+instead of element by element parsing, which would cost dozens of round trips per profile.
+"""
+import asyncio
+from time import monotonic
+
+from async_webdriver import AsyncWebDriver, NoSuchElement, StaleElement
+from html_extract import extract_raw_profile
+from profile_parser import build_employee
+from selector_registry import SelectorRegistry
+from session_store import SessionStore, ORIGIN_PAGE, RESTORE_LOCAL_STORAGE_SCRIPT
+
+POLL_SECONDS = 0.25
+LIMITED_NAMES = ['LinkedIn Member', 'Участник LinkedIn']
+
+
+async def find(driver: AsyncWebDriver, registry: SelectorRegistry, key: str, element: str = None) -> str:
+    for index in registry.order(key):
+        try:
+            found = await driver.find(registry.variants[key][index], element)
+        except NoSuchElement:
+            continue
+        registry.matched(key, index)
+        return found
+    raise NoSuchElement('no such element', f'{key} not found by {len(registry.variants[key])} variant(s)')
+
+
+async def find_all(driver: AsyncWebDriver, registry: SelectorRegistry, key: str, element: str = None) -> list:
+    for index in registry.order(key):
+        found = await driver.find_all(registry.variants[key][index], element)
+        if found:
+            registry.matched(key, index)
+            return found
+    return []
+
+
+async def text(driver: AsyncWebDriver, registry: SelectorRegistry, key: str, element: str = None) -> str:
+    """Element text, '' if not found"""
+    try:
+        return await driver.text(await find(driver, registry, key, element))
+    except NoSuchElement:
+        return ''
+
+
+async def wait_for(driver: AsyncWebDriver, registry: SelectorRegistry, keys: list, timeout: float) -> str:
+    """First present element of any of selectors, polled without blocking other sessions"""
+    xpath = ' | '.join(registry.union(key) for key in keys)
+    deadline = monotonic() + timeout
+    while True:
+        try:
+            return await driver.find(xpath)
+        except NoSuchElement:
+            if monotonic() > deadline:
+                raise NoSuchElement('no such element', f'None of {", ".join(keys)} present after {timeout}s')
+        await asyncio.sleep(POLL_SECONDS)
+
+
+async def wait_stale(driver: AsyncWebDriver, element: str, timeout: float) -> bool:
+    deadline = monotonic() + timeout
+    while monotonic() < deadline:
+        try:
+            await driver.enabled(element)
+        except (StaleElement, NoSuchElement):
+            return True
+        await asyncio.sleep(POLL_SECONDS)
+    return False
+
+
+async def restore_session(driver: AsyncWebDriver, session_store: SessionStore) -> bool:
+    session = session_store.load()
+    if session is None:
+        return False
+    await driver.get(session['origin'] + ORIGIN_PAGE)
+    for cookie in session['cookies']:
+        await driver.add_cookie(cookie)
+    await driver.execute(RESTORE_LOCAL_STORAGE_SCRIPT, session.get('local_storage') or {})
+    return True
+
+
+async def signed_out(driver: AsyncWebDriver, registry: SelectorRegistry) -> bool:
+    for key in ['modal_sign_in_button', 'sign_up_form_sign_in_link']:
+        if await find_all(driver, registry, key):
+            return True
+    return False
+
+
+async def parse_profile(driver: AsyncWebDriver, registry: SelectorRegistry, selectors: dict, script: str) -> dict:
+    try:
+        await wait_for(driver, registry, ['profile_name'], selectors['timeouts'].get('profile_name', selectors['timeouts']['default']))
+    except NoSuchElement:
+        pass
+    raw_profile = await driver.execute_async(script, registry.ordered_config(selectors))
+    if 'error' in raw_profile:
+        raw_profile = extract_raw_profile(await driver.page_source(), registry)
+    return build_employee(raw_profile)
+
+
+async def search_cards(driver: AsyncWebDriver, registry: SelectorRegistry) -> (list, list):
+    """Cards {url, name, headline, limited} of current search results page and their elements"""
+    try:
+        await driver.scroll_to(await find(driver, registry, 'global_footer'))
+    except NoSuchElement:
+        pass
+    profiles = await find_all(driver, registry, 'profiles_list')
+    cards = []
+    for profile in profiles:
+        # Profile links added to html only when visible on screen
+        await driver.scroll_to(profile)
+        try:
+            profile_link = await find(driver, registry, 'profile_link', profile)
+        except NoSuchElement:
+            continue
+        name = await text(driver, registry, 'profile_link_actor_name', profile_link)
+        cards.append({
+            'url': await driver.attribute(profile_link, 'href'),
+            'name': name,
+            'headline': await text(driver, registry, 'profile_link_position_name', profile),
+            'limited': name in LIMITED_NAMES
+        })
+    return cards, profiles
+
+
+async def next_page(driver: AsyncWebDriver, registry: SelectorRegistry, profiles: list, timeout: float) -> bool:
+    """Click next pagination button and wait for new results, False on the last page"""
+    try:
+        next_button = await find(driver, registry, 'employees_pagination_next')
+    except NoSuchElement:
+        return False
+    await driver.scroll_to(next_button)
+    if not await driver.enabled(next_button):
+        return False
+    await driver.click(next_button)
+    if profiles:
+        # Results are replaced without page reload: old card goes stale first
+        await wait_stale(driver, profiles[0], timeout)
+    await wait_for(driver, registry, ['profiles_list'], timeout)
+    return True
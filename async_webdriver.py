@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Minimal asyncio client of W3C WebDriver protocol (chromedriver) for driving many browser sessions from one thread.
+Every session has its own keep-alive HTTP connection, so commands of different sessions never wait for each other.
+"""
+import socket
+import asyncio
+
+import aiohttp
+
+ELEMENT_KEY = 'element-6066-11e4-a52f-4a8e4e11d4b3'
+
+
+class WebDriverError(Exception):
+    def __init__(self, error: str, message: str):
+        super().__init__(f'{error}: {message}')
+        self.error = error
+
+
+class NoSuchElement(WebDriverError):
+    pass
+
+
+class StaleElement(WebDriverError):
+    pass
+
+
+ERRORS = {'no such element': NoSuchElement, 'stale element reference': StaleElement}
+
+
+def free_port() -> int:
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        return free_socket.getsockname()[1]
+
+
+class ChromeDriverService:
+    """chromedriver process shared by all sessions"""
+
+    def __init__(self, executable: str, port: int = 0):
+        self.executable = executable
+        self.port = port or free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        self.process = None
+
+    async def start(self, timeout: float = 20):
+        self.process = await asyncio.create_subprocess_exec(
+            self.executable, f'--port={self.port}',
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+        async with aiohttp.ClientSession() as http:
+            for _ in range(int(timeout / 0.1)):
+                try:
+                    async with http.get(f'{self.url}/status') as response:
+                        if (await response.json())['value'].get('ready'):
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.1)
+        await self.stop()
+        raise WebDriverError('session not created', f'{self.executable} not ready after {timeout}s')
+
+    async def stop(self):
+        if self.process is not None and self.process.returncode is None:
+            self.process.terminate()
+            await self.process.wait()
+
+
+class AsyncWebDriver:
+    """One WebDriver session. Elements are W3C element ids (str)"""
+
+    def __init__(self, service_url: str):
+        self.service_url = service_url
+        self.http = None
+        self.session_id = None
+
+    async def start(self, capabilities: dict):
+        self.http = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=1, force_close=False))
+        value = await self.request('POST', f'{self.service_url}/session', {'capabilities': {'alwaysMatch': capabilities}})
+        self.session_id = value['sessionId']
+        return self
+
+    async def quit(self):
+        try:
+            if self.session_id is not None:
+                await self.command('DELETE', '')
+        finally:
+            self.session_id = None
+            if self.http is not None:
+                await self.http.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.quit()
+
+    async def request(self, method: str, url: str, payload: dict = None):
+        async with self.http.request(method, url, json=payload) as response:
+            value = (await response.json(content_type=None))['value']
+        if isinstance(value, dict) and 'error' in value and 'message' in value:
+            raise ERRORS.get(value['error'], WebDriverError)(value['error'], value['message'])
+        if response.status >= 400:
+            raise WebDriverError(f'HTTP {response.status}', str(value))
+        return value
+
+    async def command(self, method: str, path: str, payload: dict = None):
+        return await self.request(method, f'{self.service_url}/session/{self.session_id}{path}',
+                                  payload if payload is not None or method != 'POST' else {})
+
+    async def set_timeouts(self, script_ms: int = None, page_load_ms: int = None, implicit_ms: int = None):
+        timeouts = {'script': script_ms, 'pageLoad': page_load_ms, 'implicit': implicit_ms}
+        await self.command('POST', '/timeouts', {key: value for key, value in timeouts.items() if value is not None})
+
+    async def set_window_size(self, width: int, height: int):
+        await self.command('POST', '/window/rect', {'width': width, 'height': height})
+
+    async def get(self, url: str):
+        await self.command('POST', '/url', {'url': url})
+
+    async def current_url(self) -> str:
+        return await self.command('GET', '/url')
+
+    async def page_source(self) -> str:
+        return await self.command('GET', '/source')
+
+    async def execute(self, script: str, *args):
+        return await self.command('POST', '/execute/sync', {'script': script, 'args': list(args)})
+
+    async def execute_async(self, script: str, *args):
+        return await self.command('POST', '/execute/async', {'script': script, 'args': list(args)})
+
+    async def find(self, xpath: str, element: str = None) -> str:
+        """Element id, NoSuchElement if not found"""
+        path = f'/element/{element}/element' if element else '/element'
+        return (await self.command('POST', path, {'using': 'xpath', 'value': xpath}))[ELEMENT_KEY]
+
+    async def find_all(self, xpath: str, element: str = None) -> list:
+        path = f'/element/{element}/elements' if element else '/elements'
+        return [found[ELEMENT_KEY] for found in await self.command('POST', path, {'using': 'xpath', 'value': xpath})]
+
+    async def text(self, element: str) -> str:
+        return await self.command('GET', f'/element/{element}/text')
+
+    async def attribute(self, element: str, name: str) -> str or None:
+        return await self.command('GET', f'/element/{element}/attribute/{name}')
+
+    async def enabled(self, element: str) -> bool:
+        return await self.command('GET', f'/element/{element}/enabled')
+
+    async def click(self, element: str):
+        await self.command('POST', f'/element/{element}/click')
+
+    async def scroll_to(self, element: str):
+        await self.execute("arguments[0].scrollIntoView({block: 'center'});", {ELEMENT_KEY: element})
+
+    async def get_cookies(self) -> list:
+        return await self.command('GET', '/cookie')
+
+    async def add_cookie(self, cookie: dict):
+        await self.command('POST', '/cookie', {'cookie': cookie})
+
+    async def execute_cdp(self, cmd: str, params: dict = None):
+        """Chrome DevTools command through chromedriver vendor endpoint (execute_cdp_cmd of Selenium)"""
+        return await self.command('POST', '/goog/cdp/execute', {'cmd': cmd, 'params': params or {}})
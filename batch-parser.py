@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the parser for every job of a JSONL manifest:
+{"id": "mail-ru", "url": "https://www.linkedin.com/company/mail-ru/", "out": "mail-ru.jsonl"} ("id" and "out" optional).
+Every browser session is a Crawler whose browser stays open between jobs, so Chrome starts and signs in
+(with email PIN) once per session, next jobs go straight to the company page.
+Finished jobs are recorded in -state file and skipped on restart, unfinished company jobs continue from their outputs.
+Arguments after the batch ones are passed to every parser run:
+python batch-parser.py -manifest companies.jsonl -sessions 2 -headless 1 -extract script
+"""
+import os
+import re
+import sys
+import json
+import queue
+import logging
+import argparse
+import threading
+from time import time
+
+from crawler import Crawler, parse_options
+from command_line import logging_info, pass_through_parser
+from logging_setup import setup_logging
+
+DONE = 'done'
+FAILED = 'failed'
+
+arguments_parser = pass_through_parser('Parse many companies and profiles from JSONL manifest')
+arguments_parser.add_argument('-manifest', type=str, required=True, help='Jobs JSONL: {"id", "url", "out"} per line')
+arguments_parser.add_argument('-selectors', type=str, default='selectors.json', help='Config filename')
+arguments_parser.add_argument('-out-dir', type=str, default='results', help='Directory of per-job outputs and frontiers')
+arguments_parser.add_argument('-sessions', type=int, default=1, help='Parallel browser sessions')
+arguments_parser.add_argument('-user-data-dir', type=str, default='chrome-data',
+                              help='Chrome profile of the first session, next ones use <user-data-dir>-session-N')
+arguments_parser.add_argument('-state', type=str, default='batch-state.jsonl', help='Finished jobs log for resume')
+arguments_parser.add_argument('-retries', type=int, default=1, help='Run failed job again N times')
+arguments_parser.add_argument('-log', type=str, default='batch.log', help='Batch log file')
+arguments_parser.add_argument('-log-level', type=str, choices=['DEBUG', 'INFO', 'WARNING'], default='INFO',
+                              help='Log level of batch and parser runs')
+
+
+def job_id(job: dict) -> str:
+    """Manifest id, request_id or slug of url"""
+    if job.get('id') or job.get('request_id'):
+        return str(job.get('id') or job.get('request_id'))
+    return re.sub(r'[^\w.-]+', '-', job['url'].rstrip('/').split('/')[-1]) or 'job'
+
+
+def read_manifest(filename: str) -> list:
+    jobs = []
+    with open(filename, encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            job['url'] = job.get('url') or job.get('company_url', '')
+            if not job['url']:
+                sys.exit(f'{filename}:{line_number}: job without url')
+            job['id'] = job_id(job)
+            jobs.append(job)
+    ids = [job['id'] for job in jobs]
+    duplicates = {identifier for identifier in ids if ids.count(identifier) > 1}
+    if duplicates:
+        sys.exit(f'{filename}: duplicated job ids {", ".join(sorted(duplicates))}, set "id" of these jobs')
+    return jobs
+
+
+class BatchState:
+    """Append-only jobs state log, last record of job wins"""
+
+    def __init__(self, filename: str):
+        self.states = {}
+        self.lock = threading.Lock()
+        if os.path.exists(filename):
+            with open(filename, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.states[record['id']] = record['state']
+        self.file = open(filename, 'a', encoding='utf-8')
+
+    def done(self, identifier: str) -> bool:
+        return self.states.get(identifier) == DONE
+
+    def record(self, identifier: str, state: str, error: str, seconds: float):
+        with self.lock:
+            self.states[identifier] = state
+            self.file.write(json.dumps({'id': identifier, 'state': state, 'error': error,
+                                        'seconds': round(seconds, 1), 'finished_at': int(time())}) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+def session_user_data_dir(number: int) -> str:
+    return args.user_data_dir if number == 1 else f'{args.user_data_dir}-session-{number}'
+
+
+def job_options(job: dict, user_data_dir: str) -> argparse.Namespace:
+    out = job.get('out') or f"{job['id']}.jsonl"
+    return parse_options(['-company-url', job['url'],
+                          '-selectors', args.selectors,
+                          '-out', os.path.join(args.out_dir, out),
+                          '-log', args.log,
+                          '-frontier', os.path.join(args.out_dir, f"{job['id']}.frontier.jsonl"),
+                          '-user-data-dir', user_data_dir] + job.get('args', []) + parser_args)
+
+
+def run_session(number: int, jobs: queue.Queue, state: BatchState):
+    """
+    Jobs run one by one in the session browser (Chrome profile directory can be used by one browser at a time).
+    Browser arguments (-headless, -lean, -session) of the first job are used for the whole session.
+    """
+    user_data_dir = session_user_data_dir(number)
+    crawler = None
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except queue.Empty:
+            break
+        for attempt in range(1, args.retries + 2):
+            logging_info(f"[session-{number}] {job['id']}: {job['url']} (attempt {attempt})")
+            started = time()
+            try:
+                options = job_options(job, user_data_dir)
+                if crawler is None:
+                    crawler = Crawler(options)
+                elif not crawler.alive():
+                    logging_info(f'[session-{number}] Browser {user_data_dir} not responding, restarting')
+                    crawler.close()
+                crawler.options = options
+                crawler.run()
+                state.record(job['id'], DONE, '', time() - started)
+                logging_info(f"[session-{number}] {job['id']} done in {time() - started:.0f}s")
+                break
+            except (SystemExit, Exception) as e:
+                # sys.exit() of crawler fatal errors ends the job, not the session
+                logging.debug("[session-%s] %s failed %s", number, job['id'], e)
+                state.record(job['id'], FAILED, str(e), time() - started)
+                logging_info(f"[session-{number}] {job['id']} failed: {e}")
+                if crawler is not None:
+                    # Next attempt starts and signs in a fresh browser, as a new parser process would
+                    crawler.close()
+    if crawler is not None:
+        crawler.close()
+
+
+if __name__ == '__main__':
+    args, parser_args = arguments_parser.parse_known_args()
+    setup_logging(args.log, args.log_level)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    state = BatchState(args.state)
+    jobs = queue.Queue()
+    manifest = read_manifest(args.manifest)
+    for job in manifest:
+        if state.done(job['id']):
+            logging_info(f"x Skip {job['id']} - already done in {args.state}")
+        else:
+            jobs.put(job)
+    logging_info(f'{jobs.qsize()} of {len(manifest)} jobs to run in {args.sessions} sessions')
+
+    sessions = [threading.Thread(target=run_session, args=(number, jobs, state), name=f'session-{number}')
+                for number in range(1, args.sessions + 1)]
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+    state.close()
+
+    failed = [job['id'] for job in manifest if not state.done(job['id'])]
+    logging_info(f'Failed jobs: {", ".join(failed)}' if failed else 'All jobs done')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end throughput benchmark of selenium-linkedin-parser.py against the local fixture server (no LinkedIn).
+Pacing is scaled to zero, every WebDriver command is counted.
+Arguments after the benchmark ones are passed to the parser:
+python benchmark/benchmark.py -profiles 50 -tab-mode reuse -extract elements
+"""
+import os
+import sys
+import json
+import runpy
+import tempfile
+from time import monotonic
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+import crawler
+from command_line import pass_through_parser
+import jsonl_store
+from fixture_server import start_fixture_server
+
+arguments_parser = pass_through_parser('Benchmark parser against local fixture pages')
+arguments_parser.add_argument('-profiles', type=int, default=50, help='Employees in fixture company')
+arguments_parser.add_argument('-selectors', type=str, default=os.path.join(ROOT_DIR, 'selectors.json'), help='Config filename')
+arguments_parser.add_argument('-o', type=str, default='', help='Also write summary json to file')
+
+
+def percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))]
+
+
+def zero_pacing_selectors(filename: str, directory: str) -> str:
+    with open(filename) as selectors_json:
+        selectors = json.load(selectors_json)
+    selectors['pacing'].update({
+        'profiles_per_hour': 3600 * 1000000,
+        'burst': 1000000,
+        'jitter_seconds': [0, 0],
+        'keystroke_seconds': [0, 0]
+    })
+    selectors['search_scroll_step_delay_ms'] = 20
+    benchmark_selectors = os.path.join(directory, 'selectors.json')
+    with open(benchmark_selectors, 'w') as selectors_json:
+        json.dump(selectors, selectors_json)
+    return benchmark_selectors
+
+
+def run(args, parser_args: list) -> dict:
+    server = start_fixture_server(0, args.profiles)
+    directory = tempfile.mkdtemp(prefix='linkedin-benchmark-')
+    commands = {}
+    appended = []
+    parse_seconds = []
+    execute = RemoteConnection.execute
+    append = jsonl_store.JsonlStore.append
+    parse_profile = crawler.Crawler.parse_profile
+
+    def counting_execute(self, command, params):
+        started = monotonic()
+        try:
+            return execute(self, command, params)
+        finally:
+            count, seconds = commands.get(command, (0, 0.0))
+            commands[command] = (count + 1, seconds + monotonic() - started)
+
+    def counting_append(self, employee, fetched_at=None):
+        changed = append(self, employee, fetched_at)
+        appended.append(employee['url'])
+        return changed
+
+    def timed_parse_profile(self, url):
+        started = monotonic()
+        try:
+            return parse_profile(self, url)
+        finally:
+            parse_seconds.append(monotonic() - started)
+
+    RemoteConnection.execute = counting_execute
+    jsonl_store.JsonlStore.append = counting_append
+    crawler.Crawler.parse_profile = timed_parse_profile
+    sys.argv = [os.path.join(ROOT_DIR, 'selenium-linkedin-parser.py'),
+                '-company-url', f'http://127.0.0.1:{server.server_port}/company/fixture/',
+                '-selectors', zero_pacing_selectors(args.selectors, directory),
+                '-out', os.path.join(directory, 'result.jsonl'),
+                '-log', os.path.join(directory, 'out.log'),
+                '-user-data-dir', os.path.join(directory, 'chrome-data')] + parser_args
+    started = monotonic()
+    try:
+        runpy.run_path(sys.argv[0], run_name='__main__')
+    except SystemExit as e:
+        print(f'Parser exited: {e}')
+    finally:
+        RemoteConnection.execute = execute
+        jsonl_store.JsonlStore.append = append
+        crawler.Crawler.parse_profile = parse_profile
+        server.shutdown()
+    seconds = monotonic() - started
+
+    profiles = len(appended)
+    calls = sum(count for count, _ in commands.values())
+    return {
+        'parser_args': parser_args,
+        'profiles': profiles,
+        'seconds': round(seconds, 3),
+        'profiles_per_second': round(profiles / seconds, 3) if seconds else 0.0,
+        'webdriver_calls': calls,
+        'webdriver_calls_per_profile': round(calls / profiles, 1) if profiles else 0.0,
+        # Crawler.parse_profile only: waits for the profile, expands and extracts it (no navigation and writes)
+        'profile_parse_p50': round(percentile(parse_seconds, 50), 3),
+        'profile_parse_p95': round(percentile(parse_seconds, 95), 3),
+        'commands': {command: {'count': count, 'seconds': round(seconds, 3)}
+                     for command, (count, seconds) in sorted(commands.items(), key=lambda item: -item[1][0])},
+        'output': directory
+    }
+
+
+if __name__ == '__main__':
+    benchmark_args, parser_args = arguments_parser.parse_known_args()
+    summary = run(benchmark_args, parser_args)
+    print(json.dumps(summary, indent=4))
+    if benchmark_args.o:
+        with open(benchmark_args.o, 'w') as file:
+            json.dump(summary, file, indent=4)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for LinkedIn: synthetic company, search results and profile pages with the structure selectors.json expects.
+python benchmark/fixture_server.py -port 8000 -profiles 100
+"""
+import argparse
+import threading
+from html import escape
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+COMPANY = 'Fixture Corp'
+RESULTS_PER_PAGE = 10
+
+
+def page(title: str, body: str) -> str:
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{escape(title)}</title></head>'
+            f'<body><main style="min-height: 1500px">{body}</main>'
+            f'<footer class="global-footer">Fixture footer</footer></body></html>')
+
+
+def company_page(slug: str) -> str:
+    return page(COMPANY, f'<h1>{COMPANY}</h1>'
+                         f'<a data-control-name="topcard_see_all_employees" '
+                         f'href="/search/results/people/?facetCurrentCompany={slug}">See all employees</a>')
+
+
+def search_page(query: dict, profiles: int) -> str:
+    page_number = int(query.get('page', ['1'])[0])
+    pages = (profiles + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE
+    cards = []
+    for index in range((page_number - 1) * RESULTS_PER_PAGE, min(page_number * RESULTS_PER_PAGE, profiles)):
+        # Every 7th profile has limited visibility
+        name = 'LinkedIn Member' if index % 7 == 6 else f'Employee {index}'
+        cards.append(f'<li class="search-result search-result__occluded-item" style="height: 120px">'
+                     f'<div class="search-result__info">'
+                     f'<a class="search-result__result-link" href="/in/employee-{index}/">'
+                     f'<h3><span class="name actor-name">{name}</span></h3></a>'
+                     f'<p class="subline-level-1">Position {index % 5} at {COMPANY}</p>'
+                     f'</div></li>')
+    company = query.get('facetCurrentCompany', [''])[0]
+    next_disabled = ' disabled' if page_number >= pages else ''
+    return page(f'Search page {page_number}', (
+        f'<ul class="search-results__list">{"".join(cards)}</ul>'
+        f'<ul class="artdeco-pagination__pages">'
+        f'<li class="artdeco-pagination__indicator artdeco-pagination__indicator--number active selected">'
+        f'<button><span>{page_number}</span></button></li></ul>'
+        f'<button class="artdeco-pagination__button artdeco-pagination__button--next"{next_disabled} '
+        f'onclick="location.href=\'/search/results/people/?facetCurrentCompany={company}&page={page_number + 1}\'">'
+        f'Next</button>'
+    ))
+
+
+def dates(date_range: str, duration: str) -> str:
+    return (f'<h4 class="pv-entity__date-range"><span class="visually-hidden">Dates Employed</span>'
+            f'<span>{date_range}</span></h4>'
+            f'<h4><span class="visually-hidden">Employment Duration</span><span>{duration}</span></h4>'
+            f'<h4 class="pv-entity__location"><span class="visually-hidden">Location</span><span>Kyiv</span></h4>')
+
+
+def description(text: str) -> str:
+    # As on LinkedIn: the whole text is there, "see more" removes the clamp a bit later and becomes "see less"
+    return (f'<p class="pv-entity__description inline-show-more-text--is-collapsed" '
+            f'style="max-height: 1.2em; overflow: hidden">{text}</p>'
+            f'<button class="inline-show-more-text__button" onclick="var button = this; setTimeout(function () {{ '
+            f'button.previousSibling.classList.remove(\'inline-show-more-text--is-collapsed\'); '
+            f'button.previousSibling.style.maxHeight = \'none\'; button.textContent = \'see less\'; }}, 50)">'
+            f'see more</button>')
+
+
+def one_position(index: int) -> str:
+    return (f'<section class="pv-profile-section__card-item pv-position-entity">'
+            f'<div class="pv-entity__summary-info"><h3>Engineer {index}</h3>'
+            f'<p class="pv-entity__secondary-title">{COMPANY} Full-time</p>'
+            f'{dates("Jan 2019 – Present", "1 yr 2 mos")}</div>'
+            f'{description(f"Worked on project {index}.")}</section>')
+
+
+def many_positions(index: int, roles: int) -> str:
+    items = []
+    for role in range(roles):
+        items.append(f'<li class="pv-entity__position-group-role-item">'
+                     f'<div class="pv-entity__summary-info-v2"><h3><span class="visually-hidden">Title</span>'
+                     f'<span>Role {role} of {index}</span></h3>'
+                     f'{dates(f"Mar 201{role} – Feb 201{role + 1}", f"{role + 1} yrs 1 mo")}</div>'
+                     f'{description(f"Role {role} duties.")}</li>')
+    return (f'<section class="pv-profile-section__card-item pv-position-entity">'
+            f'<div class="pv-entity__company-summary-info"><h3><span class="visually-hidden">Company Name</span>'
+            f'<span>Other Company {index}</span></h3>'
+            f'<h4><span class="visually-hidden">Total Duration</span><span>{roles} yrs 3 mos</span></h4></div>'
+            f'<ul class="pv-entity__position-group">{"".join(items)}</ul></section>')
+
+
+def profile_page(profile_id: str) -> str:
+    index = int(profile_id.rsplit('-', 1)[-1]) if profile_id.rsplit('-', 1)[-1].isdigit() else 0
+    experience = [one_position(index)]
+    if index % 2 == 0:
+        experience.append(many_positions(index, 2 + index % 3))
+    return page(f'Employee {index}', (
+        f'<div class="pv-top-card"><ul class="pv-top-card--list"><li>Employee {index}</li><li>Kyiv</li></ul>'
+        f'<h2>Position {index % 5} at {COMPANY}</h2></div>'
+        f'<section class="pv-about-section"><p class="pv-about__summary-text">About employee {index}</p></section>'
+        f'<section class="experience-section">{"".join(experience)}</section>'
+    ))
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    profiles = 100
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith('/company/'):
+            body = company_page(url.path.strip('/').split('/')[-1])
+        elif url.path.startswith('/search/results/people/'):
+            body = search_page(parse_qs(url.query), self.profiles)
+        elif url.path.startswith('/in/'):
+            body = profile_page(url.path.strip('/').split('/')[-1])
+        else:
+            body = page('Fixture', f'<a href="/company/fixture/">{COMPANY}</a>')
+        content = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(port: int = 0, profiles: int = 100) -> ThreadingHTTPServer:
+    """Server in background thread, port 0 - any free port (server.server_port)"""
+    handler = type('Handler', (FixtureHandler,), {'profiles': profiles})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, name='fixture-server', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    arguments_parser = argparse.ArgumentParser(description='Serve synthetic LinkedIn pages')
+    arguments_parser.add_argument('-port', type=int, default=8000, help='Port')
+    arguments_parser.add_argument('-profiles', type=int, default=100, help='Employees count')
+    args = arguments_parser.parse_args()
+    fixture_server = start_fixture_server(args.port, args.profiles)
+    print(f'Serving http://127.0.0.1:{fixture_server.server_port}/company/fixture/')
+    threading.Event().wait()
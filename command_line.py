@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""Console and argument helpers shared by the entry point scripts"""
+import logging
+import argparse
+
+
+def logging_info(msg):
+    print(msg)
+    logging.info(msg)
+
+
+def pass_through_parser(description: str) -> argparse.ArgumentParser:
+    """Parser of a wrapper script whose unknown arguments go to selenium-linkedin-parser.py (parse_known_args)"""
+    parser = argparse.ArgumentParser(description=description, allow_abbrev=False, add_help=False)
+    # No -h: it would swallow parser arguments starting with h (-headless)
+    parser.add_argument('--help', action='help', help='Show this help message and exit')
+    return parser
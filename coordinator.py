@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Crawl coordinator: owns the frontier and the results store, parser processes on any host work through its HTTP API
+(selenium-linkedin-parser.py -coordinator http://host:8100/ -phase harvest|profiles).
+Profile urls are handed out in leases of -batch urls, a lease expires after -lease-seconds without worker activity
+and its unfinished urls go to other workers. Results are deduplicated by url.
+python coordinator.py -port 8100 -frontier frontier.jsonl -out result.jsonl
+Listens on localhost by default, with -host 0.0.0.0 set -token (parsers pass it with -coordinator-token).
+"""
+import os
+import hmac
+import json
+import uuid
+import logging
+import argparse
+import threading
+from time import monotonic
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from command_line import logging_info
+from frontier import Frontier, PENDING, IN_FLIGHT, DONE
+from jsonl_store import JsonlStore
+from results_io import open_store
+
+arguments_parser = argparse.ArgumentParser(description='Coordinate distributed crawl: frontier leases and results sink')
+arguments_parser.add_argument('-host', type=str, default='127.0.0.1', help='Listen address')
+arguments_parser.add_argument('-token', type=str, default=os.getenv('COORDINATOR_TOKEN', ''),
+                              help='Shared token required from parsers (COORDINATOR_TOKEN environment variable by default)')
+arguments_parser.add_argument('-port', type=int, default=8100, help='Listen port')
+arguments_parser.add_argument('-frontier', type=str, default='frontier.jsonl', help='Frontier file')
+arguments_parser.add_argument('-out', type=str, default='result.jsonl', help='Output JSONL filename')
+arguments_parser.add_argument('-batch', type=int, default=5, help='Urls per lease')
+arguments_parser.add_argument('-lease-seconds', type=int, default=600, help='Lease expires after N seconds without activity')
+arguments_parser.add_argument('-max-retries', type=int, default=3, help='Profile parse attempts')
+arguments_parser.add_argument('-log', type=str, default='coordinator.log', help='Log output file')
+
+
+class Coordinator:
+    """Frontier and store behind one lock, leases: id -> {worker, urls, expires}"""
+
+    def __init__(self, frontier: Frontier, store: JsonlStore, batch: int, lease_seconds: int):
+        self.frontier = frontier
+        self.store = store
+        self.batch = batch
+        self.lease_seconds = lease_seconds
+        self.leases = {}
+        self.lock = threading.Lock()
+
+    def status(self) -> dict:
+        with self.lock:
+            return {'company': self.store.company, 'page': self.frontier.page, 'harvested': self.frontier.harvested,
+                    'counts': self.frontier.counts(), 'stored': len(self.store), 'leases': len(self.leases)}
+
+    def company(self, request: dict) -> dict:
+        with self.lock:
+            if not self.store.exists():
+                self.store.create(request['company'])
+            return {'company': self.store.company}
+
+    def add(self, request: dict) -> dict:
+        """Harvested cards: new ones and, with ttl_seconds, stale stored ones (store.stale_reason) go to frontier"""
+        with self.lock:
+            added = []
+            for card in request['cards']:
+                reason = self.store.stale_reason(card['url'], card['headline'], card.get('ttl_seconds'))
+                if reason is not None and self.frontier.add(card['url'], card['name'], card['headline'],
+                                                            refresh=reason != 'new'):
+                    logging.info('Added %s (%s)', card['url'], reason)
+                    added.append(card['url'])
+            return {'added': added}
+
+    def page(self, request: dict) -> dict:
+        with self.lock:
+            self.frontier.set_page(request['page'], request.get('last', False))
+            return {'page': self.frontier.page, 'harvested': self.frontier.harvested}
+
+    def lease(self, request: dict) -> dict:
+        """Batch of urls; finished - nothing pending and nothing leased, workers can stop"""
+        with self.lock:
+            self.expire()
+            size = min(request.get('size', self.batch), self.batch)
+            records = []
+            while len(records) < size:
+                record = self.frontier.take()
+                if record is None:
+                    break
+                records.append(record)
+            if not records:
+                finished = self.frontier.harvested and not self.leases
+                return {'lease': None, 'records': [], 'finished': finished}
+            lease_id = uuid.uuid4().hex
+            self.leases[lease_id] = {'worker': request.get('worker', ''), 'urls': {record['url'] for record in records},
+                                     'expires': monotonic() + self.lease_seconds}
+            logging.info('Lease %s of %s urls to %s', lease_id, len(records), request.get('worker', ''))
+            return {'lease': lease_id, 'records': records, 'finished': False,
+                    'lease_seconds': self.lease_seconds}
+
+    def touch(self, lease_id: str, url: str) -> bool:
+        """Extend lease, False if url isn't leased by it anymore (expired and re-issued)"""
+        lease = self.leases.get(lease_id)
+        if lease is None or url not in lease['urls']:
+            return False
+        lease['expires'] = monotonic() + self.lease_seconds
+        return True
+
+    def finish(self, lease_id: str, url: str):
+        lease = self.leases.get(lease_id)
+        if lease is not None:
+            lease['urls'].discard(url)
+            if not lease['urls']:
+                del self.leases[lease_id]
+
+    def result(self, request: dict) -> dict:
+        employee = request['employee']
+        url = employee['url']
+        with self.lock:
+            self.touch(request.get('lease'), url)
+            # Expired lease could be re-issued and both workers send the same url
+            if self.frontier.state(url) == DONE and url in self.store:
+                self.finish(request.get('lease'), url)
+                return {'stored': False, 'changed': False}
+            changed = self.store.append(employee)
+            if url in self.frontier:
+                self.frontier.done(url)
+            self.finish(request.get('lease'), url)
+            return {'stored': True, 'changed': changed}
+
+    def done(self, request: dict) -> dict:
+        with self.lock:
+            url = request['url']
+            if url in self.frontier and self.frontier.state(url) in [PENDING, IN_FLIGHT]:
+                self.frontier.done(url)
+            self.finish(request.get('lease'), url)
+            return {}
+
+    def failed(self, request: dict) -> dict:
+        with self.lock:
+            url = request['url']
+            if self.touch(request.get('lease'), url) and self.frontier.state(url) == IN_FLIGHT:
+                self.frontier.failed(url)
+            self.finish(request.get('lease'), url)
+            return {}
+
+    def expire(self):
+        """Unfinished urls of expired leases back to pending (called under lock)"""
+        now = monotonic()
+        for lease_id, lease in list(self.leases.items()):
+            if lease['expires'] < now:
+                logging_info(f"Lease {lease_id} of {lease['worker']} expired, {len(lease['urls'])} urls re-issued")
+                for url in lease['urls']:
+                    self.frontier.release(url)
+                del self.leases[lease_id]
+
+    def expire_periodically(self, interval: float):
+        while True:
+            threading.Event().wait(interval)
+            with self.lock:
+                self.expire()
+
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    coordinator = None
+    token = ''
+    routes = {
+        '/company': Coordinator.company,
+        '/add': Coordinator.add,
+        '/page': Coordinator.page,
+        '/lease': Coordinator.lease,
+        '/result': Coordinator.result,
+        '/done': Coordinator.done,
+        '/failed': Coordinator.failed
+    }
+
+    def reply(self, status: int, body: dict):
+        content = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def authorized(self) -> bool:
+        if not self.token:
+            return True
+        if hmac.compare_digest(self.headers.get('Authorization', ''), f'Bearer {self.token}'):
+            return True
+        self.reply(401, {'error': 'invalid token'})
+        return False
+
+    def do_GET(self):
+        if not self.authorized():
+            return
+        if self.path == '/status':
+            self.reply(200, self.coordinator.status())
+        else:
+            self.reply(404, {'error': f'unknown path {self.path}'})
+
+    def do_POST(self):
+        if not self.authorized():
+            return
+        route = self.routes.get(self.path)
+        if route is None:
+            self.reply(404, {'error': f'unknown path {self.path}'})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            self.reply(200, route(self.coordinator, request))
+        except (ValueError, KeyError) as e:
+            self.reply(400, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        logging.debug(format, *args)
+
+
+def start_coordinator(coordinator: Coordinator, host: str, port: int, token: str = '') -> ThreadingHTTPServer:
+    """Server in background thread, port 0 - any free port (server.server_port)"""
+    handler = type('Handler', (CoordinatorHandler,), {'coordinator': coordinator, 'token': token})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='coordinator', daemon=True).start()
+    threading.Thread(target=coordinator.expire_periodically, args=(1.0,), name='lease-expiry', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    args = arguments_parser.parse_args()
+    logging.basicConfig(filename=args.log, level=logging.INFO)
+    coordinator = Coordinator(Frontier(args.frontier, args.max_retries), open_store(args.out), args.batch, args.lease_seconds)
+    if not args.token and args.host not in ['127.0.0.1', 'localhost', '::1']:
+        logging_info(f'Warning: anyone who can reach {args.host}:{args.port} can read and write results, set -token')
+    server = start_coordinator(coordinator, args.host, args.port, args.token)
+    logging_info(f'Coordinator on http://{args.host}:{server.server_port}/ {coordinator.status()}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        coordinator.store.close()
+        coordinator.frontier.close()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Parser side of coordinator.py API: RemoteFrontier and RemoteStore are drop-in replacements
+of Frontier and JsonlStore for selenium-linkedin-parser.py -coordinator.
+"""
+import os
+import json
+import socket
+import logging
+import threading
+from time import sleep
+from collections import deque
+from urllib.request import Request, urlopen
+
+POLL_SECONDS = 5
+
+
+class CoordinatorClient:
+    def __init__(self, url: str, token: str = '', timeout: float = 30):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+        self.worker = f'{socket.gethostname()}-{os.getpid()}'
+
+    def request(self, path: str, payload: dict = None) -> dict:
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        request = Request(f'{self.url}{path}', data=data, headers=headers)
+        with urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def status(self) -> dict:
+        return self.request('/status')
+
+
+class RemoteFrontier:
+    """
+    Frontier interface over coordinator leases: take() leases a batch and returns its urls one by one.
+    ttl_seconds - re-crawl stored profiles older than that (-refresh-days), checked by coordinator on add.
+    """
+
+    def __init__(self, client: CoordinatorClient, ttl_seconds: float = None):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.records = deque()
+        self.leases = {}
+        self.lock = threading.Lock()
+        status = client.status()
+        self.page = status['page']
+        self.harvested = status['harvested']
+
+    def __contains__(self, url: str) -> bool:
+        # Coordinator knows every url the parser can report done or failed
+        return True
+
+    def add(self, url: str, name: str, headline: str, refresh: bool = False) -> bool:
+        # refresh is always False here (RemoteStore can't tell), coordinator checks its store with ttl_seconds
+        cards = [{'url': url, 'name': name, 'headline': headline, 'ttl_seconds': self.ttl_seconds}]
+        return bool(self.client.request('/add', {'cards': cards})['added'])
+
+    def set_page(self, page: int, last: bool = False):
+        self.page = page
+        self.harvested = last
+        self.client.request('/page', {'page': page, 'last': last})
+
+    def take(self) -> dict or None:
+        """Next leased url record, waits while other workers hold the rest, None when the crawl is finished"""
+        while True:
+            with self.lock:
+                if self.records:
+                    return self.records.popleft()
+                response = self.client.request('/lease', {'worker': self.client.worker})
+                if response['finished']:
+                    return None
+                for record in response['records']:
+                    self.leases[record['url']] = response['lease']
+                    self.records.append(record)
+                if response['records']:
+                    logging.info('Leased %s urls (lease %s)', len(response['records']), response['lease'])
+                    continue
+            # Outside of the lock: other workers report done and failed urls meanwhile
+            sleep(POLL_SECONDS)
+
+    def lease(self, url: str) -> str or None:
+        with self.lock:
+            return self.leases.get(url)
+
+    def done(self, url: str):
+        self.client.request('/done', {'lease': self.lease(url), 'url': url})
+
+    def failed(self, url: str):
+        self.client.request('/failed', {'lease': self.lease(url), 'url': url})
+
+    def counts(self) -> dict:
+        return self.client.status()['counts']
+
+    def close(self):
+        pass
+
+
+class RemoteStore:
+    """JsonlStore interface over coordinator results sink, deduplication by url is coordinator's job"""
+
+    def __init__(self, client: CoordinatorClient, frontier: RemoteFrontier):
+        self.client = client
+        self.frontier = frontier
+        self.company = client.status()['company']
+
+    def __contains__(self, url: str) -> bool:
+        return False
+
+    def __len__(self) -> int:
+        return self.client.status()['stored']
+
+    def stale_reason(self, url: str, headline: str = None, ttl_seconds: float = None) -> str or None:
+        """Every card goes to coordinator, it skips fresh stored ones (RemoteFrontier.ttl_seconds)"""
+        return 'new'
+
+    def exists(self) -> bool:
+        return self.company is not None
+
+    def create(self, company: str):
+        self.company = self.client.request('/company', {'company': company})['company']
+
+    def append(self, employee: dict) -> bool:
+        response = self.client.request('/result', {'lease': self.frontier.lease(employee['url']), 'employee': employee})
+        return response['changed']
+
+    def close(self):
+        pass
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Long-running crawler: keeps -browsers warm signed in browsers and runs single profile (/in/) and company (/company/)
+jobs submitted over local HTTP, so a profile refresh doesn't pay Chrome start and sign in.
+Arguments after the daemon ones are selenium-linkedin-parser.py arguments shared by all jobs:
+python crawler-daemon.py -browsers 2 -session session.json -out result.jsonl -headless 1
+curl -d '{"url": "https://www.linkedin.com/in/someone/", "wait": 120}' http://127.0.0.1:8200/jobs
+"""
+import sys
+import json
+import uuid
+import queue
+import logging
+import argparse
+import threading
+from time import time, monotonic
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from crawler import Crawler, parse_options
+from command_line import logging_info, pass_through_parser
+from results_io import open_store
+from snapshot_store import SnapshotStore
+from logging_setup import setup_logging
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+arguments_parser = pass_through_parser('Crawler daemon with warm browsers pool and jobs API')
+arguments_parser.add_argument('-host', type=str, default='127.0.0.1', help='Listen address (local only by default)')
+arguments_parser.add_argument('-port', type=int, default=8200, help='Listen port')
+arguments_parser.add_argument('-browsers', type=int, default=1,
+                              help='Warm browsers, first in <user-data-dir>, next ones in <user-data-dir>-browser-N')
+arguments_parser.add_argument('-warm-url', type=str, default='https://www.linkedin.com/company/linkedin/',
+                              help='Company page browsers sign in on at start (sign in forms are looked up on company pages)')
+arguments_parser.add_argument('-keep-jobs', type=int, default=1000, help='Finished jobs kept for GET /jobs/<id>')
+arguments_parser.add_argument('-log', type=str, default='crawler-daemon.log', help='Log output file')
+arguments_parser.add_argument('-log-level', type=str, choices=['DEBUG', 'INFO', 'WARNING'], default='INFO',
+                              help='Log file level')
+
+
+class CrawlerDaemon:
+    """
+    Jobs queue served by one thread per browser: jobs: id -> {id, url, out, state, ...}.
+    Stores are opened once per output file and shared by all browsers.
+    Only the last keep_jobs finished jobs are kept.
+    """
+
+    def __init__(self, crawler: Crawler, browsers: int, keep_jobs: int = 1000):
+        user_data_dir = crawler.options.user_data_dir
+        crawler.snapshots = SnapshotStore(crawler.options.snapshots) if crawler.options.snapshots else None
+        self.crawlers = [crawler] + [crawler.sibling(f'{user_data_dir}-browser-{number}')
+                                     for number in range(2, browsers + 1)]
+        self.out = crawler.options.out
+        self.keep_jobs = keep_jobs
+        self.queue = queue.Queue()
+        self.jobs = {}
+        self.finished = {}
+        self.stores = {}
+        self.lock = threading.Lock()
+
+    def status(self) -> dict:
+        with self.lock:
+            states = {}
+            for job in self.jobs.values():
+                states[job['state']] = states.get(job['state'], 0) + 1
+            return {'browsers': len(self.crawlers), 'queued': self.queue.qsize(), 'jobs': states}
+
+    def store(self, out: str):
+        with self.lock:
+            if out not in self.stores:
+                # Every stored profile is visible to readers of SQLite output right away
+                self.stores[out] = open_store(out, batch_size=1)
+            return self.stores[out]
+
+    def submit(self, request: dict) -> dict:
+        url = request['url']
+        if '/in/' not in url and '/company/' not in url:
+            raise ValueError(f'{url} is neither profile (/in/) nor company (/company/) url')
+        job = {'id': uuid.uuid4().hex, 'url': url, 'out': request.get('out') or self.out,
+               'refresh_days': float(request.get('refresh_days', 0)), 'state': QUEUED, 'submitted_at': int(time())}
+        finished = threading.Event()
+        with self.lock:
+            self.jobs[job['id']] = job
+            self.finished[job['id']] = finished
+        logging_info(f"Job {job['id']} {url} queued")
+        self.queue.put(job['id'])
+        if request.get('wait'):
+            finished.wait(float(request['wait']))
+        return self.job(job['id'])
+
+    def job(self, job_id: str) -> dict:
+        with self.lock:
+            if job_id not in self.jobs:
+                raise KeyError(f'unknown job {job_id}')
+            return dict(self.jobs[job_id])
+
+    def update(self, job_id: str, **values):
+        with self.lock:
+            self.jobs[job_id].update(values)
+
+    def evict(self):
+        """Forget the oldest finished jobs above keep_jobs (jobs are in submit order)"""
+        with self.lock:
+            finished = [job_id for job_id, event in self.finished.items() if event.is_set()]
+            for job_id in finished[:max(0, len(finished) - self.keep_jobs)]:
+                del self.jobs[job_id]
+                del self.finished[job_id]
+
+    def serve(self, crawler: Crawler):
+        """Browser thread: warm up, then run jobs one by one"""
+        try:
+            # Start and sign in before the first job
+            crawler.browser
+        except (SystemExit, Exception) as e:
+            logging_info(f"Can't warm up browser {crawler.options.user_data_dir}: {e}")
+        while True:
+            job_id = self.queue.get()
+            if job_id is None:
+                break
+            self.run_job(crawler, self.job(job_id))
+
+    def run_job(self, crawler: Crawler, job: dict):
+        started = monotonic()
+        self.update(job['id'], state=RUNNING, browser=crawler.options.user_data_dir)
+        try:
+            if not crawler.alive():
+                logging_info(f'Browser {crawler.options.user_data_dir} not responding, restarting')
+                crawler.close()
+            crawler.options = argparse.Namespace(**vars(crawler.options))
+            crawler.options.company_url = job['url']
+            crawler.options.phase = 'all'
+            crawler.options.out = job['out']
+            crawler.options.refresh_days = job['refresh_days']
+            crawler.store = self.store(job['out'])
+            if '/in/' in job['url']:
+                employee = crawler.crawl_profile(job['url'])
+                self.update(job['id'], state=DONE, employee=employee)
+            else:
+                stored = len(crawler.store)
+                crawler.crawl_company()
+                self.update(job['id'], state=DONE, added=len(crawler.store) - stored)
+        except (SystemExit, Exception) as e:
+            # sys.exit() of crawler fatal errors ends the job, not the daemon
+            logging.debug("Job %s failed %s", job['id'], e)
+            self.update(job['id'], state=FAILED, error=str(e))
+        try:
+            self.update(job['id'], seconds=round(monotonic() - started, 3))
+            logging_info(f"Job {job['id']} {job['url']} {self.job(job['id'])['state']} in {monotonic() - started:.1f}s")
+            crawler.report()
+        except Exception as e:
+            # Summary files are best effort, the browser thread has to keep serving jobs
+            logging.debug("Job %s report failed %s", job['id'], e)
+        finally:
+            with self.lock:
+                self.finished[job['id']].set()
+        self.evict()
+
+    def start(self) -> list:
+        threads = [threading.Thread(target=self.serve, args=(crawler,), name=f'browser-{number}', daemon=True)
+                   for number, crawler in enumerate(self.crawlers, 1)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def stop(self, threads: list):
+        for thread in threads:
+            self.queue.put(None)
+        for thread in threads:
+            thread.join()
+        for crawler in self.crawlers:
+            crawler.close()
+        for store in self.stores.values():
+            store.close()
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    daemon = None
+
+    def reply(self, status: int, body: dict):
+        content = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        try:
+            if self.path == '/status':
+                self.reply(200, self.daemon.status())
+            elif self.path.startswith('/jobs/'):
+                self.reply(200, self.daemon.job(self.path[len('/jobs/'):]))
+            else:
+                self.reply(404, {'error': f'unknown path {self.path}'})
+        except KeyError as e:
+            self.reply(404, {'error': str(e)})
+
+    def do_POST(self):
+        if self.path != '/jobs':
+            self.reply(404, {'error': f'unknown path {self.path}'})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            self.reply(200, self.daemon.submit(request))
+        except (ValueError, KeyError) as e:
+            self.reply(400, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        logging.debug(format, *args)
+
+
+def start_daemon(daemon: CrawlerDaemon, host: str, port: int) -> ThreadingHTTPServer:
+    """Server in background thread, port 0 - any free port (server.server_port)"""
+    handler = type('Handler', (DaemonHandler,), {'daemon': daemon})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='crawler-daemon', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    args, crawler_arguments = arguments_parser.parse_known_args()
+    if '/company/' not in args.warm_url:
+        sys.exit(f'-warm-url {args.warm_url} is not a company page, signed out browsers would not be detected there')
+    options = parse_options(['-company-url', args.warm_url, '-log', args.log] + crawler_arguments)
+    setup_logging(args.log, args.log_level)
+    try:
+        crawler = Crawler(options)
+    except ValueError as e:
+        sys.exit(f'{options.selectors}: {e}')
+    if options.metrics or options.prometheus:
+        crawler.metrics.start_reporter(options.metrics_interval, options.metrics, options.prometheus)
+    daemon = CrawlerDaemon(crawler, args.browsers, args.keep_jobs)
+    threads = daemon.start()
+    server = start_daemon(daemon, args.host, args.port)
+    logging_info(f'Crawler daemon on http://{args.host}:{server.server_port}/ with {args.browsers} browsers')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        daemon.stop(threads)
@@ -0,0 +1,1173 @@
+# -*- coding: utf-8 -*-
+"""
+Importable crawler of selenium-linkedin-parser.py: nothing happens on import, the browser is started and signed in
+on first use of Crawler.browser and stays warm between crawls.
+crawler = Crawler(parse_options(['-company-url', 'https://www.linkedin.com/in/someone/', '-out', 'result.jsonl']))
+crawler.run()
+"""
+import os
+import copy
+import json
+import logging
+import argparse
+
+import sys
+import queue
+import threading
+from time import monotonic
+from functools import wraps
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from selenium.webdriver import ActionChains
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.remote.webelement import WebElement
+
+from command_line import logging_info
+from snapshot_store import SnapshotStore
+from frontier import Frontier
+from coordinator_client import CoordinatorClient, RemoteFrontier, RemoteStore
+from session_store import SessionStore
+from pacing import Pacer
+from instrumentation import Metrics
+from miss_counter import MissCounter
+from selector_registry import SelectorRegistry
+from results_io import open_store
+from profile_parser import build_employee, clean_company_name, clean_description, split_date_range
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# python selenium-linkedin-parser.py -company-url "https://www.linkedin.com/company/mail-ru/" -selectors selectors.json -out result.jsonl -log out.log
+# (-out result.json of old runs is converted to JSONL in place, readers tell JSONL by content)
+arguments_parser = argparse.ArgumentParser(description='Parse LinkedIn companies employees')
+arguments_parser.add_argument('-company-url', type=str, help='Company on profile URL', default='', required=True)
+arguments_parser.add_argument('-selectors', type=str, help='Config filename', default='selectors.json', required=True)
+arguments_parser.add_argument('-out', type=str, help='Output JSONL filename (one employee per line)', default='result.jsonl', required=True)
+arguments_parser.add_argument('-export', type=str, default='', help='Also write {company, employees} JSON document to this file at the end')
+arguments_parser.add_argument('-log', type=str, help='Log output file', default='out.log', required=True)
+arguments_parser.add_argument('-log-level', type=str, choices=['DEBUG', 'INFO', 'WARNING'], default='INFO',
+                              help='Log file level (DEBUG logs every not found element)')
+arguments_parser.add_argument('-misses', type=str, default='misses.json',
+                              help='Hits, misses and sample urls of misses per selector summary file')
+arguments_parser.add_argument('-headless', type=int, choices=[0, 1], help='Show (0) or hide (1) browser window', default=1)
+arguments_parser.add_argument('-page', type=int, default=0, help='Start Pagination Page')
+arguments_parser.add_argument('-lean', type=int, choices=[0, 1], default=0,
+                              help='Block images, fonts, media and trackers (selectors.json lean section) (1)')
+arguments_parser.add_argument('-extract', type=str, choices=['script', 'elements', 'snapshot'], default='script',
+                              help='Parse profile with one injected script (script), element by element (elements) '
+                                   'or only save page_source to -snapshots for parse-snapshots.py (snapshot)')
+arguments_parser.add_argument('-extract-cards', type=str, choices=['script', 'elements'], default='script',
+                              help='Collect search results cards with one injected script (script) or card by card (elements)')
+arguments_parser.add_argument('-snapshots', type=str, default='', help='Save compressed page_source snapshots to directory')
+arguments_parser.add_argument('-session', type=str, default='',
+                              help='Restore cookies and localStorage from this file instead of signing in, '
+                                   'save them to it after sign in with credentials')
+arguments_parser.add_argument('-user-data-dir', type=str, default='chrome-data', help='Chrome profile directory')
+arguments_parser.add_argument('-workers', type=int, default=0,
+                              help='Parse profiles in N parallel browsers (each in own <user-data-dir>-worker-N)')
+arguments_parser.add_argument('-phase', type=str, choices=['all', 'harvest', 'profiles'], default='all',
+                              help='Parse profiles while walking search pages (all), only collect profile urls to '
+                                   '-frontier (harvest) or parse profiles from -frontier (profiles)')
+arguments_parser.add_argument('-frontier', type=str, default='frontier.jsonl', help='Frontier file for -phase harvest/profiles')
+arguments_parser.add_argument('-coordinator', type=str, default='',
+                              help='Coordinator URL (coordinator.py): take frontier leases from it and send results to it '
+                                   'instead of local -frontier and -out files')
+arguments_parser.add_argument('-coordinator-token', type=str, default=os.getenv('COORDINATOR_TOKEN', ''),
+                              help='Shared token of coordinator.py -token (COORDINATOR_TOKEN environment variable by default)')
+arguments_parser.add_argument('-max-retries', type=int, default=3, help='Profile parse attempts in -phase profiles')
+arguments_parser.add_argument('-tab-mode', type=str, choices=['new', 'reuse'], default='new',
+                              help='Open every profile in new tab (new) or navigate one long-lived profile tab (reuse)')
+arguments_parser.add_argument('-restart-every', type=int, default=0,
+                              help='Restart browser after N parsed profiles to cap memory growth (0 - never)')
+arguments_parser.add_argument('-refresh-days', type=float, default=0,
+                              help='Re-crawl stored profiles fetched more than N days ago or with changed search '
+                                   'headline (0 - parse only new profiles)')
+arguments_parser.add_argument('-metrics', type=str, default='', help='WebDriver calls and phases timing JSON summary file')
+arguments_parser.add_argument('-prometheus', type=str, default='', help='Same metrics in Prometheus text format file')
+arguments_parser.add_argument('-metrics-interval', type=int, default=60, help='Metrics files update period, seconds')
+
+
+def parse_options(arguments: list = ()) -> argparse.Namespace:
+    """Parser arguments for use from Python code: required ones default to their defaults, later arguments win"""
+    return arguments_parser.parse_args(['-company-url', '', '-selectors', 'selectors.json', '-out', 'result.jsonl',
+                                        '-log', 'out.log'] + list(arguments))
+
+
+def read_script(name: str) -> str:
+    with open(os.path.join(ROOT_DIR, name)) as script_file:
+        return script_file.read()
+
+
+def timed(name: str):
+    """Method decorator: whole call is the phase of crawler metrics"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def send_keys_slowly(element: WebElement, keys: str, pacer: Pacer):
+    logging_info(f'Simulate human entering keys speed into WebElement: {element}')
+    for key in keys:
+        element.send_keys(key)
+        pacer.keystroke()
+
+
+def scroll_to_element(element: WebElement, element_description: str):
+    logging.debug("Scrolling to %s", element_description)
+    # 116 - header height
+    element.parent.execute_script(f"window.scrollTo(0, {element.location['y']} - window.innerHeight/2 + 116)")
+
+
+def read_credentials_json():
+    logging_info(f'Reading login and password from credentials.json')
+    with open('credentials.json') as json_file:
+        return json.load(json_file)
+
+
+def card(url: str, name: str, headline: str) -> dict:
+    return {'url': url, 'name': name, 'headline': headline, 'limited': name in ['LinkedIn Member', 'Участник LinkedIn']}
+
+
+class Crawler:
+    """
+    One browser with options of selenium-linkedin-parser.py (parse_options()).
+    Browser is started and signed in on first use of crawler.browser and is reused by next crawls.
+    store, frontier and snapshots are outputs of the current crawl (open_outputs() or set by the caller).
+    Raises ValueError if selectors config has invalid XPaths.
+    """
+
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        logging_info(f'Reading selectors from {options.selectors}')
+        with open(options.selectors, 'r') as selectors_json:
+            self.selectors = json.load(selectors_json)
+        self.registry = SelectorRegistry(self.selectors)
+        self.extract_profile_script = read_script('extract_profile.js')
+        self.extract_cards_script = read_script('extract_cards.js')
+
+        self.pacer = Pacer(self.selectors['pacing'])
+        self.session_store = SessionStore(options.session) if options.session else None
+        self.metrics = Metrics(self.registry.names())
+        self.metrics.register_script(self.extract_profile_script, 'extract_profile.js')
+        self.metrics.register_script(self.extract_cards_script, 'extract_cards.js')
+        self.metrics.add_source('pacing', self.pacer.summary)
+        self.misses = MissCounter()
+        self.registry.counter = self.misses
+        self.metrics.add_source('selectors', self.misses.summary)
+
+        self.store = None
+        self.frontier = None
+        self.snapshots = None
+        self.store_lock = threading.Lock()
+        self._browser = None
+
+    def sibling(self, user_data_dir: str) -> 'Crawler':
+        """Crawler with own browser in user_data_dir sharing config, pacer, metrics, session and outputs"""
+        crawler = copy.copy(self)
+        crawler.options = argparse.Namespace(**vars(self.options))
+        crawler.options.user_data_dir = user_data_dir
+        crawler._browser = None
+        return crawler
+
+    @property
+    def browser(self):
+        """Signed in browser, started on first use"""
+        if self._browser is None:
+            self._browser = self.create_browser(self.options.user_data_dir)
+            try:
+                self.sign_in()
+            except BaseException:
+                self.close()
+                raise
+        return self._browser
+
+    def alive(self) -> bool:
+        """False if started browser doesn't respond (crashed or closed)"""
+        if self._browser is None:
+            return True
+        try:
+            self._browser.current_url
+            return True
+        except WebDriverException as e:
+            logging.debug("Browser %s not responding %s", self.options.user_data_dir, e)
+            return False
+
+    def restart_browser(self):
+        self.close()
+        return self.browser
+
+    def close(self):
+        if self._browser is not None:
+            try:
+                self._browser.quit()
+            except WebDriverException as e:
+                logging.debug("Can't quit browser %s %s", self.options.user_data_dir, e)
+            self._browser = None
+
+    def create_browser(self, user_data_dir: str):
+        chrome_options = Options()
+        chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+        chrome_options.add_argument('--no-sandbox')
+        if self.options.headless == 1:
+            chrome_options.add_argument("--headless")
+        if self.options.lean == 1:
+            for argument in self.selectors['lean']['chrome_arguments']:
+                chrome_options.add_argument(argument)
+            chrome_options.add_experimental_option('prefs', self.selectors['lean']['chrome_prefs'])
+        browser = webdriver.Chrome(
+            executable_path=os.getenv('CHROME_DRIVER', os.path.join(ROOT_DIR, 'chromedriver')),
+            options=chrome_options
+        )
+        if self.options.lean == 1:
+            browser.set_window_size(*self.selectors['lean']['window_size'])
+        else:
+            browser.set_window_size(1280, 1024)
+        self.metrics.instrument(browser)
+        self.apply_lean(browser)
+        browser.set_script_timeout(self.selectors['extract_script_timeout_seconds'])
+        return browser
+
+    def apply_lean(self, browser):
+        """Network.setBlockedURLs works per tab, so it's applied to every new tab too"""
+        if self.options.lean == 1:
+            browser.execute_cdp_cmd('Network.enable', {})
+            browser.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.selectors['lean']['blocked_url_patterns']})
+
+    def open_url(self, url: str):
+        """GET url and report page load time to pacer"""
+        started = monotonic()
+        self.browser.get(url)
+        self.pacer.page_loaded(monotonic() - started)
+
+    def selector_timeout(self, selector_name: str) -> float:
+        return self.selectors['timeouts'].get(selector_name, self.selectors['timeouts']['default'])
+
+    def wait_for(self, selector_name: str) -> WebElement:
+        """Element as soon as it is present, NoSuchElementException after selector timeout (selectors.json timeouts)"""
+        timeout = self.selector_timeout(selector_name)
+        try:
+            return WebDriverWait(self.browser, timeout).until(
+                expected_conditions.presence_of_element_located((By.XPATH, self.registry.union(selector_name))))
+        except TimeoutException:
+            raise NoSuchElementException(f'{selector_name} not present after {timeout}s')
+
+    def wait_for_any(self, selector_names: list) -> WebElement:
+        """First present element of several page anchors, timeout is the longest of their timeouts"""
+        timeout = max(self.selector_timeout(selector_name) for selector_name in selector_names)
+        xpath = ' | '.join(self.registry.union(selector_name) for selector_name in selector_names)
+        self.metrics.register_xpath(xpath, ' | '.join(selector_names))
+        try:
+            return WebDriverWait(self.browser, timeout).until(
+                expected_conditions.presence_of_element_located((By.XPATH, xpath)))
+        except TimeoutException:
+            raise NoSuchElementException(f'None of {", ".join(selector_names)} present after {timeout}s')
+
+    def wait_for_anchor(self, selector_names: list):
+        try:
+            self.wait_for_any(selector_names)
+        except NoSuchElementException as e:
+            logging.debug("Page not ready %s", e)
+
+    def check_auth_wall(self) -> bool:
+        """Sign in forms on already signed in session means LinkedIn pushes back"""
+        for selector_name in ['modal_sign_in_button', 'sign_up_form_sign_in_link']:
+            if self.registry.find_all(self.browser, selector_name):
+                self.pacer.throttled(f'auth wall {selector_name}')
+                return True
+        return False
+
+    def ctrl_plus_tab(self):
+        logging_info('Performing CTRL+TAB')
+        actions = ActionChains(self.browser)
+        actions.key_down(Keys.CONTROL).key_down(Keys.TAB).key_up(Keys.TAB).key_up(Keys.CONTROL).perform()
+
+    def enter_login_and_password(self):
+        credentials = read_credentials_json()
+        try:
+            logging_info('Trying to find auth form login input')
+            input_login = self.wait_for('auth_input_username')
+            send_keys_slowly(input_login, credentials['login'], self.pacer)
+        except NoSuchElementException as e:
+            logging.debug("Cant' find login input %s", e)
+            print(f"Cant' find login input")
+            sys.exit(f"Cant' find login input {e}")
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        try:
+            logging_info('Trying to find auth form password input')
+            input_password = self.wait_for('auth_input_password')
+            send_keys_slowly(input_password, credentials['password'], self.pacer)
+        except NoSuchElementException as e:
+            logging.debug("Cant' find password input %s", e)
+            print(f"Cant' find password input")
+            sys.exit(f"Cant' find password input {e}")
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        logging_info(f'Login and password entered')
+
+    def parse_location(self, experience_row: WebElement) -> str:
+        try:
+            return self.registry.find(experience_row, 'profile_position_location').text
+        except NoSuchElementException as e:
+            logging.debug("Can't find profile_position_location %s", e)
+            return ''
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+            return ''
+
+    def parse_description(self, experience_row: WebElement) -> str:
+        try:
+            description_show_more = self.registry.find(experience_row, 'profile_position_description_show_more')
+            scroll_to_element(description_show_more, 'profile_position_description_show_more')
+            description_show_more.click()
+        except NoSuchElementException as e:
+            logging.debug("Can't find profile_position_description_show_more (it's normal if description is short) %s", e)
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        try:
+            description_element = self.registry.find(experience_row, 'profile_position_description')
+            return clean_description(description_element.text)
+        except NoSuchElementException as e:
+            logging.debug("Can't find profile_position_description (it's normal) %s", e)
+            return ''
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+            return ''
+
+    def parse_dates_from_to(self, experience_row: WebElement) -> {str, str}:
+        try:
+            return split_date_range(self.registry.find(experience_row, 'profile_date_range').text)
+        except NoSuchElementException as e:
+            logging.debug("Can't find profile_date_range %s", e)
+            return {'from': '', 'to': ''}
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+            return {'from': '', 'to': ''}
+
+    def parse_duration(self, experience_row: WebElement) -> str:
+        try:
+            return self.registry.find(experience_row, 'profile_date_duration').text
+        except NoSuchElementException as e:
+            logging.debug("Can't find profile_date_duration %s", e)
+            return ''
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+            return ''
+
+    def parse_many_position_name(self, experience_row):
+        try:
+            return self.registry.find(experience_row, 'profile_position_name_for_many_positions').text
+        except NoSuchElementException as e:
+            logging.debug("Can't find profile_position_name_for_many_positions %s", e)
+            return ''
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+            return ''
+
+    def parse_one_position_name(self, experience_row):
+        try:
+            return self.registry.find(experience_row, 'profile_position_name_for_one_position').text
+        except NoSuchElementException as e:
+            logging.debug("Can't find profile_position_name_for_one_position %s", e)
+            return ''
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+            return ''
+
+    @timed('experience_rows')
+    def parse_experience_row(self, experience_row: WebElement) -> dict:
+        registry = self.registry
+        experience = {'positions': []}
+
+        # ONE POSITION
+        try:
+            experience['company'] = clean_company_name(registry.find(experience_row, 'profile_company_name_with_one_position').text)
+
+            experience['duration_summary'] = self.parse_duration(experience_row)
+            position = {
+                'name': self.parse_one_position_name(experience_row),
+                'location': self.parse_location(experience_row),
+                'description': self.parse_description(experience_row),
+                'dates': self.parse_dates_from_to(experience_row)
+            }
+            position['dates']['duration'] = experience['duration_summary']
+            experience['positions'].append(position)
+        except NoSuchElementException as e:
+            experience['company'] = ''
+            logging.debug("profile_company_name_with_one_position not found (maybe because it's many positions?) %s", e)
+        except Exception as e:
+            experience['company'] = ''
+            logging.debug("Unknown Exception %s", e)
+
+        # MANY POSITIONS
+        try:
+            experience['company'] = clean_company_name(registry.find(experience_row, 'profile_company_name_with_many_positions').text)
+
+            try:
+                experience['duration_summary'] = registry.find(experience_row, 'profile_company_summary_duration_with_many_positions').text
+            except NoSuchElementException as e:
+                experience['duration_summary'] = ''
+                logging.debug("Can't find profile_company_summary_duration_with_many_positions %s", e)
+            except Exception as e:
+                experience['duration_summary'] = ''
+                logging.debug("Unknown Exception %s", e)
+
+            try:
+                for role in registry.find_all(experience_row, 'profile_experience_role_for_many_positions'):
+                    scroll_to_element(role, 'profile_experience_role_for_many_positions role')
+                    position = {
+                        'name': self.parse_many_position_name(role),
+                        'description': self.parse_description(role),
+                        'dates': self.parse_dates_from_to(role),
+                        'location': self.parse_location(role)
+                    }
+                    position['dates']['duration'] = self.parse_duration(role)
+                    experience['positions'].append(position)
+            except NoSuchElementException as e:
+                experience['positions'].append({
+                    'name': '', 'location': '', 'description': '',
+                    'dates': {'from': '', 'to': '', 'duration': ''}
+                })
+                logging.debug("Can't find profile_experience_role_for_many_positions %s", e)
+            except Exception as e:
+                logging.debug("Unknown Exception %s", e)
+                experience['positions'].append({
+                    'name': '', 'location': '', 'description': '',
+                    'dates': {'from': '', 'to': '', 'duration': ''}
+                })
+
+        except NoSuchElementException as e:
+            logging.debug('profile_company_name_with_many_positions not found (its normal!) %s', e)
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        return experience
+
+    def parse_profile_elements(self):
+        browser = self.browser
+        registry = self.registry
+        employee = {'experience': []}
+        try:
+            employee['name'] = registry.find(browser, 'profile_name').text
+        except NoSuchElementException as e:
+            employee['name'] = ''
+            logging.debug("Can't find profile_name %s", e)
+        except Exception as e:
+            employee['name'] = ''
+            logging.debug("Unknown Exception %s", e)
+
+        try:
+            profile_about_show_more_button = registry.find(browser, 'profile_about_show_more_button')
+            scroll_to_element(profile_about_show_more_button, 'profile_about_show_more_button')
+            profile_about_show_more_button.click()
+        except NoSuchElementException as e:
+            logging.debug("profile_about_show_more_button not found (it's normal if not about or about is short) %s", e)
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        try:
+            employee['position'] = registry.find(browser, 'profile_position').text
+        except NoSuchElementException as e:
+            employee['position'] = ''
+            logging.debug("Can't find profile_position %s", e)
+        except Exception as e:
+            employee['position'] = ''
+            logging.debug("Unknown Exception %s", e)
+
+        try:
+            employee['about'] = registry.find(browser, 'profile_about').text
+        except NoSuchElementException as e:
+            employee['about'] = ''
+            logging.debug("Can't find profile_about (it may be empty and not exist) %s", e)
+        except Exception as e:
+            employee['about'] = ''
+            logging.debug("Unknown Exception %s", e)
+
+        try:
+            show_more_experience_button = registry.find(browser, 'profile_show_more_experience_button')
+            scroll_to_element(show_more_experience_button, 'profile_show_more_experience_button')
+            show_more_experience_button.click()
+        except NoSuchElementException as e:
+            logging.debug("profile_show_more_experience_button not found (it's normal if little positions) %s", e)
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        try:
+            experience_rows = registry.find_all(browser, 'profile_experience_rows')
+            for experience_row in experience_rows:
+
+                scroll_to_element(experience_row, 'profile_experience_rows row')
+                try:
+                    show_more_role_button = registry.find(experience_row, 'profile_show_more_role_button')
+                    scroll_to_element(show_more_role_button, 'profile_show_more_role_button')
+                    show_more_role_button.click()
+                    scroll_to_element(experience_row, 'profile_experience_rows row')
+                except NoSuchElementException as e:
+                    logging.debug("profile_show_more_role_button not found (it's normal) %s", e)
+                except Exception as e:
+                    logging.debug("Unknown Exception %s", e)
+
+                parsed_experience = self.parse_experience_row(experience_row)
+
+                employee['experience'].append(parsed_experience)
+        except NoSuchElementException as e:
+            logging.debug("Can't find profile_experience_rows %s", e)
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        return employee
+
+    def parse_profile_script(self):
+        raw_profile = self.browser.execute_async_script(self.extract_profile_script,
+                                                        self.registry.ordered_config(self.selectors))
+        if 'error' in raw_profile:
+            raise Exception(raw_profile['error'])
+        self.misses.count_raw_profile(raw_profile)
+        return build_employee(raw_profile)
+
+    def save_snapshot(self, kind: str, url: str):
+        if self.snapshots is not None:
+            self.snapshots.save(kind, url, self.browser.page_source)
+
+    @timed('profile_parse')
+    def parse_profile(self, url: str):
+        self.misses.set_url(url)
+        self.wait_for_anchor(['profile_name'])
+        if self.options.extract == 'snapshot':
+            # Sections still have to be expanded before page_source is saved
+            self.browser.execute_async_script(self.extract_profile_script, self.registry.ordered_config(self.selectors), True)
+            return None
+        if self.options.extract == 'script':
+            try:
+                return self.parse_profile_script()
+            except Exception as e:
+                logging.debug("extract_profile.js failed, fallback to parsing element by element %s", e)
+        return self.parse_profile_elements()
+
+    def search_cards_script(self) -> (list, list, str):
+        """Cards of current search results page in one round trip: scrolling, cards, page number and first card element"""
+        result = self.browser.execute_async_script(self.extract_cards_script, self.registry.ordered_config(self.selectors))
+        if 'error' in result:
+            raise Exception(result['error'])
+        misses = self.misses
+        cards = []
+        for raw_card in result['cards']:
+            misses.count('profile_link', raw_card['url'] is not None)
+            if raw_card['url'] is None:
+                continue
+            misses.count('profile_link_actor_name', raw_card['name'] is not None)
+            misses.count('profile_link_position_name', raw_card['headline'] is not None)
+            cards.append(card(raw_card['url'], raw_card['name'] or '', raw_card['headline'] or ''))
+        misses.count('profiles_list', result['first'] is not None)
+        return cards, [result['first']] if result['first'] is not None else [], result['page'] or ''
+
+    def search_cards_elements(self) -> (list, list, str):
+        """Same as search_cards_script card by card: scroll to every card and read its elements"""
+        browser = self.browser
+        registry = self.registry
+        try:
+            global_footer = registry.find(browser, 'global_footer')
+            scroll_to_element(global_footer, 'global_footer')
+        except NoSuchElementException as e:
+            logging.debug("Can't find global_footer")
+            sys.exit(f"Can't find global_footer")
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        page_number = ''
+        try:
+            page_number = registry.find_all(browser, 'employees_pagination_current')[0].text
+        except IndexError as e:
+            logging.debug("Can't find employees_pagination_current!")
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        profiles = registry.find_all(browser, 'profiles_list')
+        cards = []
+        for profile in profiles:
+            # Profile links added to html only when visible on screen
+            scroll_to_element(profile, f'next profiles_list profile')
+            try:
+                profile_link = registry.find(profile, 'profile_link')
+            except NoSuchElementException as e:
+                logging.debug("Can't find profile_link. Maybe it is because show empty+'try free trial propose' %s", e)
+                continue
+            try:
+                actor_name = registry.find(profile_link, 'profile_link_actor_name').text
+            except NoSuchElementException as e:
+                logging.debug("Can't find profile_link_actor_name!")
+                actor_name = ''
+            try:
+                profile_link_position_name = registry.find(profile, 'profile_link_position_name').text
+            except NoSuchElementException as e:
+                profile_link_position_name = ''
+                logging.debug("Can't find profile_link_position_name!")
+            cards.append(card(profile_link.get_attribute('href'), actor_name, profile_link_position_name))
+        return cards, profiles, page_number
+
+    def search_cards(self) -> (list, list, str):
+        """Cards {url, name, headline, limited}, profiles_list elements (for staleness wait) and page number"""
+        if self.options.extract_cards == 'script':
+            try:
+                return self.search_cards_script()
+            except Exception as e:
+                logging.debug("extract_cards.js failed, fallback to collecting cards one by one %s", e)
+        return self.search_cards_elements()
+
+    def signed_out(self) -> bool:
+        return any(self.registry.find_all(self.browser, selector_name)
+                   for selector_name in ['modal_sign_in_button', 'sign_up_form_sign_in_link'])
+
+    @timed('login')
+    def sign_in(self):
+        restored = self.session_store is not None and self.session_store.restore(self.browser)
+        logging_info(f'GET {self.options.company_url}')
+        self.open_url(self.options.company_url)
+        self.wait_for_anchor(['modal_sign_in_button', 'sign_up_form_sign_in_link', 'company_name', 'profile_name'])
+
+        if restored and not self.signed_out():
+            logging_info(f'Signed in with session from {self.options.session}')
+        else:
+            if restored:
+                logging_info(f'Session from {self.options.session} expired, signing in with credentials')
+            self.sign_in_with_credentials()
+            if self.session_store is not None:
+                if self.signed_out():
+                    logging_info(f'Sign in forms are still shown, session is not saved to {self.options.session}')
+                else:
+                    self.session_store.save(self.browser)
+                    logging_info(f'Session saved to {self.options.session}')
+        self.close_messaging()
+
+    def sign_in_with_credentials(self):
+        browser = self.browser
+        registry = self.registry
+        # Modal auth (page visible)
+        # Company page shown but "view all employees" wants sign up (auth modal show at the right bottom)
+        skip_sign_up_form_sign_in_link = True
+        try:
+            logging_info('Trying to find MODAL with sign up/in links and click on sign in link')
+            modal_sign_in_button = registry.find(browser, 'modal_sign_in_button')
+            scroll_to_element(modal_sign_in_button, 'modal_sign_in_button')
+            modal_sign_in_button.click()
+            self.enter_login_and_password()
+            try:
+                modal_sign_in_button = browser.find_element_by_xpath('//button[@type="submit"]')
+                scroll_to_element(modal_sign_in_button, 'modal_sign_in_button')
+                modal_sign_in_button.click()
+            except NoSuchElementException as e:
+                print('//button[@type="submit"] not found')
+                try:
+                    logging_info('Trying click on auth_submit_button')
+                    auth_submit_button = registry.find(browser, 'auth_submit_button')
+                    scroll_to_element(auth_submit_button, 'auth_submit_button')
+                    auth_submit_button.click()
+                except NoSuchElementException as e:
+                    logging_info(f"Can't find auth_submit_button {e}")
+                    sys.exit(f"Can't find auth_submit_button {e}")
+                except Exception as e:
+                    logging.debug("Unknown Exception %s", e)
+
+            except Exception as e:
+                logging.debug("Unknown Exception %s", e)
+
+        except NoSuchElementException as e:
+            skip_sign_up_form_sign_in_link = False
+            logging.debug('Modal sign-in not found. Already authenticated? %s', e)
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        if not skip_sign_up_form_sign_in_link:
+            # SIGN UP PAGE (Company not visible, page nothing shown and want auth from start)
+            try:
+                logging_info('Trying to find SIGN UP FORM with sign in link')
+                sign_up_form_sign_in_link = registry.find(browser, 'sign_up_form_sign_in_link')
+                scroll_to_element(sign_up_form_sign_in_link, 'sign_up_form_sign_in_link')
+                sign_up_form_sign_in_link.click()
+                self.enter_login_and_password()
+                try:
+                    logging_info('Click on auth submit button')
+                    input_submit_sign_in = registry.find(browser, 'input_submit_sign_in')
+                    scroll_to_element(input_submit_sign_in, 'input_submit_sign_in')
+                    input_submit_sign_in.click()
+                except NoSuchElementException as e:
+                    logging.debug("input_submit_sign_in not found! Can't sign in! %s", e)
+                    sys.exit(f"Can't find input_submit_sign_in {e}")
+                except Exception as e:
+                    logging.debug("Unknown Exception %s", e)
+            except NoSuchElementException as e:
+                logging.debug('Sign up form with sign in link not found. %s', e)
+
+        logging_info('Signed In (or already authorized with cookies) successfully')
+        self.wait_for_anchor(['input__email_verification_pin', 'company_name', 'profile_name'])
+
+        try:
+            input__email_verification_pin = registry.find(browser, 'input__email_verification_pin')
+            pin = input(f"Founded input__email_verification_pin! Let's do a quick verification. The login attempt seems "
+                        f"suspicious. To finish signing in please enter the verification code we sent to your email address:")
+            send_keys_slowly(input__email_verification_pin, pin, self.pacer)
+            try:
+                email_pin_submit_button = registry.find(browser, 'email-pin-submit-button')
+                scroll_to_element(email_pin_submit_button, 'email-pin-submit-button')
+                email_pin_submit_button.click()
+                logging_info(f"Clicked on email-pin-submit-button")
+                self.wait_for_anchor(['company_name', 'profile_name'])
+            except NoSuchElementException as e:
+                logging.debug("email-pin-submit-button not found. Can't enter pin. Fix selectors.json %s", e)
+                sys.exit(f"email-pin-submit-button not found! Can't enter pin. Fix selectors.json")
+            except Exception as e:
+                logging.debug("Unknown Exception %s", e)
+        except NoSuchElementException as e:
+            logging.debug("Can't find input__email_verification_pin (maybe it's normal)")
+
+    def close_messaging(self):
+        browser = self.browser
+        try:
+            messaging_modal_expanded = self.registry.find(browser, 'messaging_modal_expanded')
+            scroll_to_element(messaging_modal_expanded, 'messaging_modal_expanded')
+            messaging_modal_expanded.click()
+            logging_info(f"Messaging modal was closed")
+        except NoSuchElementException as e:
+            logging.debug("messaging_modal_expanded not found (it's normal, maybe it was already closed)")
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        try:
+            for conversation_window in self.registry.find_all(browser, 'close_conversation_window'):
+                scroll_to_element(conversation_window, 'conversation_window')
+                conversation_window.click()
+                logging_info(f"{conversation_window.text} closed")
+        except NoSuchElementException as e:
+            logging.debug("close_conversation_window not found (it's normal, maybe they not exists)")
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+    def stale_reason(self, url: str, headline: str) -> str or None:
+        """Why profile should be parsed: new, expired or headline changed (-refresh-days), None to skip"""
+        refresh_days = self.options.refresh_days
+        return self.store.stale_reason(url, headline, refresh_days * 86400 if refresh_days > 0 else None)
+
+    @timed('output_write')
+    def append_employee(self, employee: dict) -> bool:
+        """False if profile content not changed since previous fetch"""
+        with self.store_lock:
+            return self.store.append(employee)
+
+    def stored_message(self, changed: bool) -> str:
+        return f'Added to {self.options.out}' if changed else f'Not changed, fetch time updated in {self.options.out}'
+
+    def restart_if_due(self, parsed: int):
+        """Restart browser every -restart-every parsed profiles"""
+        if self.options.restart_every and parsed and parsed % self.options.restart_every == 0:
+            logging_info(f'Restarting browser {self.options.user_data_dir} after {self.options.restart_every} profiles')
+            self.restart_browser()
+
+    def open_profile_tab(self, search_handle: str) -> str:
+        """Long-lived profile tab of -tab-mode reuse, opened on first use"""
+        browser = self.browser
+        handles = [handle for handle in browser.window_handles if handle != search_handle]
+        if not handles:
+            browser.execute_script("window.open('about:blank', '_blank')")
+            handles = [handle for handle in browser.window_handles if handle != search_handle]
+            browser.switch_to.window(handles[0])
+            self.apply_lean(browser)
+        return handles[0]
+
+    def frontier_done(self, url: str):
+        if self.frontier is not None and url in self.frontier:
+            self.frontier.done(url)
+
+    def frontier_failed(self, url: str):
+        if self.frontier is not None and url in self.frontier:
+            self.frontier.failed(url)
+
+    def write_employees(self, employees_queue: queue.Queue):
+        """Single writer of the store for all workers"""
+        while True:
+            item = employees_queue.get()
+            if item is None:
+                break
+            employee, actor_name = item
+            changed = self.append_employee(employee)
+            self.frontier_done(employee['url'])
+            logging_info(f'{self.stored_message(changed)}: {actor_name} [{employee["position"]}]\n')
+
+    def start_workers(self) -> (list, queue.Queue, queue.Queue, threading.Thread):
+        profiles_queue = queue.Queue()
+        employees_queue = queue.Queue()
+        workers = [ProfileWorker(number, self.sibling(f'{self.options.user_data_dir}-worker-{number}'),
+                                 profiles_queue, employees_queue)
+                   for number in range(1, self.options.workers + 1)]
+        for worker in workers:
+            worker.start()
+        writer = threading.Thread(target=self.write_employees, args=(employees_queue,), name='writer', daemon=True)
+        writer.start()
+        return workers, profiles_queue, employees_queue, writer
+
+    @staticmethod
+    def stop_workers(workers: list, profiles_queue: queue.Queue, employees_queue: queue.Queue, writer: threading.Thread):
+        for worker in workers:
+            profiles_queue.put(None)
+        for worker in workers:
+            worker.join()
+        employees_queue.put(None)
+        writer.join()
+
+    def parse_frontier(self):
+        parsed = 0
+        while True:
+            record = self.frontier.take()
+            if record is None:
+                break
+            url = record['url']
+            self.restart_if_due(parsed)
+            parsed += 1
+            try:
+                logging_info(f'-> Parsing {url}')
+                self.pacer.acquire()
+                self.open_url(url)
+                if self.check_auth_wall():
+                    # Sign in forms instead of the profile: retried later, never stored as empty employee
+                    logging_info(f'x Auth wall on {url}, not parsed')
+                    self.frontier.failed(url)
+                    continue
+                employee = self.parse_profile(url)
+                self.save_snapshot('profile', url)
+                if employee is not None:
+                    employee['url'] = url
+                    changed = self.append_employee(employee)
+                    logging_info(f'{self.stored_message(changed)}: {record["name"]} [{employee["position"]}]\n')
+                self.frontier.done(url)
+            except Exception as e:
+                logging.debug("Unknown Exception %s", e)
+                self.frontier.failed(url)
+
+    def open_outputs(self):
+        """Store, frontier and snapshots of -out, -frontier (or -coordinator) and -snapshots"""
+        options = self.options
+        if options.coordinator:
+            coordinator = CoordinatorClient(options.coordinator, options.coordinator_token)
+            # Coordinator owns the store, so it decides staleness of harvested urls
+            self.frontier = RemoteFrontier(coordinator, options.refresh_days * 86400 if options.refresh_days > 0 else None)
+            self.store = RemoteStore(coordinator, self.frontier)
+            options.out = options.frontier = options.coordinator
+        else:
+            self.store = open_store(options.out)
+            self.frontier = Frontier(options.frontier, options.max_retries) if options.phase != 'all' else None
+        self.snapshots = SnapshotStore(options.snapshots) if options.snapshots else None
+        logging_info(f'{len(self.store)} employees already stored in {options.out}')
+        if self.frontier is not None:
+            logging_info(f'Frontier {options.frontier}: {self.frontier.counts()}, last harvested page {self.frontier.page}')
+
+    def close_outputs(self):
+        # Export reads the store: SqliteStore can't be read after close()
+        if self.options.export and not self.options.coordinator:
+            logging_info(f'Exporting {self.options.out} to {self.options.export}')
+            self.store.export_json(self.options.export)
+        self.store.close()
+        if self.frontier is not None:
+            self.frontier.close()
+
+    def report(self):
+        """Pacing summary to log, metrics and selector misses files"""
+        logging_info(f'Pacing summary: {json.dumps(self.pacer.summary())}')
+        self.metrics.write(self.options.metrics, self.options.prometheus)
+        if self.options.misses:
+            self.misses.write(self.options.misses)
+        never_found = [key for key, counts in self.misses.summary().items()
+                       if counts['hits'] == 0 and counts['misses'] >= 10]
+        if never_found:
+            logging_info(f'Selectors not found on any of 10+ pages (layout changed?): {", ".join(never_found)}')
+
+    def run(self):
+        """Whole parser run: open outputs, crawl, write summaries and close outputs (browser stays open)"""
+        self.open_outputs()
+        try:
+            self.crawl()
+        finally:
+            self.report()
+            self.close_outputs()
+
+    def crawl(self):
+        """-phase profiles, company (/company/) or single profile (/in/) -company-url into current outputs"""
+        options = self.options
+        if options.phase == 'profiles':
+            logging_info(f'Parsing profiles from frontier {options.frontier}')
+            if options.workers > 0:
+                self.stop_workers(*self.start_workers())
+            else:
+                self.parse_frontier()
+            logging_info(f'Frontier {options.frontier}: {self.frontier.counts()}')
+
+        elif options.phase == 'harvest' and self.frontier.harvested and options.refresh_days == 0:
+            logging_info(f'All search pages already harvested to {options.frontier}')
+
+        elif '/company/' in options.company_url:
+            self.crawl_company()
+
+        elif '/in/' in options.company_url:
+            employee = self.crawl_profile(options.company_url)
+            if employee is None:
+                logging_info(f'Snapshot of {options.company_url} saved to {options.snapshots}')
+
+    def crawl_profile(self, url: str) -> dict or None:
+        """Parse and store single profile, None if only its snapshot is saved (-extract snapshot)"""
+        logging_info(f"Founded /in/ in url, assume this is single profile")
+        # Browser signed in on -company-url is already there
+        if self.browser.current_url != url:
+            self.pacer.acquire()
+            self.open_url(url)
+            if self.check_auth_wall():
+                sys.exit(f'Auth wall on {url}, profile not parsed')
+        employee = self.parse_profile(url)
+        self.save_snapshot('profile', url)
+        if employee is None:
+            return None
+        employee['url'] = url
+        out = self.options.out
+        logging_info(f'CHECK IF PROFILE {url} EXIST IN {out}')
+        logging_info(f'Reading data from {out}')
+        if url not in self.store:
+            logging_info(f"{employee['name']} not founded in {out} and appended as new")
+        else:
+            logging_info(f"{employee['name']} founded in {out} and rewrite existed employee data")
+        # Appended record replaces previous one with the same url on read/export
+        self.append_employee(employee)
+        return employee
+
+    def crawl_company(self):
+        options = self.options
+        frontier = self.frontier
+        registry = self.registry
+        logging_info(f"Founded /company/ in url, assume this is company url")
+        browser = self.browser
+        if browser.current_url != options.company_url:
+            self.open_url(options.company_url)
+            self.wait_for_anchor(['company_name'])
+        try:
+            company_name = registry.find(browser, 'company_name').text
+            logging_info(f'Extracted company name {company_name}')
+            self.save_snapshot('company', options.company_url)
+        except NoSuchElementException as e:
+            logging.debug("Can't find company_name %s", e)
+            sys.exit(f"Can't find company_name {e}")
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        # Browsers of crawler-daemon.py share the store: the second job must not truncate what the first one wrote
+        with self.store_lock:
+            if not self.store.exists():
+                self.store.create(company_name)
+
+        if options.workers > 0 and options.phase == 'all':
+            queued_urls = set()
+            workers, profiles_queue, employees_queue, writer = self.start_workers()
+
+        try:
+            link_to_all_employees = registry.find(browser, 'link_to_all_employees')
+            scroll_to_element(link_to_all_employees, 'link_to_all_employees')
+            logging_info(f'Click on link "See all employees"\n')
+            link_to_all_employees.click()
+            self.wait_for_anchor(['profiles_list'])
+        except NoSuchElementException as e:
+            logging.debug("Can't find link_to_all_employees %s", e)
+            sys.exit(f"Can't find link_to_all_employees {e}")
+        except Exception as e:
+            logging.debug("Unknown Exception %s", e)
+
+        page = options.page
+        if options.phase == 'harvest' and page == 0 and frontier.page != 0 and not frontier.harvested:
+            page = frontier.page + 1
+            logging_info(f'Resume harvesting after page {frontier.page}')
+
+        if page != 0:
+            custom_pagination_link = f"{browser.current_url}&page={page}"
+            logging_info(f"Received argument -page: {page}.\nOpening custom link: {custom_pagination_link}\n")
+            self.open_url(custom_pagination_link)
+            self.wait_for_anchor(['profiles_list'])
+
+        last_page = False
+        page_number = ''
+        parsed_since_restart = 0
+        while not last_page:
+            self.metrics.start_phase('search_page')
+            search_url = browser.current_url
+            self.misses.set_url(search_url)
+            try:
+                cards, profiles, page_number = self.search_cards()
+                logging_info(f"Current pagination page: {page_number}")
+                if profiles:
+                    self.pacer.ok()
+                else:
+                    self.pacer.throttled('profiles_list missing')
+                for search_card in cards:
+                    try:
+                        profile_link_href, actor_name, profile_link_position_name = \
+                            search_card['url'], search_card['name'], search_card['headline']
+                        if search_card['limited']:
+                            logging_info(f"x profile {profile_link_position_name} has limited visibility. Skip iteration.")
+                            continue
+                        reason = self.stale_reason(profile_link_href, profile_link_position_name)
+                        if options.phase == 'harvest':
+                            if reason is not None and frontier.add(profile_link_href, actor_name, profile_link_position_name,
+                                                                   refresh=reason != 'new'):
+                                logging_info(f'+ Added to frontier {profile_link_href} ({actor_name}, {reason})')
+                            continue
+
+                        if reason is not None and not (options.extract == 'snapshot' and profile_link_href in self.snapshots):
+                            if options.workers > 0:
+                                if profile_link_href not in queued_urls:
+                                    logging_info(f'-> Queued {profile_link_href}')
+                                    queued_urls.add(profile_link_href)
+                                    profiles_queue.put((profile_link_href, actor_name))
+                                continue
+
+                            logging_info(f'-> Parsing {profile_link_href} ({reason})')
+                            # Profile time is not search_page time: workers parse outside of it too
+                            with self.metrics.suspended():
+                                search_handle = browser.current_window_handle
+                                if options.tab_mode == 'reuse':
+                                    browser.switch_to.window(self.open_profile_tab(search_handle))
+                                    self.pacer.acquire()
+                                    self.open_url(profile_link_href)
+                                else:
+                                    # Blank tab first: token is taken before the request and the load is timed by GET
+                                    browser.execute_script("window.open('about:blank', '_blank')")
+                                    browser.switch_to.window(browser.window_handles[-1])
+                                    self.apply_lean(browser)
+                                    self.pacer.acquire()
+                                    self.open_url(profile_link_href)
+                                if self.check_auth_wall():
+                                    # Not stored, so the next run parses it again
+                                    logging_info(f'x Auth wall on {profile_link_href}, not parsed')
+                                else:
+                                    # TODO: NEED CHECK FOR CAPTCHA IN NEW PROFILE TAB
+                                    employee = self.parse_profile(profile_link_href)
+                                    self.misses.set_url(search_url)
+                                    self.save_snapshot('profile', profile_link_href)
+                                    if employee is not None:
+                                        employee['url'] = profile_link_href
+                                        changed = self.append_employee(employee)
+                                        logging_info(f'{self.stored_message(changed)}: {actor_name} [{employee["position"]}]\n')
+                                    parsed_since_restart += 1
+
+                                if options.tab_mode == 'new':
+                                    browser.close()
+                                browser.switch_to.window(search_handle)
+                        else:
+                            logging_info(f'x Skip {profile_link_href} ({actor_name}) - already exist in {options.out} and fresh.')
+                    except Exception as e:
+                        logging.debug("Unknown Exception %s", e)
+
+            except NoSuchElementException as e:
+                logging.debug("Can't find profiles_list %s", e)
+                sys.exit(f"Can't find profiles_list {e}")
+            except Exception as e:
+                logging.debug("Unknown Exception %s", e)
+
+            self.save_snapshot('search', browser.current_url)
+            if options.phase == 'harvest' and page_number.isdigit():
+                frontier.set_page(int(page_number))
+
+            # Restart only between pages: profiles_list elements of the current page die with the browser
+            if options.restart_every and parsed_since_restart >= options.restart_every:
+                search_url = browser.current_url
+                logging_info(f'Restarting browser {options.user_data_dir} after {options.restart_every} profiles')
+                browser = self.restart_browser()
+                self.open_url(search_url)
+                self.wait_for_anchor(['profiles_list'])
+                # Old profiles died with the previous session: staleness wait needs cards of the new one
+                profiles = registry.find_all(browser, 'profiles_list')[:1]
+                parsed_since_restart = 0
+
+            try:
+                # TODO: NEED CHECK FOR CAPTCHA IN NEW SEARCH PAGINATION PAGE
+                pagination_next_button = registry.find(browser, 'employees_pagination_next')
+                scroll_to_element(pagination_next_button, 'employees_pagination_next')
+                if pagination_next_button.is_enabled():
+                    self.pacer.pause('before next pagination page')
+                    logging_info('\nClick on next pagination button')
+                    pagination_next_button.click()
+                    if profiles:
+                        # Results are replaced without page reload: old card goes stale first
+                        try:
+                            WebDriverWait(browser, self.selector_timeout('profiles_list')).until(
+                                expected_conditions.staleness_of(profiles[0]))
+                        except TimeoutException:
+                            logging.debug("Search results not changed after next pagination page click")
+                    self.wait_for_anchor(['profiles_list'])
+                else:
+                    logging_info('Pagination next button not found. Assume this is the last page.')
+                    last_page = True
+                    if options.phase == 'harvest':
+                        frontier.set_page(frontier.page, last=True)
+
+            except NoSuchElementException as e:
+                logging.debug("Can't find employees_pagination_next. Exit.")
+                sys.exit(f"Can't find employees_pagination_next. Exit.")
+            except Exception as e:
+                logging.debug("Unknown Exception %s", e)
+            self.metrics.end_phase()
+
+        if options.workers > 0 and options.phase == 'all':
+            logging_info(f'All pages collected, waiting for {options.workers} workers to parse {profiles_queue.qsize()} queued profiles')
+            self.stop_workers(workers, profiles_queue, employees_queue, writer)
+
+
+class ProfileWorker(threading.Thread):
+    """
+    Parses profiles from profiles_queue (or from frontier in -phase profiles) in own browser (crawler sibling)
+    and puts employees to employees_queue
+    """
+
+    def __init__(self, number: int, crawler: Crawler, profiles_queue: queue.Queue, employees_queue: queue.Queue):
+        super().__init__(name=f'worker-{number}', daemon=True)
+        self.crawler = crawler
+        self.profiles_queue = profiles_queue
+        self.employees_queue = employees_queue
+
+    def run(self):
+        crawler = self.crawler
+        parsed = 0
+        while True:
+            profile = self.next_profile()
+            if profile is None:
+                break
+            url, actor_name = profile
+            crawler.restart_if_due(parsed)
+            parsed += 1
+            try:
+                logging_info(f'-> [{self.name}] Parsing {url}')
+                crawler.pacer.acquire()
+                crawler.open_url(url)
+                if crawler.check_auth_wall():
+                    logging_info(f'x [{self.name}] Auth wall on {url}, not parsed')
+                    crawler.frontier_failed(url)
+                    continue
+                employee = crawler.parse_profile(url)
+                crawler.save_snapshot('profile', url)
+                if employee is not None:
+                    employee['url'] = url
+                    self.employees_queue.put((employee, actor_name))
+                else:
+                    crawler.frontier_done(url)
+            except Exception as e:
+                logging.debug("[%s] Unknown Exception %s", self.name, e)
+                crawler.frontier_failed(url)
+        crawler.close()
+
+    def next_profile(self) -> (str, str) or None:
+        if self.crawler.options.phase == 'profiles':
+            record = self.crawler.frontier.take()
+            return (record['url'], record['name']) if record is not None else None
+        return self.profiles_queue.get()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+from functools import lru_cache
+
+
+# First letters of month names as LinkedIn shows them in English and Russian ("Jan 2019", "янв. 2019 г.")
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6, 'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+    'янв': 1, 'фев': 2, 'мар': 3, 'апр': 4, 'май': 5, 'мая': 5, 'июн': 6, 'июл': 7, 'авг': 8, 'сен': 9, 'окт': 10,
+    'ноя': 11, 'дек': 12
+}
+PRESENT = ['present', 'настоящее время', 'по настоящее время', 'сейчас']
+YEAR_UNITS = ['yr', 'yrs', 'year', 'years', 'г', 'год', 'года', 'лет']
+MONTH_UNITS = ['mo', 'mos', 'month', 'months', 'мес', 'месяц', 'месяца', 'месяцев']
+LESS_THAN_YEAR = ['less than a year', 'менее года']
+
+
+@lru_cache(maxsize=4096)
+def parse_month(text: str) -> (int, int, bool) or None:
+    """(year, month, is_present) of "Jan 2019", "2019", "янв. 2019 г.", "Present"; None if not recognized"""
+    text = text.strip().lower()
+    if text in PRESENT:
+        return None, None, True
+    words = [word.strip('.,') for word in text.split()]
+    years = [int(word) for word in words if word.isdigit() and len(word) == 4]
+    if not years:
+        return None
+    months = [MONTHS[word[:3]] for word in words if word[:3] in MONTHS]
+    return years[0], months[0] if months else 1, False
+
+
+@lru_cache(maxsize=4096)
+def parse_duration(text: str) -> int or None:
+    """Months of "2 yrs 3 mos", "1 yr", "2 г. 3 мес.", "5 лет"; None if not recognized"""
+    text = text.strip().lower()
+    if text in LESS_THAN_YEAR:
+        return 0
+    words = [word.strip('.,') for word in text.split()]
+    months = None
+    for number, unit in zip(words, words[1:]):
+        if not number.isdigit():
+            continue
+        if unit in YEAR_UNITS:
+            months = (months or 0) + int(number) * 12
+        elif unit in MONTH_UNITS:
+            months = (months or 0) + int(number)
+    return months
+
+
+@lru_cache(maxsize=4096)
+def duration_to_months(date: str) -> int or str:
+    """Months of position duration for positions-durations.py output, 'No duration' if not recognized"""
+    months = parse_duration(date or '')
+    return 'No duration' if months is None else months
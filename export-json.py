@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+import argparse
+
+from results_io import open_store
+
+arguments_parser = argparse.ArgumentParser(description='Export JSONL or SQLite parser output to {company, employees} json document')
+arguments_parser.add_argument('-i', type=str, default='result.jsonl', help='Input jsonl or .db file')
+arguments_parser.add_argument('-o', type=str, default='result.json', help='Output json file')
+args = arguments_parser.parse_args()
+
+store = open_store(args.i, create=False)
+store.export_json(args.o)
+store.close()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Flattens parser results to employees, experiences and positions Parquet datasets partitioned by company:
+<out>/positions/company=<name>/<input name>-0.parquet
+Position dates are normalized to start/end month (first day of month, "Present" - current month)
+and tenure in months, so analytics read only needed columns instead of nested JSON.
+Employees are flattened and written in row groups of -batch employees, so memory doesn't grow with the input.
+"""
+import os
+import argparse
+from datetime import date
+from itertools import islice
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from durations import parse_month, parse_duration
+from results_io import read_company, iter_employees
+
+arguments_parser = argparse.ArgumentParser(description='Export parser results to partitioned Parquet datasets')
+arguments_parser.add_argument('-i', type=str, nargs='+', default=['result.jsonl'], help='Input JSONL stores or json documents')
+arguments_parser.add_argument('-o', type=str, default='parquet', help='Output directory')
+arguments_parser.add_argument('-batch', type=int, default=1000, help='Employees per row group')
+
+EMPLOYEES_SCHEMA = pa.schema([
+    ('company', pa.string()), ('url', pa.string()), ('name', pa.string()), ('position', pa.string()),
+    ('about', pa.string()), ('experiences', pa.int32()), ('fetched_at', pa.timestamp('s'))
+])
+EXPERIENCES_SCHEMA = pa.schema([
+    ('company', pa.string()), ('url', pa.string()), ('experience_index', pa.int32()),
+    ('experience_company', pa.string()), ('positions', pa.int32()), ('duration_months', pa.int32())
+])
+POSITIONS_SCHEMA = pa.schema([
+    ('company', pa.string()), ('url', pa.string()), ('experience_index', pa.int32()), ('position_index', pa.int32()),
+    ('experience_company', pa.string()), ('name', pa.string()), ('location', pa.string()), ('description', pa.string()),
+    ('start_month', pa.date32()), ('end_month', pa.date32()), ('is_current', pa.bool_()),
+    ('duration_months', pa.int32()), ('tenure_months', pa.int32())
+])
+
+
+def month_date(text: str, present: date) -> (date or None, bool):
+    parsed = parse_month(text) if text else None
+    if parsed is None:
+        return None, False
+    year, month, is_present = parsed
+    if is_present:
+        return present, True
+    return date(year, month, 1), False
+
+
+def tenure_months(start: date or None, end: date or None, duration: int or None) -> int or None:
+    """Months between start and end months inclusive (LinkedIn counts both), duration text if dates are unknown"""
+    if start is not None and end is not None:
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return duration
+
+
+def flatten(company: str, employees, present: date) -> (dict, dict, dict):
+    """Columns of employees, experiences and positions tables"""
+    tables = [{field.name: [] for field in schema} for schema in [EMPLOYEES_SCHEMA, EXPERIENCES_SCHEMA, POSITIONS_SCHEMA]]
+    employees_columns, experiences_columns, positions_columns = tables
+
+    def add(columns: dict, **values):
+        for name, column in columns.items():
+            column.append(values.get(name))
+
+    for employee in employees:
+        url = employee.get('url', '')
+        add(employees_columns, company=company, url=url, name=employee.get('name', ''),
+            position=employee.get('position', ''), about=employee.get('about', ''),
+            experiences=len(employee.get('experience', [])),
+            fetched_at=employee.get('fetched_at'))
+        for experience_index, experience in enumerate(employee.get('experience', [])):
+            add(experiences_columns, company=company, url=url, experience_index=experience_index,
+                experience_company=experience.get('company', ''), positions=len(experience['positions']),
+                duration_months=parse_duration(experience.get('duration_summary', '')))
+            for position_index, position in enumerate(experience['positions']):
+                dates = position.get('dates', {})
+                start, _ = month_date(dates.get('from', ''), present)
+                end, is_current = month_date(dates.get('to', ''), present)
+                duration = parse_duration(dates.get('duration', ''))
+                add(positions_columns, company=company, url=url, experience_index=experience_index,
+                    position_index=position_index, experience_company=experience.get('company', ''),
+                    name=position.get('name', ''), location=position.get('location', ''),
+                    description=position.get('description', ''), start_month=start, end_month=end,
+                    is_current=is_current, duration_months=duration, tenure_months=tenure_months(start, end, duration))
+    return tables
+
+
+class PartitionWriter:
+    """One Parquet file of a table per input file in <directory>/company=<name>/ (hive partitioning)"""
+
+    def __init__(self, schema: pa.Schema, directory: str, company: str, basename: str):
+        # Partition column lives in the directory name, not in the file
+        self.schema = schema.remove(schema.get_field_index('company'))
+        partition = os.path.join(directory, f'company={quote(company, safe="")}')
+        os.makedirs(partition, exist_ok=True)
+        self.writer = pq.ParquetWriter(os.path.join(partition, f'{basename}.parquet'), self.schema)
+        self.rows = 0
+
+    def write(self, columns: dict):
+        columns = {name: column for name, column in columns.items() if name != 'company'}
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+        if table.num_rows:
+            self.writer.write_table(table)
+            self.rows += table.num_rows
+
+    def close(self) -> int:
+        self.writer.close()
+        return self.rows
+
+
+def export(filename: str, out: str, present: date, batch: int) -> dict:
+    company = read_company(filename)
+    basename = os.path.splitext(os.path.basename(filename))[0]
+    names = ['employees', 'experiences', 'positions']
+    writers = [PartitionWriter(schema, os.path.join(out, name), company, basename)
+               for name, schema in zip(names, [EMPLOYEES_SCHEMA, EXPERIENCES_SCHEMA, POSITIONS_SCHEMA])]
+    employees = iter_employees(filename)
+    while True:
+        chunk = list(islice(employees, batch))
+        if not chunk:
+            break
+        for writer, columns in zip(writers, flatten(company, chunk, present)):
+            writer.write(columns)
+    return {name: writer.close() for name, writer in zip(names, writers)}
+
+
+if __name__ == '__main__':
+    args = arguments_parser.parse_args()
+    today = date.today().replace(day=1)
+    for input_filename in args.i:
+        print(f'{input_filename} -> {args.o}: {export(input_filename, args.o, today, args.batch)}')
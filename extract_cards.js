@@ -0,0 +1,77 @@
+// Collects every search results card of the current page in one WebDriver round trip (execute_async_script).
+// arguments[0] - selectors.json with every selector as list of fallback XPaths (SelectorRegistry.ordered_config()), last - callback.
+// Cards render profile links only when visible, so the page is scrolled down in steps first.
+// Returns {cards: [{url, name, headline}] (null if element not found), page: current page text, first: first card element}.
+var selectors = arguments[0];
+var done = arguments[arguments.length - 1];
+
+function first(variants, context) {
+    for (var v = 0; v < variants.length; v++) {
+        var node = document.evaluate(variants[v], context || document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (node !== null) {
+            return node;
+        }
+    }
+    return null;
+}
+
+function all(variants, context) {
+    for (var v = 0; v < variants.length; v++) {
+        var snapshot = document.evaluate(variants[v], context || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        if (snapshot.snapshotLength > 0) {
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            return nodes;
+        }
+    }
+    return [];
+}
+
+function text(variants, context) {
+    var node = first(variants, context);
+    if (node === null) {
+        return null;
+    }
+    return (node.innerText || node.textContent || '').trim();
+}
+
+function extract() {
+    var profiles = all(selectors['profiles_list']);
+    done({
+        'cards': profiles.map(function (profile) {
+            var link = first(selectors['profile_link'], profile);
+            return {
+                'url': link === null ? null : link.href,
+                'name': link === null ? null : text(selectors['profile_link_actor_name'], link),
+                'headline': text(selectors['profile_link_position_name'], profile)
+            };
+        }),
+        'page': text(selectors['employees_pagination_current']),
+        'first': profiles.length > 0 ? profiles[0] : null
+    });
+}
+
+function scrollStep(y) {
+    try {
+        window.scrollTo(0, y);
+        if (y < document.body.scrollHeight) {
+            setTimeout(function () {
+                scrollStep(y + Math.max(100, Math.floor(window.innerHeight * 0.75)));
+            }, selectors['search_scroll_step_delay_ms']);
+        } else {
+            setTimeout(function () {
+                try {
+                    extract();
+                } catch (e) {
+                    done({'error': e.toString()});
+                }
+            }, selectors['search_scroll_step_delay_ms']);
+        }
+    } catch (e) {
+        done({'error': e.toString()});
+    }
+}
+
+scrollStep(0);
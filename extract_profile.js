@@ -0,0 +1,170 @@
+// Extracts whole profile in one WebDriver round trip (execute_async_script).
+// arguments[0] - selectors.json with every selector as list of fallback XPaths (SelectorRegistry.ordered_config()),
+// arguments[1] - only expand sections (for page_source snapshot), last - callback.
+// Returns raw texts (null if element not found), profile_parser.build_employee() makes employee dict from them.
+var selectors = arguments[0];
+var expandOnly = arguments.length > 2 && arguments[1];
+var done = arguments[arguments.length - 1];
+
+// Variants are tried in order, first one with result wins
+function first(variants, context) {
+    for (var v = 0; v < variants.length; v++) {
+        var node = document.evaluate(variants[v], context || document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (node !== null) {
+            return node;
+        }
+    }
+    return null;
+}
+
+function all(variants, context) {
+    for (var v = 0; v < variants.length; v++) {
+        var snapshot = document.evaluate(variants[v], context || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        if (snapshot.snapshotLength > 0) {
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            return nodes;
+        }
+    }
+    return [];
+}
+
+function text(variants, context) {
+    var node = first(variants, context);
+    if (node === null) {
+        return null;
+    }
+    return (node.innerText || node.textContent || '').trim();
+}
+
+// State of show more button before its click: LinkedIn "see more" only removes a CSS clamp,
+// so the button itself (removed, "see more" -> "see less", aria-expanded, class) tells when it's done
+function buttonState(button) {
+    return [button.getAttribute('aria-expanded'), button.className, (button.textContent || '').trim(),
+            button.offsetParent !== null].join('|');
+}
+
+function press(button, pressed) {
+    pressed.push({'button': button, 'state': buttonState(button)});
+    button.click();
+}
+
+function click(variants, context, pressed) {
+    var node = first(variants, context);
+    if (node !== null) {
+        press(node, pressed);
+    }
+}
+
+function position(context) {
+    return {
+        'description': text(selectors['profile_position_description'], context),
+        'date_range': text(selectors['profile_date_range'], context),
+        'location': text(selectors['profile_position_location'], context)
+    };
+}
+
+function parseRow(row) {
+    var parsed = {'one': null, 'many': null};
+
+    var oneCompany = text(selectors['profile_company_name_with_one_position'], row);
+    if (oneCompany !== null) {
+        parsed['one'] = position(row);
+        parsed['one']['company'] = oneCompany;
+        parsed['one']['name'] = text(selectors['profile_position_name_for_one_position'], row);
+        parsed['one']['duration'] = text(selectors['profile_date_duration'], row);
+    }
+
+    var manyCompany = text(selectors['profile_company_name_with_many_positions'], row);
+    if (manyCompany !== null) {
+        parsed['many'] = {
+            'company': manyCompany,
+            'duration': text(selectors['profile_company_summary_duration_with_many_positions'], row),
+            'roles': all(selectors['profile_experience_role_for_many_positions'], row).map(function (role) {
+                var parsedRole = position(role);
+                parsedRole['name'] = text(selectors['profile_position_name_for_many_positions'], role);
+                parsedRole['duration'] = text(selectors['profile_date_duration'], role);
+                return parsedRole;
+            })
+        };
+    }
+    return parsed;
+}
+
+function expandRows() {
+    var pressed = [];
+    all(selectors['profile_experience_rows']).forEach(function (row) {
+        click(selectors['profile_show_more_role_button'], row, pressed);
+        all(selectors['profile_position_description_show_more'], row).forEach(function (button) {
+            press(button, pressed);
+        });
+    });
+    return pressed;
+}
+
+function expanded(pressed) {
+    return pressed.every(function (item) {
+        return !document.contains(item.button) || buttonState(item.button) !== item.state;
+    });
+}
+
+// Calls next as soon as every pressed button is gone or changed (checked on every DOM mutation),
+// right away if nothing was pressed, at the latest after extract_script_expand_timeout_ms
+function afterExpand(pressed, next) {
+    var finished = false;
+    var observer = null;
+    var timer = null;
+    function finish() {
+        if (finished) {
+            return;
+        }
+        finished = true;
+        if (observer !== null) {
+            observer.disconnect();
+        }
+        clearTimeout(timer);
+        try {
+            next();
+        } catch (e) {
+            done({'error': e.toString()});
+        }
+    }
+    if (expanded(pressed)) {
+        finish();
+        return;
+    }
+    observer = new MutationObserver(function () {
+        if (expanded(pressed)) {
+            finish();
+        }
+    });
+    observer.observe(document.documentElement, {'subtree': true, 'childList': true, 'attributes': true, 'characterData': true});
+    timer = setTimeout(finish, selectors['extract_script_expand_timeout_ms']);
+}
+
+function extract() {
+    if (expandOnly) {
+        done(null);
+        return;
+    }
+    done({
+        'name': text(selectors['profile_name']),
+        'position': text(selectors['profile_position']),
+        'about': text(selectors['profile_about']),
+        'rows': all(selectors['profile_experience_rows']).map(parseRow)
+    });
+}
+
+try {
+    var pressed = [];
+    click(selectors['profile_about_show_more_button'], null, pressed);
+    click(selectors['profile_show_more_experience_button'], null, pressed);
+    // Show more buttons load content asynchronously: wait for their change instead of fixed sleeps
+    afterExpand(pressed, function () {
+        afterExpand(expandRows(), extract);
+    });
+} catch (e) {
+    done({'error': e.toString()});
+}
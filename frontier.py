@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import threading
+from collections import deque
+
+PENDING = 'pending'
+IN_FLIGHT = 'in-flight'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Frontier:
+    """
+    Durable profile urls frontier for two-phase crawl.
+    Every state change is appended to JSONL log as full url record, last record wins on replay.
+    {"page": N, "last": bool} lines remember last fully harvested search results page.
+    Urls left in-flight by crashed run become pending again on open.
+    """
+
+    def __init__(self, filename: str, max_retries: int = 3):
+        self.filename = filename
+        self.max_retries = max_retries
+        self.records = {}
+        self.page = 0
+        self.harvested = False
+        self.lock = threading.Lock()
+        if os.path.exists(filename):
+            with open(filename, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if 'page' in record:
+                        self.page = record['page']
+                        self.harvested = record.get('last', False)
+                    else:
+                        self.records[record['url']] = record
+        for record in self.records.values():
+            if record['state'] == IN_FLIGHT:
+                record['state'] = PENDING
+        self.pending = deque(url for url, record in self.records.items() if record['state'] == PENDING)
+        self.file = open(filename, 'a', encoding='utf-8')
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.records
+
+    def write(self, record: dict):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def add(self, url: str, name: str, headline: str, refresh: bool = False) -> bool:
+        """refresh - return already done (or failed) url to pending, for re-crawl of stale profiles"""
+        with self.lock:
+            if url in self.records:
+                if not refresh or self.records[url]['state'] in [PENDING, IN_FLIGHT]:
+                    return False
+            record = {'url': url, 'name': name, 'headline': headline, 'state': PENDING, 'retries': 0}
+            self.records[url] = record
+            self.pending.append(url)
+            self.write(record)
+            return True
+
+    def set_page(self, page: int, last: bool = False):
+        with self.lock:
+            self.page = page
+            self.harvested = last
+            self.write({'page': page, 'last': last})
+
+    def take(self) -> dict or None:
+        """Next pending url record (marked in-flight) or None if nothing left"""
+        with self.lock:
+            while self.pending:
+                record = self.records[self.pending.popleft()]
+                if record['state'] == PENDING:
+                    record['state'] = IN_FLIGHT
+                    self.write(record)
+                    return dict(record)
+            return None
+
+    def done(self, url: str):
+        with self.lock:
+            self.records[url]['state'] = DONE
+            self.write(self.records[url])
+
+    def failed(self, url: str):
+        """Return url to pending until max_retries reached"""
+        with self.lock:
+            record = self.records[url]
+            record['retries'] += 1
+            if record['retries'] < self.max_retries:
+                record['state'] = PENDING
+                self.pending.append(url)
+            else:
+                record['state'] = FAILED
+            self.write(record)
+
+    def release(self, url: str):
+        """Return in-flight url to pending without counting a retry (its worker lease expired)"""
+        with self.lock:
+            record = self.records[url]
+            if record['state'] == IN_FLIGHT:
+                record['state'] = PENDING
+                self.pending.appendleft(url)
+                self.write(record)
+
+    def state(self, url: str) -> str or None:
+        with self.lock:
+            record = self.records.get(url)
+            return record['state'] if record is not None else None
+
+    def counts(self) -> dict:
+        with self.lock:
+            counts = {PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+            for record in self.records.values():
+                counts[record['state']] += 1
+            return counts
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+lxml twin of extract_profile.js: same selectors.json XPaths (compiled by SelectorRegistry, with fallback variants)
+evaluated on saved page_source.
+Returns the same raw structures, so profile_parser.build_employee() gives the same employee dict.
+"""
+import re
+
+from lxml import html as lxml_html
+
+from selector_registry import SelectorRegistry
+
+SPACES = re.compile(r'[ \t\r\f\v ]+')
+
+
+def node_text(node) -> str:
+    """Approximation of WebElement.text: trimmed lines without empty ones"""
+    if isinstance(node, str):
+        return node.strip()
+    lines = (SPACES.sub(' ', line).strip() for line in node.text_content().split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def first(context, registry: SelectorRegistry, key: str):
+    return registry.lxml_first(context, key)
+
+
+def text(context, registry: SelectorRegistry, key: str) -> str or None:
+    node = first(context, registry, key)
+    if node is None:
+        return None
+    return node_text(node)
+
+
+def position(context, registry: SelectorRegistry) -> dict:
+    return {
+        'description': text(context, registry, 'profile_position_description'),
+        'date_range': text(context, registry, 'profile_date_range'),
+        'location': text(context, registry, 'profile_position_location')
+    }
+
+
+def parse_row(row, registry: SelectorRegistry) -> dict:
+    parsed = {'one': None, 'many': None}
+
+    one_company = text(row, registry, 'profile_company_name_with_one_position')
+    if one_company is not None:
+        parsed['one'] = position(row, registry)
+        parsed['one']['company'] = one_company
+        parsed['one']['name'] = text(row, registry, 'profile_position_name_for_one_position')
+        parsed['one']['duration'] = text(row, registry, 'profile_date_duration')
+
+    many_company = text(row, registry, 'profile_company_name_with_many_positions')
+    if many_company is not None:
+        roles = []
+        for role in registry.lxml_all(row, 'profile_experience_role_for_many_positions'):
+            parsed_role = position(role, registry)
+            parsed_role['name'] = text(role, registry, 'profile_position_name_for_many_positions')
+            parsed_role['duration'] = text(role, registry, 'profile_date_duration')
+            roles.append(parsed_role)
+        parsed['many'] = {
+            'company': many_company,
+            'duration': text(row, registry, 'profile_company_summary_duration_with_many_positions'),
+            'roles': roles
+        }
+    return parsed
+
+
+def extract_raw_profile(page_source: str, registry: SelectorRegistry) -> dict:
+    document = lxml_html.fromstring(page_source)
+    return {
+        'name': text(document, registry, 'profile_name'),
+        'position': text(document, registry, 'profile_position'),
+        'about': text(document, registry, 'profile_about'),
+        'rows': [parse_row(row, registry) for row in registry.lxml_all(document, 'profile_experience_rows')]
+    }
+
+
+def extract_company_name(page_source: str, registry: SelectorRegistry) -> str:
+    return text(lxml_html.fromstring(page_source), registry, 'company_name') or ''
+
+
+def extract_search_cards(page_source: str, registry: SelectorRegistry, url: str) -> list:
+    document = lxml_html.fromstring(page_source)
+    document.make_links_absolute(url)
+    cards = []
+    for profile in registry.lxml_all(document, 'profiles_list'):
+        profile_link = first(profile, registry, 'profile_link')
+        if profile_link is None:
+            continue
+        actor_name = text(profile_link, registry, 'profile_link_actor_name') or ''
+        cards.append({
+            'url': profile_link.get('href', ''),
+            'name': actor_name,
+            'headline': text(profile, registry, 'profile_link_position_name') or '',
+            'limited': actor_name in ['LinkedIn Member', 'Участник LinkedIn']
+        })
+    return cards
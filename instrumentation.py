@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import threading
+from time import monotonic
+from contextlib import contextmanager
+
+FIND_COMMANDS = ['findElement', 'findElements', 'findChildElement', 'findChildElements']
+ELEMENTS_LIMIT = 100000
+
+
+class Metrics:
+    """
+    Counts and latencies of every WebDriver command by phase (login, search_page, profile_parse, ...) and selector name.
+    Selector name comes from the xpath of find commands, element commands (text, click, ...) inherit selector
+    of the find command which returned the element.
+    """
+
+    def __init__(self, selector_names: dict):
+        """selector_names: xpath -> selector name (SelectorRegistry.names())"""
+        self.selector_names = dict(selector_names)
+        self.scripts = {}
+        self.elements = {}
+        self.commands = {}
+        self.phases = {}
+        self.sources = {}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        # Browser threads of crawler-daemon.py and the reporter thread write the same files
+        self.write_lock = threading.Lock()
+        self.started = monotonic()
+
+    def register_xpath(self, xpath: str, name: str):
+        self.selector_names[xpath] = name
+
+    def register_script(self, script: str, name: str):
+        self.scripts[script] = name
+
+    def add_source(self, name: str, summary):
+        """Extra summary section, e.g. pacing"""
+        self.sources[name] = summary
+
+    def current_phase(self) -> str:
+        stack = getattr(self.local, 'phases', None)
+        return stack[-1] if stack else 'other'
+
+    def start_phase(self, name: str):
+        if not hasattr(self.local, 'phases'):
+            self.local.phases = []
+            self.local.started = []
+        self.local.phases.append(name)
+        self.local.started.append(monotonic())
+
+    def end_phase(self):
+        name = self.local.phases.pop()
+        seconds = monotonic() - self.local.started.pop()
+        with self.lock:
+            count, total = self.phases.get(name, (0, 0.0))
+            self.phases[name] = (count + 1, total + seconds)
+
+    @contextmanager
+    def phase(self, name: str):
+        self.start_phase(name)
+        try:
+            yield
+        finally:
+            self.end_phase()
+
+    @contextmanager
+    def suspended(self):
+        """Current phase stops inside: its time is exclusive and commands inside go to nested phases or 'other'"""
+        name = self.local.phases.pop()
+        started = self.local.started.pop()
+        paused = monotonic()
+        try:
+            yield
+        finally:
+            self.local.phases.append(name)
+            self.local.started.append(started + monotonic() - paused)
+
+    def selector_name(self, command: str, params: dict) -> str:
+        if command in FIND_COMMANDS:
+            return self.selector_names.get(params.get('value'), 'other')
+        if command in ['executeScript', 'executeAsyncScript']:
+            return self.scripts.get(params.get('script'), 'script')
+        if 'id' in params:
+            return self.elements.get(params['id'], 'other')
+        return '-'
+
+    def remember_elements(self, selector: str, value):
+        elements = value if isinstance(value, list) else [value]
+        with self.lock:
+            if len(self.elements) > ELEMENTS_LIMIT:
+                self.elements.clear()
+            for element in elements:
+                if hasattr(element, 'id'):
+                    self.elements[element.id] = selector
+
+    def record(self, command: str, selector: str, seconds: float):
+        key = (self.current_phase(), command, selector)
+        with self.lock:
+            count, total, longest = self.commands.get(key, (0, 0.0, 0.0))
+            self.commands[key] = (count + 1, total + seconds, max(longest, seconds))
+
+    def instrument(self, browser):
+        """Wrap browser.execute: WebElement methods go through it too"""
+        execute = browser.execute
+
+        def instrumented_execute(driver_command, params=None):
+            selector = self.selector_name(driver_command, params or {})
+            started = monotonic()
+            try:
+                response = execute(driver_command, params)
+            finally:
+                self.record(driver_command, selector, monotonic() - started)
+            if driver_command in FIND_COMMANDS and response:
+                self.remember_elements(selector, response.get('value'))
+            return response
+
+        browser.execute = instrumented_execute
+        return browser
+
+    def summary(self) -> dict:
+        with self.lock:
+            commands = {}
+            for (phase, command, selector), (count, total, longest) in sorted(self.commands.items()):
+                commands.setdefault(phase, {}).setdefault(command, {})[selector] = {
+                    'count': count, 'seconds': round(total, 4), 'max_seconds': round(longest, 4)
+                }
+            summary = {
+                'uptime_seconds': round(monotonic() - self.started, 1),
+                'webdriver_calls': sum(count for count, _, _ in self.commands.values()),
+                'phases': {name: {'count': count, 'seconds': round(total, 4)}
+                           for name, (count, total) in sorted(self.phases.items())},
+                'commands': commands
+            }
+        for name, source in self.sources.items():
+            summary[name] = source()
+        return summary
+
+    def prometheus(self) -> str:
+        families = {
+            'linkedin_parser_webdriver_commands_total': [],
+            'linkedin_parser_webdriver_command_seconds_total': [],
+            'linkedin_parser_phase_total': [],
+            'linkedin_parser_phase_seconds_total': []
+        }
+        with self.lock:
+            for (phase, command, selector), (count, total, _) in sorted(self.commands.items()):
+                labels = f'phase="{phase}",command="{command}",selector="{selector}"'
+                families['linkedin_parser_webdriver_commands_total'].append(f'{{{labels}}} {count}')
+                families['linkedin_parser_webdriver_command_seconds_total'].append(f'{{{labels}}} {total:.6f}')
+            for name, (count, total) in sorted(self.phases.items()):
+                families['linkedin_parser_phase_total'].append(f'{{phase="{name}"}} {count}')
+                families['linkedin_parser_phase_seconds_total'].append(f'{{phase="{name}"}} {total:.6f}')
+        lines = []
+        for family, samples in families.items():
+            lines.append(f'# TYPE {family} counter')
+            lines.extend(f'{family}{sample}' for sample in samples)
+        return '\n'.join(lines) + '\n'
+
+    def write(self, json_filename: str, prometheus_filename: str):
+        # Replace files atomically, so readers (node_exporter textfile collector) never see half-written file
+        with self.write_lock:
+            if json_filename:
+                with open(f'{json_filename}.tmp', 'w') as file:
+                    json.dump(self.summary(), file, indent=4)
+                os.replace(f'{json_filename}.tmp', json_filename)
+            if prometheus_filename:
+                with open(f'{prometheus_filename}.tmp', 'w') as file:
+                    file.write(self.prometheus())
+                os.replace(f'{prometheus_filename}.tmp', prometheus_filename)
+
+    def start_reporter(self, interval: float, json_filename: str, prometheus_filename: str):
+        def report():
+            while not stopped.wait(interval):
+                self.write(json_filename, prometheus_filename)
+
+        stopped = threading.Event()
+        threading.Thread(target=report, name='metrics-reporter', daemon=True).start()
+        return stopped
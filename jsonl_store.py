@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import hashlib
+from time import time
+
+STORE_FIELDS = ['url', 'fetched_at', 'content_hash']
+HEADER_MAX_LENGTH = 65536
+
+
+def content_hash(employee: dict) -> str:
+    """Hash of parsed profile content, store fields excluded"""
+    content = {key: value for key, value in employee.items() if key not in STORE_FIELDS}
+    return hashlib.sha1(json.dumps(content, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def legacy_document(filename: str) -> dict or None:
+    """Old {company, employees} json document (parser output before JSONL store), None if filename is JSONL store"""
+    with open(filename, encoding='utf-8') as file:
+        header = file.readline()
+        if not header.strip():
+            return None
+        try:
+            document = json.loads(header)
+        except ValueError:
+            # Indented document: header line is only "{"
+            file.seek(0)
+            try:
+                document = json.load(file)
+            except ValueError:
+                raise ValueError(f'{filename} is neither JSONL store nor {{company, employees}} json document')
+    if isinstance(document, dict) and 'employees' in document:
+        return document
+    return None
+
+
+def is_jsonl_store(filename: str) -> bool:
+    """
+    JSONL store by content whatever the extension (-out result.json of old invocations is JSONL too):
+    the first line is a short {"company": ...} header, old documents start with "{" or hold everything in one line
+    """
+    with open(filename, encoding='utf-8') as file:
+        header = file.readline(HEADER_MAX_LENGTH)
+    if not header.strip():
+        return True
+    if not header.endswith('\n'):
+        return False
+    try:
+        header = json.loads(header)
+    except ValueError:
+        return False
+    return isinstance(header, dict) and 'employees' not in header
+
+
+def convert_legacy_document(filename: str, document: dict):
+    """Rewrite old document as JSONL store in place, original is kept as <filename>.legacy"""
+    with open(f'{filename}.tmp', 'w', encoding='utf-8') as file:
+        file.write(json.dumps({'company': document.get('company', '')}, ensure_ascii=False) + '\n')
+        for employee in document['employees']:
+            file.write(json.dumps(employee, ensure_ascii=False) + '\n')
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(filename, f'{filename}.legacy')
+    os.replace(f'{filename}.tmp', filename)
+
+
+class JsonlStore:
+    """
+    Append-only employees storage.
+    First line is a header {"company": ...}, every next line is one employee.
+    Later lines with the same url replace earlier ones on read/export.
+    Every appended employee gets fetched_at (unix time) and content_hash.
+    Url -> {fetched_at, content_hash, position} of stored employees is kept in memory for O(1) checks.
+    Old {company, employees} json document is converted to JSONL on open (original kept as <filename>.legacy).
+    """
+
+    def __init__(self, filename: str, index: bool = True):
+        self.filename = filename
+        self.company = None
+        self.file = None
+        self.index = {}
+        if os.path.exists(filename):
+            document = legacy_document(filename)
+            if document is not None:
+                convert_legacy_document(filename, document)
+            with open(filename, encoding='utf-8') as file:
+                header = file.readline()
+            if header.strip():
+                self.company = json.loads(header).get('company', '')
+            if index:
+                for employee in self.read_employees():
+                    self.remember(employee)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def remember(self, employee: dict):
+        if 'url' in employee:
+            self.index[employee['url']] = {
+                'fetched_at': employee.get('fetched_at', 0),
+                'content_hash': employee.get('content_hash', ''),
+                'position': employee.get('position', '')
+            }
+
+    def stale_reason(self, url: str, headline: str = None, ttl_seconds: float = None) -> str or None:
+        """
+        Why employee should be parsed (again): 'new', 'expired' (fetched more than ttl_seconds ago)
+        or 'headline changed' (search card headline differs from stored position). None - stored one is fresh.
+        Without ttl_seconds only new urls are parsed.
+        """
+        meta = self.index.get(url)
+        if meta is None:
+            return 'new'
+        if ttl_seconds is None:
+            return None
+        if time() - meta['fetched_at'] > ttl_seconds:
+            return 'expired'
+        if headline and headline.strip() != meta['position'].strip():
+            return 'headline changed'
+        return None
+
+    def exists(self) -> bool:
+        return self.company is not None
+
+    def create(self, company: str):
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'company': company}, ensure_ascii=False) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        self.company = company
+        self.index = {}
+
+    def open(self):
+        if self.file is not None:
+            return
+        if not self.exists():
+            self.create('')
+        self.file = open(self.filename, 'a+b')
+        # Previous run could crash in the middle of a line: start a new line, so the broken one is skipped on read
+        self.file.seek(0, os.SEEK_END)
+        if self.file.tell() > 0:
+            self.file.seek(-1, os.SEEK_END)
+            if self.file.read(1) != b'\n':
+                self.file.write(b'\n')
+
+    def append(self, employee: dict, fetched_at: float = None) -> bool:
+        """
+        Returns False if content is the same as stored one (record is still appended to update fetched_at).
+        fetched_at - when the page was loaded if not now (parsed snapshots).
+        """
+        self.open()
+        employee['fetched_at'] = int(time() if fetched_at is None else fetched_at)
+        employee['content_hash'] = content_hash(employee)
+        previous = self.index.get(employee.get('url'))
+        self.file.write((json.dumps(employee, ensure_ascii=False) + '\n').encode('utf-8'))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.remember(employee)
+        return previous is None or previous['content_hash'] != employee['content_hash']
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def read_employees(self):
+        """Yield employees records in file order (duplicates by url included)"""
+        if not self.exists():
+            return
+        with open(self.filename, encoding='utf-8') as file:
+            file.readline()
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Torn line after crash
+                    continue
+
+    def latest_employees(self):
+        """Yield employees without outdated duplicates (last record by url wins) in two passes, without keeping records"""
+        last_lines = {}
+        for line_number, employee in enumerate(self.read_employees()):
+            last_lines[employee.get('url', line_number)] = line_number
+        latest = set(last_lines.values())
+        for line_number, employee in enumerate(self.read_employees()):
+            if line_number in latest:
+                yield employee
+
+    def employees(self) -> list:
+        """Employees with duplicates by url collapsed: last record wins, first position is kept"""
+        employees = {}
+        for employee in self.read_employees():
+            employees[employee.get('url', id(employee))] = employee
+        return list(employees.values())
+
+    def export_json(self, filename: str):
+        """Write old-style {company, employees} document"""
+        with open(filename, 'w', encoding='utf-8') as file:
+            json.dump({'company': self.company or '', 'employees': self.employees()}, file, indent=4, ensure_ascii=False)
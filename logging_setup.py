@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+
+def setup_logging(filename: str, level: str = 'INFO') -> QueueListener:
+    """
+    Log records go through a queue to the file handler thread, so parsing threads never wait for disk.
+    Records below level are dropped before message formatting (use lazy %-style arguments).
+    """
+    records = queue.Queue(-1)
+    file_handler = logging.FileHandler(filename, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(threadName)s %(message)s'))
+    listener = QueueListener(records, file_handler, respect_handler_level=True)
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level))
+    root.addHandler(QueueHandler(records))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
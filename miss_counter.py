@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import threading
+
+# raw profile fields of extract_profile.js / html_extract -> selector key
+PROFILE_FIELDS = {'name': 'profile_name', 'position': 'profile_position', 'about': 'profile_about'}
+POSITION_FIELDS = {
+    'description': 'profile_position_description',
+    'date_range': 'profile_date_range',
+    'location': 'profile_position_location',
+    'duration': 'profile_date_duration'
+}
+
+
+class MissCounter:
+    """
+    Hits and misses of every selector with a few sample urls of misses.
+    Url of the page being parsed is per thread (set_url), so workers don't mix their samples.
+    """
+
+    def __init__(self, samples: int = 5):
+        self.samples = samples
+        self.counts = {}
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.local = threading.local()
+
+    def set_url(self, url: str):
+        self.local.url = url
+
+    def hit(self, key: str):
+        with self.lock:
+            self.counts.setdefault(key, [0, 0, []])[0] += 1
+
+    def miss(self, key: str, url: str = None):
+        url = url or getattr(self.local, 'url', None)
+        with self.lock:
+            counts = self.counts.setdefault(key, [0, 0, []])
+            counts[1] += 1
+            if url and len(counts[2]) < self.samples and url not in counts[2]:
+                counts[2].append(url)
+
+    def count(self, key: str, found: bool, url: str = None):
+        if found:
+            self.hit(key)
+        else:
+            self.miss(key, url)
+
+    def count_raw_profile(self, raw_profile: dict, url: str = None):
+        """Script and lxml extraction return None for not found elements"""
+        for field, key in PROFILE_FIELDS.items():
+            self.count(key, raw_profile.get(field) is not None, url)
+        self.count('profile_experience_rows', bool(raw_profile.get('rows')), url)
+        for row in raw_profile.get('rows', []):
+            positions = []
+            if row['one'] is not None:
+                self.hit('profile_company_name_with_one_position')
+                self.count('profile_position_name_for_one_position', row['one']['name'] is not None, url)
+                positions.append(row['one'])
+            if row['many'] is not None:
+                self.hit('profile_company_name_with_many_positions')
+                self.count('profile_company_summary_duration_with_many_positions', row['many']['duration'] is not None, url)
+                self.count('profile_experience_role_for_many_positions', bool(row['many']['roles']), url)
+                for role in row['many']['roles']:
+                    self.count('profile_position_name_for_many_positions', role['name'] is not None, url)
+                positions += row['many']['roles']
+            if row['one'] is None and row['many'] is None:
+                self.miss('profile_company_name_with_one_position', url)
+                self.miss('profile_company_name_with_many_positions', url)
+            for position in positions:
+                for field, key in POSITION_FIELDS.items():
+                    self.count(key, position.get(field) is not None, url)
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {key: {'hits': hits, 'misses': misses, 'miss_rate': round(misses / (hits + misses), 3),
+                          'sample_urls': list(urls)}
+                    for key, (hits, misses, urls) in sorted(self.counts.items())}
+
+    def write(self, filename: str):
+        """One writer at a time: threads sharing the counter would race on the same .tmp file"""
+        with self.write_lock:
+            with open(f'{filename}.tmp', 'w', encoding='utf-8') as file:
+                json.dump(self.summary(), file, indent=4, ensure_ascii=False)
+            os.replace(f'{filename}.tmp', filename)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import random
+import logging
+import threading
+from time import sleep, monotonic
+
+
+class Pacer:
+    """
+    Adaptive pacing shared by all browsers of the process.
+    Token bucket limits profiles per hour, every pause gets random jitter.
+    Throttling signals (auth wall, empty search results, page load spikes) multiply pauses and slow the bucket down
+    by backoff_factor up to max_backoff, every normal page brings backoff back by recovery_factor.
+    reserve() and pause_seconds() only return seconds to wait, for asyncio callers.
+    """
+
+    def __init__(self, config: dict):
+        self.rate = config['profiles_per_hour'] / 3600
+        self.burst = config['burst']
+        self.jitter_seconds = config['jitter_seconds']
+        self.keystroke_seconds = config['keystroke_seconds']
+        self.backoff_factor = config['backoff_factor']
+        self.max_backoff = config['max_backoff']
+        self.recovery_factor = config['recovery_factor']
+        self.page_load_spike_factor = config['page_load_spike_factor']
+        self.tokens = self.burst
+        self.updated = monotonic()
+        self.backoff = 1.0
+        self.page_load_average = None
+        self.lock = threading.Lock()
+        self.metrics = {
+            'pauses': 0,
+            'paused_seconds': 0.0,
+            'token_wait_seconds': 0.0,
+            'throttle_signals': 0,
+            'max_backoff': 1.0,
+            'reasons': {},
+            'signals': {}
+        }
+
+    def refill(self):
+        now = monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate / self.backoff)
+        self.updated = now
+
+    def jitter(self) -> float:
+        return random.uniform(*self.jitter_seconds) * self.backoff
+
+    def record(self, reason: str, token_wait: float, jitter: float) -> float:
+        seconds = token_wait + jitter
+        with self.lock:
+            self.metrics['pauses'] += 1
+            self.metrics['paused_seconds'] += seconds
+            self.metrics['token_wait_seconds'] += token_wait
+            self.metrics['reasons'][reason] = self.metrics['reasons'].get(reason, 0) + 1
+            backoff = self.backoff
+        logging.info(f'Pacing {reason}: sleep {seconds:.1f}s (token wait {token_wait:.1f}s, jitter {jitter:.1f}s, backoff x{backoff:.2f})')
+        return seconds
+
+    def reserve(self, reason: str = 'profile') -> float:
+        """Take profile token (reserved immediately, so parallel workers queue up), seconds to wait for it plus jitter"""
+        with self.lock:
+            self.refill()
+            self.tokens -= 1
+            token_wait = max(0.0, -self.tokens) * self.backoff / self.rate
+        return self.record(reason, token_wait, self.jitter())
+
+    def pause_seconds(self, reason: str) -> float:
+        return self.record(reason, 0.0, self.jitter())
+
+    def acquire(self, reason: str = 'profile'):
+        sleep(self.reserve(reason))
+
+    def pause(self, reason: str):
+        sleep(self.pause_seconds(reason))
+
+    def keystroke(self):
+        sleep(random.uniform(*self.keystroke_seconds))
+
+    def throttled(self, signal: str):
+        with self.lock:
+            self.backoff = min(self.max_backoff, self.backoff * self.backoff_factor)
+            self.metrics['throttle_signals'] += 1
+            self.metrics['signals'][signal] = self.metrics['signals'].get(signal, 0) + 1
+            self.metrics['max_backoff'] = max(self.metrics['max_backoff'], self.backoff)
+            backoff = self.backoff
+        logging.info(f'Pacing throttling signal "{signal}": backoff x{backoff:.2f}')
+
+    def ok(self):
+        with self.lock:
+            self.backoff = max(1.0, self.backoff * self.recovery_factor)
+
+    def page_loaded(self, seconds: float):
+        with self.lock:
+            average = self.page_load_average
+            self.page_load_average = seconds if average is None else average * 0.8 + seconds * 0.2
+        if average is not None and seconds > average * self.page_load_spike_factor:
+            self.throttled('page load spike')
+        else:
+            self.ok()
+
+    def summary(self) -> dict:
+        with self.lock:
+            return dict(self.metrics, backoff=self.backoff, tokens=self.tokens)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from jsonl_store import content_hash
+from results_io import open_store
+from snapshot_store import SnapshotStore
+from profile_parser import build_employee
+from selector_registry import SelectorRegistry
+from html_extract import extract_raw_profile, extract_company_name, extract_search_cards
+
+arguments_parser = argparse.ArgumentParser(description='Parse saved page_source snapshots (-snapshots of the parser) '
+                                                       'without browser')
+arguments_parser.add_argument('-snapshots', type=str, default='snapshots', help='Snapshots directory')
+arguments_parser.add_argument('-selectors', type=str, default='selectors.json', help='Config filename')
+arguments_parser.add_argument('-out', type=str, default='result.jsonl', help='Output JSONL (or .db SQLite) filename')
+arguments_parser.add_argument('-cards', type=str, default='', help='Also write search results cards to this JSONL file')
+arguments_parser.add_argument('-workers', type=int, default=None, help='Parsing processes (default: CPU count)')
+
+registry = None
+snapshots = None
+
+
+def init_worker(selectors: dict, snapshots_directory: str):
+    """Compiled XPaths can't be pickled, every process compiles its own registry"""
+    global registry, snapshots
+    registry = SelectorRegistry(selectors)
+    snapshots = SnapshotStore(snapshots_directory)
+
+
+def parse_profile_snapshot(entry: dict) -> dict:
+    employee = build_employee(extract_raw_profile(snapshots.load(entry), registry))
+    employee['url'] = entry['url']
+    return employee
+
+
+def parse_search_snapshot(entry: dict) -> list:
+    return extract_search_cards(snapshots.load(entry), registry, entry['url'])
+
+
+if __name__ == '__main__':
+    args = arguments_parser.parse_args()
+
+    with open(args.selectors) as selectors_json:
+        selectors = json.load(selectors_json)
+    registry = SelectorRegistry(selectors)
+    snapshots = SnapshotStore(args.snapshots)
+
+    store = open_store(args.out)
+    if not store.exists():
+        companies = snapshots.list('company')
+        store.create(extract_company_name(snapshots.load(companies[-1]), registry) if companies else '')
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(selectors, args.snapshots)) as executor:
+        profiles = snapshots.list('profile')
+        appended = 0
+        for entry, employee in zip(profiles, executor.map(parse_profile_snapshot, profiles, chunksize=16)):
+            # Parsing the same snapshots again (e.g. after selectors.json fixes) appends only changed profiles
+            stored = store.index.get(employee['url'])
+            if stored is not None and stored['content_hash'] == content_hash(employee):
+                continue
+            store.append(employee, fetched_at=snapshots.saved_at(entry))
+            appended += 1
+        store.close()
+        print(f'{len(profiles)} profiles parsed, {appended} new or changed appended to {args.out}')
+
+        if args.cards:
+            with open(args.cards, 'w', encoding='utf-8') as cards_file:
+                for cards in executor.map(parse_search_snapshot, snapshots.list('search'), chunksize=16):
+                    for card in cards:
+                        cards_file.write(json.dumps(card, ensure_ascii=False) + '\n')
@@ -1,58 +1,88 @@
 # -*- coding: utf-8 -*-
 import json
 import argparse
+from multiprocessing import Manager
+from concurrent.futures import ProcessPoolExecutor
+
+from transitions import iter_transitions
 
 arguments_parser = argparse.ArgumentParser(description='Parse results from LinkedIn company -> employees parser with '
                                                        'many job positions only for parsed company')
-arguments_parser.add_argument('-i', type=str, default='result.json', help='Input json file')
-arguments_parser.add_argument('-o', type=str, default='positions_switch_durations.json', help='Output json file')
-args = arguments_parser.parse_args()
-
-
-def read_json():
-    with open(args.i) as json_file:
-        return json.load(json_file)
-
-
-def duration_to_months(date: str) -> int or str:
-    date = date.split(' ')
-    if len(date) == 4:
-        years = int(date[0])
-        months = int(date[2])
-        return years * 12 + months
-    elif len(date) == 2:
-        if date[1] in ['yr', 'yrs']:
-            return int(date[0]) * 12
-        if date[1] in ['mo', 'mos']:
-            return int(date[0])
+arguments_parser.add_argument('-i', type=str, nargs='+', default=['result.jsonl'],
+                              help='Input jsonl, .db or json files (one per company)')
+arguments_parser.add_argument('-o', type=str, default='positions_switch_durations.json',
+                              help='Output json file (jsonl if ends with .jsonl)')
+arguments_parser.add_argument('-workers', type=int, default=1, help='Processes for many input files')
+
+CHUNK_SIZE = 1000
+
+
+def put_file_transitions(filename: str, chunks):
+    """Worker: send switches of one file in chunks of CHUNK_SIZE, None when the file is done (or failed)"""
+    chunk = []
+    try:
+        for item in iter_transitions(filename):
+            chunk.append(item)
+            if len(chunk) == CHUNK_SIZE:
+                chunks.put(chunk)
+                chunk = []
+        if chunk:
+            chunks.put(chunk)
+    finally:
+        chunks.put(None)
+
+
+def iter_parallel_transitions(filenames: list, workers: int):
+    """
+    Switches of many files parsed by a process pool, in chunks as they are ready: pool results are whole lists,
+    so workers stream through a bounded queue and memory doesn't grow with the biggest file
+    """
+    with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = manager.Queue(maxsize=workers * 2)
+        futures = [executor.submit(put_file_transitions, filename, chunks) for filename in filenames]
+        running = len(futures)
+        while running:
+            chunk = chunks.get()
+            if chunk is None:
+                running -= 1
+            else:
+                yield from chunk
+        for future in futures:
+            # Worker exceptions
+            future.result()
+
+
+class ItemsWriter:
+    """Writes items as they come: JSONL lines or json array"""
+
+    def __init__(self, filename: str):
+        self.jsonl = filename.endswith('.jsonl')
+        self.file = open(filename, 'w', encoding='utf-8')
+        self.count = 0
+        if not self.jsonl:
+            self.file.write('[')
+
+    def write(self, item: dict):
+        if self.jsonl:
+            self.file.write(json.dumps(item, ensure_ascii=False) + '\n')
+        else:
+            self.file.write((',\n' if self.count else '\n') + json.dumps(item, indent=4, ensure_ascii=False))
+        self.count += 1
+
+    def close(self):
+        if not self.jsonl:
+            self.file.write('\n]' if self.count else ']')
+        self.file.close()
+
+
+if __name__ == '__main__':
+    args = arguments_parser.parse_args()
+    writer = ItemsWriter(args.o)
+    if args.workers > 1 and len(args.i) > 1:
+        for item in iter_parallel_transitions(args.i, args.workers):
+            writer.write(item)
     else:
-        return 'No duration'
-
-
-data = read_json()
-
-employees = [{'experience': employee['experience'], 'url': employee['url']} for employee in data['employees'] if employee['experience']]
-
-data_to_write = []
-
-for employee in employees:
-    for company in employee['experience']:
-        if company['company'] == data['company'] and len(company['positions']) > 1:
-            for index, position in enumerate(company['positions']):
-                if index == 0:
-                    continue
-                item = {
-                    'from': {
-                        'name': position['name'],
-                        'duration': duration_to_months(position['dates']['duration'])
-                    },
-                    'to': {
-                        'name': company['positions'][index-1]['name'],
-                        'duration': duration_to_months(company['positions'][index-1]['dates']['duration'])
-                    },
-                    'url': employee['url']
-                }
-                data_to_write.append(item)
-
-with open(args.o, 'w') as file:
-    json.dump(data_to_write, file, indent=4, ensure_ascii=False)
+        for filename in args.i:
+            for item in iter_transitions(filename):
+                writer.write(item)
+    writer.close()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Builds employee dict from raw profile texts.
+Raw profile is what extract_profile.js returns: texts of selectors.json elements (None if element not found).
+"""
+
+
+def clean_company_name(name: str) -> str:
+    if name[-10:] == ' Full-time':
+        return name[:-10]
+    return name
+
+
+def clean_description(description_text: str) -> str:
+    if description_text[-10:] in ['.\nСвернуть', '.\nsee less']:
+        return description_text[:-10]
+    return description_text
+
+
+def split_date_range(date_range: str or None) -> {str, str}:
+    date_range_array = (date_range or '').split('–')
+    if len(date_range_array) == 2:
+        return {'from': date_range_array[0].strip(), 'to': date_range_array[1].strip()}
+    return {'from': '', 'to': ''}
+
+
+def build_position(raw_position: dict, duration: str) -> dict:
+    position = {
+        'name': raw_position['name'] or '',
+        'location': raw_position['location'] or '',
+        'description': clean_description(raw_position['description'] or ''),
+        'dates': split_date_range(raw_position['date_range'])
+    }
+    position['dates']['duration'] = duration
+    return position
+
+
+def build_experience(raw_row: dict) -> dict:
+    experience = {'positions': []}
+
+    # ONE POSITION
+    if raw_row['one'] is not None:
+        experience['company'] = clean_company_name(raw_row['one']['company'])
+        experience['duration_summary'] = raw_row['one']['duration'] or ''
+        experience['positions'].append(build_position(raw_row['one'], experience['duration_summary']))
+    else:
+        experience['company'] = ''
+
+    # MANY POSITIONS
+    if raw_row['many'] is not None:
+        experience['company'] = clean_company_name(raw_row['many']['company'])
+        experience['duration_summary'] = raw_row['many']['duration'] or ''
+        for raw_role in raw_row['many']['roles']:
+            experience['positions'].append(build_position(raw_role, raw_role['duration'] or ''))
+
+    return experience
+
+
+def build_employee(raw_profile: dict) -> dict:
+    return {
+        'experience': [build_experience(raw_row) for raw_row in raw_profile['rows']],
+        'name': raw_profile['name'] or '',
+        'position': raw_profile['position'] or '',
+        'about': raw_profile['about'] or ''
+    }
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming read of parser results: JSONL store, SQLite store or old {company, employees} json document.
+SQLite is told by extension, JSONL store from old document by content (parser -out result.json writes JSONL).
+"""
+import os
+import json
+
+from jsonl_store import JsonlStore, is_jsonl_store
+from sqlite_store import SqliteStore, is_sqlite, BATCH_SIZE
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def open_store(filename: str, batch_size: int = BATCH_SIZE, create: bool = True):
+    """
+    Parser output store by file extension: SqliteStore for .db/.sqlite, JsonlStore otherwise.
+    create=False - reading existing results, a wrong path raises FileNotFoundError instead of a new empty store.
+    """
+    if not create and not os.path.exists(filename):
+        raise FileNotFoundError(f'{filename} not found')
+    if is_sqlite(filename):
+        return SqliteStore(filename, batch_size)
+    return JsonlStore(filename)
+
+
+def read_company(filename: str) -> str:
+    if is_sqlite(filename):
+        store = open_store(filename, create=False)
+        try:
+            return store.company or ''
+        finally:
+            store.close()
+    if is_jsonl_store(filename):
+        return JsonlStore(filename, index=False).company or ''
+    if ijson is None:
+        with open(filename) as json_file:
+            return json.load(json_file)['company']
+    with open(filename, 'rb') as json_file:
+        for company in ijson.items(json_file, 'company'):
+            return company
+    return ''
+
+
+def iter_employees(filename: str):
+    """Yield employees one by one. Without ijson installed old json documents are loaded whole."""
+    if is_sqlite(filename):
+        store = open_store(filename, create=False)
+        try:
+            yield from store.latest_employees()
+        finally:
+            store.close()
+    elif is_jsonl_store(filename):
+        yield from JsonlStore(filename, index=False).latest_employees()
+    elif ijson is None:
+        with open(filename) as json_file:
+            yield from json.load(json_file)['employees']
+    else:
+        with open(filename, 'rb') as json_file:
+            yield from ijson.items(json_file, 'employees.item')
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from lxml import etree
+from selenium.common.exceptions import NoSuchElementException
+
+
+class SelectorRegistry:
+    """
+    XPath selectors of selectors.json: value is one XPath or ordered list of fallback XPaths.
+    All XPaths are compiled (validated) on load. Variant which matched last time is tried first next time,
+    so dead variants cost round trips only until a working one is found.
+    Other selectors.json values (pacing, timeouts, ...) are not selectors and are skipped.
+    """
+
+    def __init__(self, config: dict):
+        self.variants = {}
+        self.compiled = {}
+        self.preferred = {}
+        # MissCounter of WebDriver finds, optional
+        self.counter = None
+        errors = []
+        for key, value in config.items():
+            if isinstance(value, str):
+                value = [value]
+            elif not (isinstance(value, list) and value and all(isinstance(xpath, str) for xpath in value)):
+                continue
+            compiled = []
+            for xpath in value:
+                try:
+                    compiled.append(etree.XPath(xpath))
+                except etree.XPathSyntaxError as e:
+                    errors.append(f'{key}: {xpath} ({e})')
+            self.variants[key] = value
+            self.compiled[key] = compiled
+            self.preferred[key] = 0
+        if errors:
+            raise ValueError('Invalid XPath selectors:\n' + '\n'.join(errors))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.variants
+
+    def order(self, key: str) -> list:
+        """Variant indexes, last matched first"""
+        preferred = self.preferred[key]
+        return [preferred] + [index for index in range(len(self.variants[key])) if index != preferred]
+
+    def matched(self, key: str, index: int):
+        if self.preferred[key] != index:
+            logging.info('Selector %s switched to variant %s: %s', key, index, self.variants[key][index])
+            self.preferred[key] = index
+
+    def count(self, key: str, found: bool):
+        if self.counter is not None:
+            self.counter.count(key, found)
+
+    def xpaths(self, key: str) -> list:
+        return [self.variants[key][index] for index in self.order(key)]
+
+    def union(self, key: str) -> str:
+        """All variants as one XPath (for waits)"""
+        return ' | '.join(self.variants[key])
+
+    def names(self) -> dict:
+        """XPath -> selector name of all variants"""
+        return {xpath: key for key, variants in self.variants.items() for xpath in variants}
+
+    def ordered_config(self, config: dict) -> dict:
+        """Config for in-browser script: selectors as lists of variants, last matched first"""
+        return dict(config, **{key: self.xpaths(key) for key in self.variants})
+
+    def find(self, context, key: str):
+        """WebElement by first matching variant, NoSuchElementException if none matches"""
+        for index in self.order(key):
+            try:
+                element = context.find_element_by_xpath(self.variants[key][index])
+            except NoSuchElementException:
+                continue
+            self.matched(key, index)
+            self.count(key, True)
+            return element
+        self.count(key, False)
+        raise NoSuchElementException(f'{key} not found by {len(self.variants[key])} variant(s)')
+
+    def find_all(self, context, key: str) -> list:
+        """WebElements of first variant with results, [] if none matches"""
+        for index in self.order(key):
+            elements = context.find_elements_by_xpath(self.variants[key][index])
+            if elements:
+                self.matched(key, index)
+                self.count(key, True)
+                return elements
+        self.count(key, False)
+        return []
+
+    def lxml_all(self, node, key: str) -> list:
+        """Same as find_all for lxml node with compiled variants"""
+        for index in self.order(key):
+            nodes = self.compiled[key][index](node)
+            if nodes:
+                self.matched(key, index)
+                return nodes
+        return []
+
+    def lxml_first(self, node, key: str):
+        nodes = self.lxml_all(node, key)
+        return nodes[0] if nodes else None
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import logging
+import threading
+from time import time
+from urllib.parse import urlparse
+
+LOCAL_STORAGE_SCRIPT = 'return Object.assign({}, window.localStorage);'
+RESTORE_LOCAL_STORAGE_SCRIPT = 'for (var key in arguments[0]) { window.localStorage.setItem(key, arguments[0][key]); }'
+# Cheap page on the site origin: cookies and localStorage can be set only for the current origin
+ORIGIN_PAGE = '/robots.txt'
+
+
+class SessionStore:
+    """
+    Authenticated session file: cookies and localStorage of the site origin.
+    Contains the same secrets as logged in browser, keep it private as credentials.json.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.lock = threading.Lock()
+
+    def load(self) -> dict or None:
+        """Session with expired cookies dropped, None if there is nothing to restore"""
+        if not os.path.exists(self.filename):
+            return None
+        try:
+            with open(self.filename, encoding='utf-8') as file:
+                session = json.load(file)
+        except ValueError as e:
+            logging.debug('Broken session file %s %s', self.filename, e)
+            return None
+        now = time()
+        session['cookies'] = [cookie for cookie in session['cookies'] if cookie.get('expiry', now + 1) > now]
+        return session if session['cookies'] else None
+
+    def save(self, browser):
+        parsed = urlparse(browser.current_url)
+        session = {
+            'origin': f'{parsed.scheme}://{parsed.netloc}',
+            'saved_at': int(time()),
+            'cookies': browser.get_cookies(),
+            'local_storage': browser.execute_script(LOCAL_STORAGE_SCRIPT)
+        }
+        with self.lock:
+            if os.path.exists(f'{self.filename}.tmp'):
+                os.remove(f'{self.filename}.tmp')
+            # Owner only from the start: the file is never readable by others, even before chmod could run
+            descriptor = os.open(f'{self.filename}.tmp', os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with open(descriptor, 'w', encoding='utf-8') as file:
+                json.dump(session, file, indent=4)
+            os.replace(f'{self.filename}.tmp', self.filename)
+
+    def restore(self, browser) -> bool:
+        """Inject saved session into browser (one request to the origin), False if there is no usable session"""
+        session = self.load()
+        if session is None:
+            return False
+        browser.get(session['origin'] + ORIGIN_PAGE)
+        for cookie in session['cookies']:
+            try:
+                browser.add_cookie(cookie)
+            except Exception as e:
+                logging.debug("Can't restore cookie %s %s", cookie.get('name'), e)
+        browser.execute_script(RESTORE_LOCAL_STORAGE_SCRIPT, session.get('local_storage') or {})
+        return True
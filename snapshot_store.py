@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime, timezone
+
+
+class SnapshotStore:
+    """
+    Compressed page_source snapshots: <directory>/<kind>/<sha1(url)>.html.gz
+    <directory>/index.jsonl has one {kind, url, file, saved_at} line per saved snapshot.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index_filename = os.path.join(directory, 'index.jsonl')
+        self.entries = {}
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.index_filename):
+            with open(self.index_filename, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[(entry['kind'], entry['url'])] = entry
+
+    def __contains__(self, url: str) -> bool:
+        return ('profile', url) in self.entries
+
+    def save(self, kind: str, url: str, page_source: str):
+        os.makedirs(os.path.join(self.directory, kind), exist_ok=True)
+        filename = os.path.join(kind, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.html.gz")
+        with gzip.open(os.path.join(self.directory, filename), 'wt', encoding='utf-8') as file:
+            file.write(page_source)
+        entry = {'kind': kind, 'url': url, 'file': filename, 'saved_at': datetime.utcnow().isoformat()}
+        with self.lock:
+            with open(self.index_filename, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.entries[(kind, url)] = entry
+
+    def list(self, kind: str) -> list:
+        return [entry for (entry_kind, url), entry in self.entries.items() if entry_kind == kind]
+
+    @staticmethod
+    def saved_at(entry: dict) -> float:
+        """Unix time of the snapshot (saved_at is UTC without offset)"""
+        return datetime.fromisoformat(entry['saved_at']).replace(tzinfo=timezone.utc).timestamp()
+
+    def load(self, entry: dict) -> str:
+        with gzip.open(os.path.join(self.directory, entry['file']), 'rt', encoding='utf-8') as file:
+            return file.read()
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+import json
+import sqlite3
+import threading
+from time import time
+
+from durations import parse_duration
+from jsonl_store import content_hash
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+BATCH_SIZE = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    company TEXT NOT NULL,
+    name TEXT,
+    position TEXT,
+    about TEXT,
+    fetched_at INTEGER,
+    content_hash TEXT,
+    UNIQUE (company, url)
+);
+CREATE TABLE IF NOT EXISTS experiences (
+    id INTEGER PRIMARY KEY,
+    employee_id INTEGER NOT NULL REFERENCES employees (id) ON DELETE CASCADE,
+    experience_index INTEGER NOT NULL,
+    company TEXT,
+    duration_summary TEXT,
+    duration_months INTEGER
+);
+CREATE TABLE IF NOT EXISTS positions (
+    id INTEGER PRIMARY KEY,
+    experience_id INTEGER NOT NULL REFERENCES experiences (id) ON DELETE CASCADE,
+    employee_id INTEGER NOT NULL,
+    position_index INTEGER NOT NULL,
+    name TEXT,
+    location TEXT,
+    description TEXT,
+    date_from TEXT,
+    date_to TEXT,
+    duration TEXT,
+    duration_months INTEGER
+);
+CREATE INDEX IF NOT EXISTS employees_company ON employees (company);
+CREATE INDEX IF NOT EXISTS experiences_employee ON experiences (employee_id, company);
+CREATE INDEX IF NOT EXISTS experiences_company ON experiences (company);
+CREATE UNIQUE INDEX IF NOT EXISTS positions_experience ON positions (experience_id, position_index);
+CREATE INDEX IF NOT EXISTS positions_name ON positions (name);
+"""
+
+
+def is_sqlite(filename: str) -> bool:
+    return filename.endswith(SQLITE_EXTENSIONS)
+
+
+class SqliteStore:
+    """
+    Employees storage in normalized employees, experiences and positions tables, interface of JsonlStore.
+    Appended employees are written every batch_size employees (and on close) in one transaction,
+    re-parsed employee replaces its previous rows of the same company. Employees are keyed by (company, url),
+    url -> {fetched_at, content_hash, position} of the crawled company employees is kept in memory.
+    Company is the crawled one, other companies can be imported to the same file (import_employees()).
+    """
+
+    def __init__(self, filename: str, batch_size: int = BATCH_SIZE):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.pending = []
+        self.lock = threading.RLock()
+        # Workers append from the writer thread
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA foreign_keys=ON')
+        self.connection.executescript(SCHEMA)
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'company'").fetchone()
+        self.company = row['value'] if row is not None else None
+        self.load_index()
+
+    def load_index(self):
+        self.index = {}
+        for row in self.connection.execute('SELECT url, fetched_at, content_hash, position FROM employees '
+                                           'WHERE company = ?', (self.company,)):
+            self.index[row['url']] = {'fetched_at': row['fetched_at'], 'content_hash': row['content_hash'],
+                                      'position': row['position']}
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def remember(self, employee: dict):
+        self.index[employee['url']] = {
+            'fetched_at': employee.get('fetched_at', 0),
+            'content_hash': employee.get('content_hash', ''),
+            'position': employee.get('position', '')
+        }
+
+    def stale_reason(self, url: str, headline: str = None, ttl_seconds: float = None) -> str or None:
+        """Same as JsonlStore.stale_reason: 'new', 'expired', 'headline changed' or None if stored one is fresh"""
+        meta = self.index.get(url)
+        if meta is None:
+            return 'new'
+        if ttl_seconds is None:
+            return None
+        if time() - meta['fetched_at'] > ttl_seconds:
+            return 'expired'
+        if headline and headline.strip() != (meta['position'] or '').strip():
+            return 'headline changed'
+        return None
+
+    def exists(self) -> bool:
+        return self.company is not None
+
+    def create(self, company: str):
+        """Set crawled company, unlike JsonlStore.create() employees of other companies are kept"""
+        with self.lock:
+            self.flush()
+            with self.connection:
+                self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('company', ?)", (company,))
+            self.company = company
+            self.load_index()
+
+    def append(self, employee: dict, fetched_at: float = None) -> bool:
+        """Returns False if content is the same as stored one (fetched_at is still updated), same as JsonlStore.append"""
+        with self.lock:
+            if not self.exists():
+                self.create('')
+            employee['fetched_at'] = int(time() if fetched_at is None else fetched_at)
+            employee['content_hash'] = content_hash(employee)
+            previous = self.index.get(employee['url'])
+            self.pending.append(employee)
+            self.remember(employee)
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+        return previous is None or previous['content_hash'] != employee['content_hash']
+
+    def flush(self):
+        """Write pending employees in one transaction"""
+        with self.lock, self.connection:
+            for employee in self.pending:
+                self.insert(self.company, employee)
+            self.pending = []
+
+    def insert(self, company: str, employee: dict):
+        cursor = self.connection.cursor()
+        cursor.execute('DELETE FROM employees WHERE company = ? AND url = ?', (company, employee['url']))
+        cursor.execute('INSERT INTO employees (url, company, name, position, about, fetched_at, content_hash) '
+                       'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                       (employee['url'], company, employee.get('name', ''), employee.get('position', ''),
+                        employee.get('about', ''), employee.get('fetched_at'), employee.get('content_hash')))
+        employee_id = cursor.lastrowid
+        for experience_index, experience in enumerate(employee.get('experience', [])):
+            cursor.execute('INSERT INTO experiences (employee_id, experience_index, company, duration_summary, '
+                           'duration_months) VALUES (?, ?, ?, ?, ?)',
+                           (employee_id, experience_index, experience.get('company', ''),
+                            experience.get('duration_summary', ''),
+                            parse_duration(experience.get('duration_summary', ''))))
+            experience_id = cursor.lastrowid
+            cursor.executemany('INSERT INTO positions (experience_id, employee_id, position_index, name, location, '
+                               'description, date_from, date_to, duration, duration_months) '
+                               'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                               [(experience_id, employee_id, position_index, position.get('name', ''),
+                                 position.get('location', ''), position.get('description', ''),
+                                 position.get('dates', {}).get('from', ''), position.get('dates', {}).get('to', ''),
+                                 position.get('dates', {}).get('duration', ''),
+                                 parse_duration(position.get('dates', {}).get('duration', '')))
+                                for position_index, position in enumerate(experience.get('positions', []))])
+
+    def import_employees(self, company: str, employees) -> int:
+        """Copy employees of another result file as they are (fetched_at kept), one transaction"""
+        count = 0
+        with self.lock:
+            self.flush()
+            with self.connection:
+                for employee in employees:
+                    if 'url' not in employee:
+                        continue
+                    employee.setdefault('content_hash', content_hash(employee))
+                    self.insert(company, employee)
+                    if company == self.company:
+                        self.remember(employee)
+                    count += 1
+        return count
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.connection.close()
+
+    def read_employees(self, company: str = None):
+        """Yield employees in {name, position, about, experience: [{company, positions}]} form of parser output"""
+        with self.lock:
+            self.flush()
+            employees = self.connection.execute(
+                'SELECT * FROM employees WHERE ? IS NULL OR company = ? ORDER BY id', (company, company)).fetchall()
+        for row in employees:
+            with self.lock:
+                employee = self.employee(row)
+            yield employee
+
+    def employee(self, row: sqlite3.Row) -> dict:
+        experiences = self.connection.execute(
+            'SELECT * FROM experiences WHERE employee_id = ? ORDER BY experience_index', (row['id'],)).fetchall()
+        positions = {}
+        for position in self.connection.execute(
+                'SELECT * FROM positions WHERE employee_id = ? ORDER BY experience_id, position_index', (row['id'],)):
+            positions.setdefault(position['experience_id'], []).append({
+                'name': position['name'], 'location': position['location'], 'description': position['description'],
+                'dates': {'from': position['date_from'], 'to': position['date_to'], 'duration': position['duration']}
+            })
+        return {
+            'name': row['name'], 'position': row['position'], 'about': row['about'],
+            'experience': [{'positions': positions.get(experience['id'], []), 'company': experience['company'],
+                            'duration_summary': experience['duration_summary']} for experience in experiences],
+            'url': row['url'], 'fetched_at': row['fetched_at'], 'content_hash': row['content_hash']
+        }
+
+    def latest_employees(self):
+        # Re-parsed employee replaces its rows, there are no outdated duplicates
+        return self.read_employees(self.company)
+
+    def employees(self) -> list:
+        return list(self.latest_employees())
+
+    def export_json(self, filename: str):
+        """Write old-style {company, employees} document"""
+        with open(filename, 'w', encoding='utf-8') as file:
+            json.dump({'company': self.company or '', 'employees': self.employees()}, file, indent=4, ensure_ascii=False)
+
+    def query(self, sql: str, parameters: tuple = ()) -> list:
+        with self.lock:
+            self.flush()
+            return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def companies(self) -> list:
+        """Crawled companies with employees counts"""
+        return self.query('SELECT company, COUNT(*) AS employees FROM employees GROUP BY company ORDER BY company')
+
+    def position_holders(self, position: str, company: str = None) -> list:
+        """Employees who held position (exact name) at experience company (any if None), newest positions first"""
+        return self.query(
+            'SELECT e.url, e.name AS employee, e.company AS crawled_company, x.company, p.name AS position, '
+            'p.date_from, p.date_to, p.duration_months '
+            'FROM positions p '
+            'JOIN experiences x ON x.id = p.experience_id '
+            'JOIN employees e ON e.id = p.employee_id '
+            'WHERE p.name = ? AND (? IS NULL OR x.company = ?) '
+            'ORDER BY e.id, x.experience_index, p.position_index',
+            (position, company, company))
+
+    def employees_with_positions(self, min_positions: int, company: str = None) -> list:
+        """Employees with at least min_positions positions at experience company (crawled one if None)"""
+        return self.query(
+            'SELECT e.url, e.name AS employee, x.company, COUNT(p.id) AS positions '
+            'FROM employees e '
+            'JOIN experiences x ON x.employee_id = e.id AND x.company = COALESCE(?, e.company) '
+            'JOIN positions p ON p.experience_id = x.id '
+            'GROUP BY e.id, x.company HAVING COUNT(p.id) >= ? '
+            'ORDER BY positions DESC, e.id',
+            (company, min_positions))
+
+    def transitions(self, company: str = None) -> list:
+        """
+        Position switches inside the crawled company of every employee (crawled_company filter, all if None):
+        rows of url, company, from position (index i) and to position (index i - 1, positions are newest first)
+        """
+        return self.query(
+            'SELECT e.url, e.company, p.name AS from_name, p.duration AS from_duration, '
+            'n.name AS to_name, n.duration AS to_duration '
+            'FROM employees e '
+            'JOIN experiences x ON x.employee_id = e.id AND x.company = e.company '
+            'JOIN positions p ON p.experience_id = x.id AND p.position_index > 0 '
+            'JOIN positions n ON n.experience_id = x.id AND n.position_index = p.position_index - 1 '
+            'WHERE ? IS NULL OR e.company = ? '
+            'ORDER BY e.id, x.experience_index, p.position_index',
+            (company, company))
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Queries of SQLite store (-out result.db) without loading whole results:
+python store-query.py -db all.db -import mail-ru.jsonl yandex.jsonl
+python store-query.py -db all.db -query holders -position "Software Engineer" -company "Mail.Ru Group"
+python store-query.py -db all.db -query positions -min-positions 3
+"""
+import os
+import sys
+import json
+import argparse
+
+from results_io import read_company, iter_employees
+from sqlite_store import SqliteStore, is_sqlite
+
+arguments_parser = argparse.ArgumentParser(description='Import parser results to SQLite store and query it')
+arguments_parser.add_argument('-db', type=str, default='result.db', help='SQLite store file')
+arguments_parser.add_argument('-import', type=str, nargs='+', default=[], dest='inputs',
+                              help='Add json, jsonl or other .db results (one company per file) to -db first')
+arguments_parser.add_argument('-query', type=str, choices=['companies', 'holders', 'positions', 'transitions'], default='',
+                              help='Crawled companies (companies), employees who held -position at -company (holders), '
+                                   'employees with -min-positions positions at -company (positions), '
+                                   'position switches inside crawled -company (transitions)')
+arguments_parser.add_argument('-position', type=str, default='', help='Exact position name for -query holders')
+arguments_parser.add_argument('-company', type=str, default=None,
+                              help='Experience company (holders, positions: crawled company of employee by default) '
+                                   'or crawled company (transitions: all by default)')
+arguments_parser.add_argument('-min-positions', type=int, default=2, help='Positions at -company for -query positions')
+arguments_parser.add_argument('-o', type=str, default='', help='Output json file (stdout by default)')
+
+
+if __name__ == '__main__':
+    args = arguments_parser.parse_args()
+    if not args.inputs and not os.path.exists(args.db):
+        sys.exit(f'{args.db} not found')
+    store = SqliteStore(args.db)
+    for filename in args.inputs:
+        if is_sqlite(filename) and filename == args.db:
+            continue
+        imported = store.import_employees(read_company(filename), iter_employees(filename))
+        print(f'{filename} -> {args.db}: {imported} employees', file=sys.stderr)
+
+    if args.query == 'companies':
+        rows = store.companies()
+    elif args.query == 'holders':
+        if not args.position:
+            sys.exit('-query holders requires -position')
+        rows = store.position_holders(args.position, args.company)
+    elif args.query == 'positions':
+        rows = store.employees_with_positions(args.min_positions, args.company)
+    elif args.query == 'transitions':
+        rows = store.transitions(args.company)
+    else:
+        rows = None
+    store.close()
+
+    if rows is not None:
+        if args.o:
+            with open(args.o, 'w', encoding='utf-8') as file:
+                json.dump(rows, file, indent=4, ensure_ascii=False)
+        else:
+            print(json.dumps(rows, indent=4, ensure_ascii=False))
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+# Modules are flat files of the repository root, fixture pages are in benchmark/
+sys.path[:0] = [ROOT_DIR, os.path.join(ROOT_DIR, 'benchmark')]
+
+
+def employee(url: str, position: str = 'Engineer', company: str = 'Fixture Corp', positions: list = None) -> dict:
+    """Parsed profile in parser output form"""
+    return {
+        'name': f'Name of {url}',
+        'position': position,
+        'about': '',
+        'experience': [{'company': company, 'duration_summary': '2 yrs 3 mos',
+                        'positions': [{'name': name, 'location': 'Kyiv', 'description': '',
+                                       'dates': {'from': 'Jan 2019', 'to': 'Present', 'duration': duration}}
+                                      for name, duration in (positions or [(position, '2 yrs 3 mos')])]}],
+        'url': url
+    }
+
+
+@pytest.fixture
+def selectors() -> dict:
+    with open(os.path.join(ROOT_DIR, 'selectors.json')) as selectors_json:
+        return json.load(selectors_json)
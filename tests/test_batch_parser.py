@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import os
+import queue
+import argparse
+import importlib.util
+
+from conftest import ROOT_DIR
+
+spec = importlib.util.spec_from_file_location('batch_parser', os.path.join(ROOT_DIR, 'batch-parser.py'))
+batch_parser = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(batch_parser)
+
+
+class StubCrawler:
+    """Browser-less crawler: records runs, sys.exit()s on urls with 'fail' once, like a fatal crawler error"""
+    created = []
+
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        self.runs = []
+        self.closed = 0
+        StubCrawler.created.append(self)
+
+    def alive(self) -> bool:
+        return True
+
+    def run(self):
+        self.runs.append((self.options.company_url, self.options.out))
+        if 'fail' in self.options.company_url and self.runs.count(self.runs[-1]) == 1:
+            raise SystemExit("Can't find company_name")
+
+    def close(self):
+        self.closed += 1
+
+
+def test_session_runs_jobs_in_one_crawler_and_retries_failed(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_parser, 'Crawler', StubCrawler)
+    monkeypatch.setattr(batch_parser, 'args', batch_parser.arguments_parser.parse_args(
+        ['-manifest', 'jobs.jsonl', '-out-dir', str(tmp_path), '-state', str(tmp_path / 'state.jsonl')]), raising=False)
+    monkeypatch.setattr(batch_parser, 'parser_args', ['-headless', '1'], raising=False)
+    jobs = queue.Queue()
+    for job in [{'id': 'a', 'url': 'https://x/company/a/'}, {'id': 'b', 'url': 'https://x/company/fail/'}]:
+        jobs.put(job)
+    state = batch_parser.BatchState(str(tmp_path / 'state.jsonl'))
+
+    batch_parser.run_session(1, jobs, state)
+    state.close()
+
+    crawler, = StubCrawler.created
+    assert crawler.options.headless == 1
+    assert crawler.runs == [('https://x/company/a/', str(tmp_path / 'a.jsonl')),
+                            ('https://x/company/fail/', str(tmp_path / 'b.jsonl')),
+                            ('https://x/company/fail/', str(tmp_path / 'b.jsonl'))]
+    # Browser of the failed attempt and the session one at the end
+    assert crawler.closed == 2
+    resumed = batch_parser.BatchState(str(tmp_path / 'state.jsonl'))
+    assert resumed.done('a') and resumed.done('b')
+    resumed.close()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from time import time
+from urllib.error import HTTPError
+
+import pytest
+
+import coordinator_client
+from frontier import Frontier, PENDING, DONE
+from jsonl_store import JsonlStore
+from coordinator import Coordinator, start_coordinator
+from coordinator_client import CoordinatorClient, RemoteFrontier, RemoteStore
+from conftest import employee
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    store = JsonlStore(str(tmp_path / 'result.jsonl'))
+    store.create('Fixture Corp')
+    frontier = Frontier(str(tmp_path / 'frontier.jsonl'))
+    yield Coordinator(frontier, store, batch=2, lease_seconds=60)
+    store.close()
+    frontier.close()
+
+
+def card(url: str, headline: str = 'Engineer', ttl_seconds: float = None) -> dict:
+    return {'url': url, 'name': '', 'headline': headline, 'ttl_seconds': ttl_seconds}
+
+
+def test_add_skips_fresh_stored_profiles(coordinator):
+    coordinator.store.append(employee('https://x/in/old/'), fetched_at=time() - 10 * 86400)
+    coordinator.store.append(employee('https://x/in/fresh/'))
+    cards = [card('https://x/in/new/'), card('https://x/in/old/'), card('https://x/in/fresh/')]
+    assert coordinator.add({'cards': cards})['added'] == ['https://x/in/new/']
+    week = 7 * 86400
+    cards = [card('https://x/in/old/', ttl_seconds=week), card('https://x/in/fresh/', ttl_seconds=week)]
+    assert coordinator.add({'cards': cards})['added'] == ['https://x/in/old/']
+
+
+def test_expired_lease_is_reissued_and_duplicate_result_dropped(coordinator):
+    coordinator.add({'cards': [card('https://x/in/a/')]})
+    first = coordinator.lease({'worker': 'one'})
+    coordinator.leases[first['lease']]['expires'] = 0
+    second = coordinator.lease({'worker': 'two'})
+    assert [record['url'] for record in second['records']] == ['https://x/in/a/']
+    assert coordinator.result({'lease': second['lease'], 'employee': employee('https://x/in/a/')})['stored']
+    assert not coordinator.result({'lease': first['lease'], 'employee': employee('https://x/in/a/')})['stored']
+    assert coordinator.frontier.state('https://x/in/a/') == DONE
+    assert coordinator.lease({'worker': 'one'})['records'] == []
+
+
+def test_remote_frontier_over_http_with_token(coordinator):
+    server = start_coordinator(coordinator, '127.0.0.1', 0, 'secret')
+    url = f'http://127.0.0.1:{server.server_port}/'
+    try:
+        with pytest.raises(HTTPError) as error:
+            CoordinatorClient(url).status()
+        assert error.value.code == 401
+        client = CoordinatorClient(url, 'secret')
+        frontier = RemoteFrontier(client)
+        store = RemoteStore(client, frontier)
+        assert frontier.add('https://x/in/a/', 'A', 'Engineer')
+        frontier.set_page(1, last=True)
+        record = frontier.take()
+        assert record['url'] == 'https://x/in/a/'
+        store.append(employee(record['url']))
+        assert frontier.take() is None
+        assert coordinator.frontier.counts()[PENDING] == 0 and len(coordinator.store) == 1
+    finally:
+        server.shutdown()
+
+
+def test_remote_frontier_polls_without_holding_lock(coordinator, monkeypatch):
+    server = start_coordinator(coordinator, '127.0.0.1', 0)
+    frontier = RemoteFrontier(CoordinatorClient(f'http://127.0.0.1:{server.server_port}/'))
+    locked = []
+
+    def other_worker_finishes(seconds):
+        locked.append(frontier.lock.locked())
+        coordinator.done({'lease': lease['lease'], 'url': 'https://x/in/a/'})
+
+    monkeypatch.setattr(coordinator_client, 'sleep', other_worker_finishes)
+    try:
+        coordinator.add({'cards': [card('https://x/in/a/')]})
+        coordinator.page({'page': 1, 'last': True})
+        lease = coordinator.lease({'worker': 'other'})
+        assert frontier.take() is None
+        assert locked == [False]
+    finally:
+        server.shutdown()
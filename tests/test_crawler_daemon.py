@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import os
+import argparse
+import importlib.util
+
+from conftest import ROOT_DIR
+
+spec = importlib.util.spec_from_file_location('crawler_daemon', os.path.join(ROOT_DIR, 'crawler-daemon.py'))
+crawler_daemon = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(crawler_daemon)
+
+
+class StubCrawler:
+    """Browser-less crawler: profile jobs return the url, report() fails like a racing summary file write"""
+
+    def __init__(self, out: str):
+        self.options = argparse.Namespace(user_data_dir='chrome-data', snapshots='', out=out)
+        self.browser = None
+
+    def alive(self) -> bool:
+        return True
+
+    def crawl_profile(self, url: str) -> dict:
+        return {'url': url}
+
+    def report(self):
+        raise FileNotFoundError('misses.json.tmp')
+
+    def close(self):
+        pass
+
+
+def test_failed_report_neither_hangs_waiting_client_nor_kills_browser_thread(tmp_path):
+    daemon = crawler_daemon.CrawlerDaemon(StubCrawler(str(tmp_path / 'result.jsonl')), 1, keep_jobs=2)
+    threads = daemon.start()
+    try:
+        jobs = [daemon.submit({'url': f'https://x/in/{number}/', 'wait': 5}) for number in range(3)]
+        assert [job['state'] for job in jobs] == [crawler_daemon.DONE] * 3
+        assert jobs[-1]['employee'] == {'url': 'https://x/in/2/'}
+        # Only the last keep_jobs finished jobs are kept
+        assert list(daemon.jobs) == [job['id'] for job in jobs[1:]]
+    finally:
+        daemon.stop(threads)
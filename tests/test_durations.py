@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from durations import duration_to_months, parse_duration, parse_month
+
+
+@pytest.mark.parametrize('text, months', [
+    ('2 yrs 3 mos', 27),
+    ('1 yr', 12),
+    ('11 mos', 11),
+    ('2 г. 3 мес.', 27),
+    ('5 лет', 60),
+    ('less than a year', 0),
+    ('Менее года', 0),
+    ('', None),
+    ('soon', None),
+])
+def test_parse_duration(text, months):
+    assert parse_duration(text) == months
+
+
+@pytest.mark.parametrize('text, month', [
+    ('Jan 2019', (2019, 1, False)),
+    ('2019', (2019, 1, False)),
+    ('янв. 2019 г.', (2019, 1, False)),
+    ('мая 2020 г.', (2020, 5, False)),
+    ('Present', (None, None, True)),
+    ('по настоящее время', (None, None, True)),
+    ('someday', None),
+])
+def test_parse_month(text, month):
+    assert parse_month(text) == month
+
+
+@pytest.mark.parametrize('text, months', [
+    ('1 yr 2 mos', 14),
+    ('3 mos', 3),
+    ('less than a year', 0),
+    ('1 г. 2 мес.', 14),
+    ('no duration here', 'No duration'),
+    (None, 'No duration'),
+])
+def test_duration_to_months(text, months):
+    assert duration_to_months(text) == months
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from frontier import Frontier, PENDING, IN_FLIGHT, DONE, FAILED
+
+
+def test_urls_are_taken_once_in_order(tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.jsonl'))
+    assert frontier.add('https://x/in/a/', 'A', 'Engineer')
+    assert frontier.add('https://x/in/b/', 'B', 'Engineer')
+    assert not frontier.add('https://x/in/a/', 'A', 'Engineer')
+    assert frontier.take()['url'] == 'https://x/in/a/'
+    assert frontier.state('https://x/in/a/') == IN_FLIGHT
+    assert frontier.take()['url'] == 'https://x/in/b/'
+    assert frontier.take() is None
+    frontier.close()
+
+
+def test_failed_url_is_retried_up_to_max_retries(tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.jsonl'), max_retries=2)
+    frontier.add('https://x/in/a/', 'A', 'Engineer')
+    frontier.failed(frontier.take()['url'])
+    assert frontier.state('https://x/in/a/') == PENDING
+    frontier.failed(frontier.take()['url'])
+    assert frontier.state('https://x/in/a/') == FAILED
+    assert frontier.take() is None
+    frontier.close()
+
+
+def test_state_is_replayed_and_in_flight_urls_become_pending(tmp_path):
+    filename = str(tmp_path / 'frontier.jsonl')
+    frontier = Frontier(filename)
+    for url in ['https://x/in/a/', 'https://x/in/b/', 'https://x/in/c/']:
+        frontier.add(url, '', '')
+    frontier.set_page(3, last=True)
+    frontier.done(frontier.take()['url'])
+    frontier.take()
+    frontier.close()
+
+    frontier = Frontier(filename)
+    assert frontier.page == 3 and frontier.harvested
+    assert frontier.counts() == {PENDING: 2, IN_FLIGHT: 0, DONE: 1, FAILED: 0}
+    assert [frontier.take()['url'], frontier.take()['url']] == ['https://x/in/b/', 'https://x/in/c/']
+    frontier.close()
+
+
+def test_refresh_returns_done_url_to_pending(tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.jsonl'))
+    frontier.add('https://x/in/a/', 'A', 'Engineer')
+    frontier.done(frontier.take()['url'])
+    assert not frontier.add('https://x/in/a/', 'A', 'Lead')
+    assert frontier.add('https://x/in/a/', 'A', 'Lead', refresh=True)
+    assert not frontier.add('https://x/in/a/', 'A', 'Lead', refresh=True)
+    assert frontier.take()['headline'] == 'Lead'
+    frontier.close()
+
+
+def test_released_url_goes_first_without_retry(tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.jsonl'))
+    frontier.add('https://x/in/a/', 'A', '')
+    frontier.add('https://x/in/b/', 'B', '')
+    frontier.release(frontier.take()['url'])
+    record = frontier.take()
+    assert record['url'] == 'https://x/in/a/' and record['retries'] == 0
+    frontier.close()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from fixture_server import COMPANY, company_page, search_page, profile_page
+from html_extract import extract_raw_profile, extract_company_name, extract_search_cards
+from miss_counter import MissCounter
+from profile_parser import build_employee
+from selector_registry import SelectorRegistry
+
+
+def test_fixture_profile_is_parsed(selectors):
+    employee = build_employee(extract_raw_profile(profile_page('employee-2'), SelectorRegistry(selectors)))
+    assert employee['name'] == 'Employee 2'
+    assert employee['position'] == f'Position 2 at {COMPANY}'
+    one, many = employee['experience']
+    assert one['company'] == COMPANY
+    assert one['positions'][0]['dates'] == {'from': 'Jan 2019', 'to': 'Present', 'duration': '1 yr 2 mos'}
+    assert many['company'] == 'Other Company 2' and many['duration_summary'] == '4 yrs 3 mos'
+    assert [position['name'] for position in many['positions']] == [f'Role {role} of 2' for role in range(4)]
+
+
+def test_fixture_search_cards(selectors):
+    cards = extract_search_cards(search_page({'page': ['1']}, 8), SelectorRegistry(selectors), 'http://127.0.0.1/search/')
+    assert len(cards) == 8
+    assert cards[0] == {'url': 'http://127.0.0.1/in/employee-0/', 'name': 'Employee 0',
+                        'headline': f'Position 0 at {COMPANY}', 'limited': False}
+    assert [card['limited'] for card in cards].count(True) == 1
+
+
+def test_fixture_company_name(selectors):
+    assert extract_company_name(company_page('fixture'), SelectorRegistry(selectors)) == COMPANY
+
+
+def test_company_name_hits_are_counted(selectors):
+    misses = MissCounter()
+    misses.count_raw_profile(extract_raw_profile(profile_page('employee-2'), SelectorRegistry(selectors)), 'https://x/in/2/')
+    summary = misses.summary()
+    for selector_name in ['profile_company_name_with_one_position', 'profile_company_name_with_many_positions']:
+        assert summary[selector_name]['hits'] == 1 and summary[selector_name]['misses'] == 0
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+import instrumentation
+from instrumentation import Metrics
+
+
+def test_suspended_phase_time_is_exclusive(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(instrumentation, 'monotonic', lambda: now[0])
+    metrics = Metrics({})
+    with metrics.phase('search_page'):
+        now[0] += 1
+        with metrics.suspended():
+            assert metrics.current_phase() == 'other'
+            with metrics.phase('profile_parse'):
+                now[0] += 10
+        assert metrics.current_phase() == 'search_page'
+        now[0] += 2
+    assert metrics.phases == {'profile_parse': (1, 10.0), 'search_page': (1, 3.0)}
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+from time import time
+
+import pytest
+
+from jsonl_store import JsonlStore, is_jsonl_store
+from results_io import read_company, iter_employees
+from conftest import employee
+
+
+def lines(filename: str) -> list:
+    with open(filename, encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+def test_append_writes_header_and_employees(tmp_path):
+    filename = str(tmp_path / 'result.jsonl')
+    store = JsonlStore(filename)
+    assert not store.exists()
+    store.create('Fixture Corp')
+    assert store.append(employee('https://x/in/a/'))
+    store.close()
+    records = lines(filename)
+    assert records[0] == {'company': 'Fixture Corp'}
+    assert records[1]['url'] == 'https://x/in/a/'
+    assert records[1]['fetched_at'] <= time() and records[1]['content_hash']
+
+
+def test_index_is_rebuilt_on_open(tmp_path):
+    filename = str(tmp_path / 'result.jsonl')
+    store = JsonlStore(filename)
+    store.create('Fixture Corp')
+    store.append(employee('https://x/in/a/'))
+    store.append(employee('https://x/in/b/'))
+    store.close()
+    store = JsonlStore(filename)
+    assert store.company == 'Fixture Corp'
+    assert len(store) == 2 and 'https://x/in/a/' in store and 'https://x/in/c/' not in store
+
+
+def test_unchanged_profile_is_reported(tmp_path):
+    store = JsonlStore(str(tmp_path / 'result.jsonl'))
+    store.create('Fixture Corp')
+    assert store.append(employee('https://x/in/a/'))
+    assert not store.append(employee('https://x/in/a/'))
+    assert store.append(employee('https://x/in/a/', position='Lead'))
+    store.close()
+
+
+def test_last_record_wins(tmp_path):
+    store = JsonlStore(str(tmp_path / 'result.jsonl'))
+    store.create('Fixture Corp')
+    store.append(employee('https://x/in/a/'))
+    store.append(employee('https://x/in/b/'))
+    store.append(employee('https://x/in/a/', position='Lead'))
+    store.close()
+    assert [(item['url'], item['position']) for item in store.latest_employees()] == \
+           [('https://x/in/b/', 'Engineer'), ('https://x/in/a/', 'Lead')]
+
+
+def test_torn_line_is_skipped_and_next_append_starts_new_line(tmp_path):
+    filename = str(tmp_path / 'result.jsonl')
+    store = JsonlStore(filename)
+    store.create('Fixture Corp')
+    store.append(employee('https://x/in/a/'))
+    store.close()
+    with open(filename, 'a', encoding='utf-8') as file:
+        file.write('{"url": "https://x/in/torn/", "na')
+    store = JsonlStore(filename)
+    store.append(employee('https://x/in/b/'))
+    store.close()
+    assert [item['url'] for item in JsonlStore(filename).read_employees()] == ['https://x/in/a/', 'https://x/in/b/']
+
+
+def test_stale_reason(tmp_path):
+    store = JsonlStore(str(tmp_path / 'result.jsonl'))
+    store.create('Fixture Corp')
+    store.append(employee('https://x/in/fresh/'))
+    store.append(employee('https://x/in/old/'), fetched_at=time() - 10 * 86400)
+    store.close()
+    week = 7 * 86400
+    assert store.stale_reason('https://x/in/new/') == 'new'
+    assert store.stale_reason('https://x/in/old/') is None
+    assert store.stale_reason('https://x/in/old/', 'Engineer', week) == 'expired'
+    assert store.stale_reason('https://x/in/fresh/', 'Engineer', week) is None
+    assert store.stale_reason('https://x/in/fresh/', 'Lead', week) == 'headline changed'
+
+
+@pytest.mark.parametrize('indent', [None, 4])
+def test_legacy_document_is_converted(tmp_path, indent):
+    filename = str(tmp_path / 'result.json')
+    document = {'company': 'Fixture Corp', 'employees': [employee('https://x/in/a/'), employee('https://x/in/b/')]}
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=indent)
+    store = JsonlStore(filename)
+    assert store.company == 'Fixture Corp' and len(store) == 2
+    assert os.path.exists(f'{filename}.legacy')
+    assert lines(filename)[0] == {'company': 'Fixture Corp'}
+
+
+def test_not_a_store_is_refused(tmp_path):
+    filename = str(tmp_path / 'result.json')
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write('{"company": \n not json')
+    with pytest.raises(ValueError):
+        JsonlStore(filename)
+
+
+def test_readers_tell_jsonl_store_by_content(tmp_path):
+    # -out result.json of old invocations writes JSONL under .json name
+    filename = str(tmp_path / 'result.json')
+    store = JsonlStore(filename)
+    store.create('Fixture Corp')
+    store.append(employee('https://x/in/a/'))
+    store.close()
+    legacy = str(tmp_path / 'old.json')
+    with open(legacy, 'w', encoding='utf-8') as file:
+        json.dump({'company': 'Old Corp', 'employees': [employee('https://x/in/b/')]}, file)
+    assert is_jsonl_store(filename) and not is_jsonl_store(legacy)
+    assert read_company(filename) == 'Fixture Corp' and read_company(legacy) == 'Old Corp'
+    assert [item['url'] for item in iter_employees(filename)] == ['https://x/in/a/']
+    assert [item['url'] for item in iter_employees(legacy)] == ['https://x/in/b/']
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from pacing import Pacer
+
+CONFIG = {
+    'profiles_per_hour': 3600,
+    'burst': 2,
+    'jitter_seconds': [0, 0],
+    'keystroke_seconds': [0, 0],
+    'backoff_factor': 2.0,
+    'max_backoff': 8.0,
+    'recovery_factor': 0.5,
+    'page_load_spike_factor': 3.0
+}
+
+
+def test_burst_is_free_then_tokens_are_waited_for():
+    pacer = Pacer(CONFIG)
+    assert pacer.reserve() == 0
+    assert pacer.reserve() == 0
+    assert pacer.reserve() == pytest.approx(1.0, abs=0.05)
+    # Reserved immediately: parallel workers queue up behind each other
+    assert pacer.reserve() == pytest.approx(2.0, abs=0.05)
+
+
+def test_throttling_backs_off_up_to_max_and_recovers():
+    pacer = Pacer(CONFIG)
+    for _ in range(5):
+        pacer.throttled('auth wall')
+    assert pacer.backoff == 8.0
+    pacer.ok()
+    assert pacer.backoff == 4.0
+    summary = pacer.summary()
+    assert summary['throttle_signals'] == 5 and summary['signals'] == {'auth wall': 5} and summary['max_backoff'] == 8.0
+
+
+def test_page_load_spike_is_throttling_signal():
+    pacer = Pacer(CONFIG)
+    pacer.page_loaded(1.0)
+    pacer.page_loaded(1.0)
+    assert pacer.backoff == 1.0
+    pacer.page_loaded(10.0)
+    assert pacer.backoff == 2.0 and pacer.summary()['signals'] == {'page load spike': 1}
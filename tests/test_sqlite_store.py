@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import sqlite3
+
+import pytest
+
+from sqlite_store import SqliteStore
+from results_io import open_store, read_company, iter_employees
+from conftest import employee
+
+
+def count(filename: str, table: str) -> int:
+    connection = sqlite3.connect(filename)
+    try:
+        return connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_appends_are_written_in_batches(tmp_path):
+    filename = str(tmp_path / 'result.db')
+    store = SqliteStore(filename, batch_size=3)
+    store.create('Fixture Corp')
+    store.append(employee('https://x/in/a/'))
+    store.append(employee('https://x/in/b/'))
+    assert count(filename, 'employees') == 0 and len(store) == 2
+    store.append(employee('https://x/in/c/'))
+    assert count(filename, 'employees') == 3
+    store.append(employee('https://x/in/d/'))
+    store.close()
+    assert count(filename, 'employees') == 4
+
+
+def test_reparsed_employee_replaces_its_rows(tmp_path):
+    filename = str(tmp_path / 'result.db')
+    store = SqliteStore(filename, batch_size=1)
+    store.create('Fixture Corp')
+    store.append(employee('https://x/in/a/', positions=[('Engineer', '1 yr'), ('Intern', '3 mos')]))
+    assert store.append(employee('https://x/in/a/', position='Lead'))
+    assert not store.append(employee('https://x/in/a/', position='Lead'))
+    [stored] = store.employees()
+    store.close()
+    assert stored['position'] == 'Lead'
+    assert count(filename, 'experiences') == 1 and count(filename, 'positions') == 1
+
+
+def test_same_url_of_different_companies_is_kept(tmp_path):
+    store = SqliteStore(str(tmp_path / 'all.db'))
+    store.import_employees('Fixture Corp', [employee('https://x/in/a/'), employee('https://x/in/b/')])
+    store.import_employees('Other Corp', [employee('https://x/in/a/', company='Other Corp')])
+    assert store.companies() == [{'company': 'Fixture Corp', 'employees': 2}, {'company': 'Other Corp', 'employees': 1}]
+    store.close()
+
+
+def test_index_holds_crawled_company_only(tmp_path):
+    filename = str(tmp_path / 'all.db')
+    store = SqliteStore(filename)
+    store.create('Fixture Corp')
+    store.append(employee('https://x/in/a/'))
+    store.import_employees('Other Corp', [employee('https://x/in/b/', company='Other Corp')])
+    store.close()
+    store = SqliteStore(filename)
+    assert 'https://x/in/a/' in store and 'https://x/in/b/' not in store
+    store.create('Other Corp')
+    assert 'https://x/in/b/' in store and 'https://x/in/a/' not in store
+    store.close()
+
+
+def test_close_closes_connection(tmp_path):
+    store = SqliteStore(str(tmp_path / 'result.db'))
+    store.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        store.connection.execute('SELECT 1')
+
+
+def test_readers_refuse_missing_store(tmp_path):
+    filename = str(tmp_path / 'missing.db')
+    with pytest.raises(FileNotFoundError):
+        read_company(filename)
+    with pytest.raises(FileNotFoundError):
+        list(iter_employees(filename))
+    with pytest.raises(FileNotFoundError):
+        open_store(filename, create=False)
+    assert not (tmp_path / 'missing.db').exists()
+
+
+def test_transitions_of_crawled_company(tmp_path):
+    store = SqliteStore(str(tmp_path / 'result.db'))
+    store.create('Fixture Corp')
+    store.append(employee('https://x/in/a/', positions=[('Lead', '1 yr'), ('Engineer', '2 yrs 3 mos')]))
+    store.append(employee('https://x/in/b/'))
+    rows = store.transitions('Fixture Corp')
+    store.close()
+    assert [(row['url'], row['from_name'], row['to_name']) for row in rows] == [('https://x/in/a/', 'Engineer', 'Lead')]
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+
+from conftest import ROOT_DIR, employee
+from crawler import Crawler, parse_options
+from jsonl_store import JsonlStore
+
+
+class StubBrowserCrawler(Crawler):
+    """Workers get siblings of this class: no browser, opened url decides auth wall and parse result"""
+    parsed_by = {}
+
+    def open_url(self, url: str):
+        self.opened = url
+
+    def check_auth_wall(self) -> bool:
+        return '/wall/' in self.opened
+
+    def parse_profile(self, url: str):
+        StubBrowserCrawler.parsed_by[url] = (threading.current_thread().name, self.options.user_data_dir)
+        return employee(url)
+
+    def save_snapshot(self, kind: str, url: str):
+        pass
+
+    def append_employee(self, employee: dict) -> bool:
+        assert threading.current_thread().name == 'writer'
+        return super().append_employee(employee)
+
+
+def test_workers_parse_in_own_browsers_and_writer_stores(tmp_path):
+    out = str(tmp_path / 'result.jsonl')
+    crawler = StubBrowserCrawler(parse_options(['-selectors', os.path.join(ROOT_DIR, 'selectors.json'), '-out', out,
+                                                '-workers', '2', '-user-data-dir', 'chrome-data']))
+    crawler.pacer.acquire = lambda: None
+    crawler.open_outputs()
+    crawler.store.create('Fixture Corp')
+    workers, profiles_queue, employees_queue, writer = crawler.start_workers()
+    urls = [f'https://x/in/{number}/' for number in range(6)]
+    for url in urls + ['https://x/wall/1/']:
+        profiles_queue.put((url, f'Name of {url}'))
+    crawler.stop_workers(workers, profiles_queue, employees_queue, writer)
+    crawler.close_outputs()
+
+    assert set(StubBrowserCrawler.parsed_by) == set(urls)
+    assert {user_data_dir for _, user_data_dir in StubBrowserCrawler.parsed_by.values()} <= \
+        {'chrome-data-worker-1', 'chrome-data-worker-2'}
+    assert all(thread.startswith('worker-') for thread, _ in StubBrowserCrawler.parsed_by.values())
+    assert sorted(record['url'] for record in JsonlStore(out).employees()) == sorted(urls)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import argparse
+
+import numpy as np
+
+from results_io import read_company
+from transitions import iter_transitions
+
+arguments_parser = argparse.ArgumentParser(description='Position transitions graph and tenure statistics per company')
+arguments_parser.add_argument('-i', type=str, nargs='+', default=['result.jsonl'],
+                              help='Input json or jsonl files (one per company)')
+arguments_parser.add_argument('-o', type=str, default='transition_stats.json', help='Output json file')
+arguments_parser.add_argument('-cache-dir', type=str, default='.transitions-cache',
+                              help='Cache of parsed transitions arrays ("" - no cache)')
+arguments_parser.add_argument('-percentiles', type=float, nargs='+', default=[25, 50, 75, 90], help='Tenure percentiles')
+arguments_parser.add_argument('-min-count', type=int, default=1, help='Skip transitions seen less times')
+
+# Time to promotion histogram buckets, months
+PROMOTION_BUCKETS = [0, 6, 12, 24, 36, 60]
+
+
+def months(duration) -> float:
+    return float(duration) if isinstance(duration, int) else np.nan
+
+
+def build_arrays(filename: str) -> dict:
+    """Transitions of one result file as columns: position names are codes into names vocabulary, NaN - no duration"""
+    names = {}
+    from_codes, to_codes, from_months, to_months, urls = [], [], [], [], []
+    for transition in iter_transitions(filename):
+        from_codes.append(names.setdefault(transition['from']['name'], len(names)))
+        to_codes.append(names.setdefault(transition['to']['name'], len(names)))
+        from_months.append(months(transition['from']['duration']))
+        to_months.append(months(transition['to']['duration']))
+        urls.append(transition['url'])
+    return {
+        'company': np.array(read_company(filename)),
+        'names': np.array(list(names), dtype=str),
+        'from_code': np.array(from_codes, dtype=np.int32),
+        'to_code': np.array(to_codes, dtype=np.int32),
+        'from_months': np.array(from_months, dtype=np.float32),
+        'to_months': np.array(to_months, dtype=np.float32),
+        'url': np.array(urls, dtype=str)
+    }
+
+
+def load_arrays(filename: str, cache_dir: str) -> dict:
+    """build_arrays() cached in .npz keyed by file name, size and modification time"""
+    if not cache_dir:
+        return build_arrays(filename)
+    stat = os.stat(filename)
+    cache_filename = os.path.join(cache_dir, f'{os.path.basename(filename)}.{stat.st_size}.{stat.st_mtime_ns}.npz')
+    if os.path.exists(cache_filename):
+        with np.load(cache_filename) as cached:
+            return {key: cached[key] for key in cached.files}
+    arrays = build_arrays(filename)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez(cache_filename, **arrays)
+    return arrays
+
+
+def merge_arrays(arrays_list: list) -> dict:
+    """Concatenate arrays of the same company from several files with one names vocabulary"""
+    if len(arrays_list) == 1:
+        return arrays_list[0]
+    names = np.unique(np.concatenate([arrays['names'] for arrays in arrays_list]))
+    merged = {'company': arrays_list[0]['company'], 'names': names}
+    columns = {'from_code': [], 'to_code': [], 'from_months': [], 'to_months': [], 'url': []}
+    for arrays in arrays_list:
+        remap = np.searchsorted(names, arrays['names']).astype(np.int32)
+        columns['from_code'].append(remap[arrays['from_code']])
+        columns['to_code'].append(remap[arrays['to_code']])
+        columns['from_months'].append(arrays['from_months'])
+        columns['to_months'].append(arrays['to_months'])
+        columns['url'].append(arrays['url'])
+    for column, values in columns.items():
+        merged[column] = np.concatenate(values)
+    return merged
+
+
+def grouped_percentiles(groups: np.ndarray, values: np.ndarray, groups_count: int, percentiles: list) -> np.ndarray:
+    """
+    Linear interpolated percentiles of values inside every group without python loop over groups.
+    NaN values are ignored, groups without values get NaN. Result shape: (groups_count, len(percentiles))
+    """
+    valid = ~np.isnan(values)
+    groups, values = groups[valid], values[valid]
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    counts = np.bincount(groups, minlength=groups_count)
+    starts = np.cumsum(counts) - counts
+    result = np.full((groups_count, len(percentiles)), np.nan)
+    has_values = counts > 0
+    for column, percent in enumerate(percentiles):
+        position = starts[has_values] + (counts[has_values] - 1) * percent / 100
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        result[has_values, column] = values[lower] + (values[upper] - values[lower]) * (position - lower)
+    return result
+
+
+def grouped_means(groups: np.ndarray, values: np.ndarray, groups_count: int) -> np.ndarray:
+    valid = ~np.isnan(values)
+    counts = np.bincount(groups[valid], minlength=groups_count)
+    sums = np.bincount(groups[valid], weights=values[valid], minlength=groups_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def rounded(value) -> float or None:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def company_stats(arrays: dict, percentiles: list, min_count: int) -> dict:
+    names = arrays['names']
+    tenure = arrays['from_months'].astype(np.float64)
+    edge_keys = arrays['from_code'].astype(np.int64) * len(names) + arrays['to_code']
+    edges, edge_index, edge_counts = np.unique(edge_keys, return_inverse=True, return_counts=True)
+    edge_means = grouped_means(edge_index, tenure, len(edges))
+    edge_percentiles = grouped_percentiles(edge_index, tenure, len(edges), percentiles)
+
+    edges_stats = []
+    for edge in np.argsort(-edge_counts, kind='stable'):
+        if edge_counts[edge] < min_count:
+            continue
+        edge_stats = {
+            'from': str(names[edges[edge] // len(names)]),
+            'to': str(names[edges[edge] % len(names)]),
+            'count': int(edge_counts[edge]),
+            'tenure_mean': rounded(edge_means[edge])
+        }
+        for column, percent in enumerate(percentiles):
+            edge_stats[f'tenure_p{percent:g}'] = rounded(edge_percentiles[edge, column])
+        edges_stats.append(edge_stats)
+
+    # Promotion: switch to another position inside the company, time to promotion is tenure of the previous position
+    promotions = tenure[(arrays['from_code'] != arrays['to_code']) & ~np.isnan(tenure)]
+    histogram, _ = np.histogram(promotions, bins=PROMOTION_BUCKETS + [np.inf])
+    buckets = [f'{start}-{stop}' for start, stop in zip(PROMOTION_BUCKETS, PROMOTION_BUCKETS[1:])] + [f'{PROMOTION_BUCKETS[-1]}+']
+    return {
+        'transitions': int(len(edge_keys)),
+        'employees': int(len(np.unique(arrays['url']))),
+        'positions': int(len(names)),
+        'edges': edges_stats,
+        'time_to_promotion': {
+            'count': int(len(promotions)),
+            'mean': rounded(promotions.mean()) if len(promotions) else None,
+            'percentiles': {f'p{percent:g}': rounded(value) for percent, value in
+                            zip(percentiles, np.percentile(promotions, percentiles) if len(promotions) else [np.nan] * len(percentiles))},
+            'histogram_months': dict(zip(buckets, histogram.tolist()))
+        }
+    }
+
+
+if __name__ == '__main__':
+    args = arguments_parser.parse_args()
+    companies = {}
+    for filename in args.i:
+        arrays = load_arrays(filename, args.cache_dir)
+        companies.setdefault(str(arrays['company']), []).append(arrays)
+    stats = {company: company_stats(merge_arrays(arrays_list), args.percentiles, args.min_count)
+             for company, arrays_list in companies.items()}
+    with open(args.o, 'w') as file:
+        json.dump(stats, file, indent=4, ensure_ascii=False)
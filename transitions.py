@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from durations import duration_to_months
+from results_io import open_store, read_company, iter_employees
+from sqlite_store import is_sqlite
+
+
+def iter_sqlite_transitions(filename: str):
+    """Same switches of SQLite store as one indexed query instead of reading every employee"""
+    store = open_store(filename, create=False)
+    try:
+        rows = store.transitions(store.company)
+    finally:
+        store.close()
+    for row in rows:
+        yield {
+            'from': {'name': row['from_name'], 'duration': duration_to_months(row['from_duration'])},
+            'to': {'name': row['to_name'], 'duration': duration_to_months(row['to_duration'])},
+            'url': row['url'],
+            'company': row['company']
+        }
+
+
+def iter_transitions(filename: str):
+    """Yield position switches inside the parsed company of one result file (positions are newest first)"""
+    if is_sqlite(filename):
+        yield from iter_sqlite_transitions(filename)
+        return
+    company_name = read_company(filename)
+    for employee in iter_employees(filename):
+        for company in employee['experience']:
+            if company['company'] == company_name and len(company['positions']) > 1:
+                for index, position in enumerate(company['positions']):
+                    if index == 0:
+                        continue
+                    yield {
+                        'from': {
+                            'name': position['name'],
+                            'duration': duration_to_months(position['dates']['duration'])
+                        },
+                        'to': {
+                            'name': company['positions'][index-1]['name'],
+                            'duration': duration_to_months(company['positions'][index-1]['dates']['duration'])
+                        },
+                        'url': employee['url'],
+                        'company': company_name
+                    }